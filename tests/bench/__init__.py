@@ -0,0 +1 @@
+"""Benchmarks, run `python tests/bench/startup.py` or `python tests/bench/streaming.py`"""
@@ -0,0 +1,322 @@
+"""Startup benchmark for the `ai` entry paths.
+
+Measures wall time and import weight (module count, cumulative import time from
+`python -X importtime`) of:
+
+- `ai --version`
+- `ai --list-providers`
+- a one-shot prompt against a local fake OpenAI compatible server
+- `ai --chat` until the REPL shows its first prompt (needs a pty, Unix only)
+- a one-shot prompt with `--enable-mcp` and a stub stdio MCP server
+- importing every provider module in `ProviderFactory.providers_map`
+- with --bundle, the same one-shot paths run from a bundle built by `python -m yaicli.bundle`,
+  next to "cold" runs of both, without any bytecode cache, like on a fresh machine
+
+Every run uses a throw-away HOME, so the user config is never touched. The first run of
+each scenario creates the config and caches and is not measured.
+
+Usage:
+    python tests/bench/startup.py
+    python tests/bench/startup.py --only one-shot --only chat --repeat 10
+    python tests/bench/startup.py --json bench.json
+    python tests/bench/startup.py --baseline bench.json --threshold 0.2
+    python tests/bench/startup.py --bundle dist/ai.pyz --only one-shot --only cold --only bundle
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+STUB_MCP_SERVER = BENCH_DIR / "stub_mcp_server.py"
+# Run the typer app like the `ai` console script does
+AI_COMMAND = [sys.executable, "-c", "import sys; sys.argv[0] = 'ai'; from yaicli.entry import app; app()"]
+CHAT_TIMEOUT = 30
+# Rendered by prompt_toolkit once the REPL waits for input, see CLI.get_prompt_tokens
+CHAT_PROMPT = " 💬 >".encode()
+
+
+@dataclass
+class Result:
+    name: str
+    wall_ms: List[float] = field(default_factory=list)
+    imports: int = 0
+    import_ms: float = 0.0
+
+    @property
+    def min_ms(self) -> float:
+        return min(self.wall_ms)
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.wall_ms)
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "min_ms": self.min_ms, "median_ms": self.median_ms}
+
+
+# ------------------- Fake OpenAI compatible server -------------------
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Answer every chat completion with a fixed reply, streaming or not"""
+
+    reply = "Hello from the benchmark server."
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        base = {"id": "chatcmpl-bench", "created": int(time.time()), "model": body.get("model", "bench")}
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for delta, finish_reason in (({"role": "assistant", "content": self.reply}, None), ({}, "stop")):
+                chunk = {
+                    **base,
+                    "object": "chat.completion.chunk",
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+            return
+
+        payload = json.dumps(
+            {
+                **base,
+                "object": "chat.completion",
+                "choices": [
+                    {"index": 0, "message": {"role": "assistant", "content": self.reply}, "finish_reason": "stop"}
+                ],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def start_fake_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ------------------- Runners -------------------
+def parse_importtime(stderr: str) -> tuple[int, float]:
+    """Return (module count, total import ms) from `-X importtime` output"""
+    count, total_us = 0, 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        count += 1
+        # Only top level imports, nested ones are part of their parent's cumulative time
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return count, total_us / 1000
+
+
+def run_command(cmd: List[str], env: Dict[str, str], importtime: bool = False) -> tuple[float, str]:
+    """Run a command to completion, return (wall ms, stderr)"""
+    if importtime:
+        cmd = [cmd[0], "-X", "importtime", *cmd[1:]]
+    start = time.perf_counter()
+    result = subprocess.run(cmd, env=env, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=120)
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} failed with {result.returncode}:\n{result.stdout}\n{result.stderr}")
+    return elapsed, result.stderr
+
+
+def run_chat_boot(cmd: List[str], env: Dict[str, str], importtime: bool = False) -> tuple[float, str]:
+    """Start the REPL in a pty, return (ms until the first prompt, stderr)"""
+    # Unix only, build_scenarios skips the chat scenario on Windows
+    import pty
+    import select
+
+    if importtime:
+        cmd = [cmd[0], "-X", "importtime", *cmd[1:]]
+    master, slave = pty.openpty()
+    # A file instead of a pipe, -X importtime output would fill the pipe and block the REPL
+    with tempfile.TemporaryFile("w+") as stderr_file:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, env=env, stdin=slave, stdout=slave, stderr=stderr_file)
+        os.close(slave)
+        output = b""
+        try:
+            while CHAT_PROMPT not in output:
+                remaining = CHAT_TIMEOUT - (time.perf_counter() - start)
+                if remaining <= 0 or not select.select([master], [], [], remaining)[0]:
+                    raise RuntimeError(
+                        f"REPL did not show a prompt in {CHAT_TIMEOUT}s:\n{output.decode(errors='replace')}"
+                    )
+                try:
+                    output += os.read(master, 4096)
+                except OSError:
+                    raise RuntimeError(f"REPL exited before the prompt:\n{output.decode(errors='replace')}") from None
+            elapsed = (time.perf_counter() - start) * 1000
+            os.write(master, b"\x04")  # Ctrl+D exits the REPL
+            proc.wait(timeout=CHAT_TIMEOUT)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            os.close(master)
+        stderr_file.seek(0)
+        stderr = stderr_file.read()
+    return elapsed, stderr
+
+
+@dataclass
+class Scenario:
+    name: str
+    cmd: List[str]
+    runner: Callable[[List[str], Dict[str, str], bool], tuple[float, str]] = run_command
+    env: Dict[str, str] = field(default_factory=dict)
+    # Env vars pointing to a new empty directory on every run, e.g. an empty bytecode cache
+    fresh_dirs: Tuple[str, ...] = ()
+
+    def run(self, env: Dict[str, str], importtime: bool = False) -> tuple[float, str]:
+        env = {**env, **self.env}
+        with tempfile.TemporaryDirectory(prefix="yaicli-bench-fresh-") as tmp:
+            env.update({name: str(Path(tmp) / name) for name in self.fresh_dirs})
+            return self.runner(self.cmd, env, importtime)
+
+
+def provider_import_command(provider: str, module_path: str, class_name: str) -> List[str]:
+    code = f"import importlib; getattr(importlib.import_module({module_path!r}, 'yaicli.llms'), {class_name!r})"
+    return [sys.executable, "-c", code]
+
+
+def bundle_scenarios(bundle: Path, llm_env: Dict[str, str]) -> List[Scenario]:
+    """Compare a bundle with the normal install, warm and on a fresh machine"""
+    bundle_cmd = [sys.executable, str(bundle)]
+    # Fresh machine: nothing compiled yet for the install, nothing extracted yet for the bundle
+    no_pycache = ("PYTHONPYCACHEPREFIX",)
+    not_extracted = ("YAI_BUNDLE_ROOT",)
+    return [
+        Scenario("cold:version", AI_COMMAND + ["--version"], fresh_dirs=no_pycache),
+        Scenario("cold:one-shot", AI_COMMAND + ["--no-stream", "hello"], env=llm_env, fresh_dirs=no_pycache),
+        Scenario("bundle:version", bundle_cmd + ["--version"]),
+        Scenario("bundle:one-shot", bundle_cmd + ["--no-stream", "hello"], env=llm_env),
+        Scenario("bundle:cold:version", bundle_cmd + ["--version"], fresh_dirs=not_extracted),
+        Scenario("bundle:cold:one-shot", bundle_cmd + ["--no-stream", "hello"], env=llm_env, fresh_dirs=not_extracted),
+    ]
+
+
+def build_scenarios(base_url: str, home: Path, bundle: Optional[Path] = None) -> List[Scenario]:
+    from yaicli.llms.provider import ProviderFactory
+
+    # MCP_JSON_PATH lives next to the config, which follows HOME
+    mcp_json = home / ".config" / "yaicli" / "mcp.json"
+    mcp_json.parent.mkdir(parents=True, exist_ok=True)
+    mcp_json.write_text(
+        json.dumps({"mcpServers": {"bench": {"command": sys.executable, "args": [str(STUB_MCP_SERVER)]}}})
+    )
+    llm_env = {"YAI_PROVIDER": "openai", "YAI_BASE_URL": base_url, "YAI_API_KEY": "bench", "YAI_MODEL": "bench"}
+    scenarios = [
+        Scenario("version", AI_COMMAND + ["--version"]),
+        Scenario("list-providers", AI_COMMAND + ["--list-providers"]),
+        Scenario("one-shot", AI_COMMAND + ["--no-stream", "hello"], env=llm_env),
+        Scenario("one-shot-stream", AI_COMMAND + ["--stream", "hello"], env=llm_env),
+        Scenario(
+            "mcp",
+            AI_COMMAND + ["--enable-mcp", "--no-stream", "hello"],
+            env=llm_env,
+        ),
+    ]
+    if sys.platform != "win32":
+        scenarios.append(Scenario("chat", AI_COMMAND + ["--chat"], runner=run_chat_boot, env=llm_env))
+    for provider, (module_path, class_name) in ProviderFactory.providers_map.items():
+        scenarios.append(Scenario(f"import:{provider}", provider_import_command(provider, module_path, class_name)))
+    if bundle:
+        scenarios.extend(bundle_scenarios(bundle, llm_env))
+    return scenarios
+
+
+def measure(scenario: Scenario, env: Dict[str, str], repeat: int) -> Result:
+    # Warm up: creates the config and caches, fills the OS page cache
+    scenario.run(env)
+    result = Result(scenario.name)
+    for _ in range(repeat):
+        elapsed, _ = scenario.run(env)
+        result.wall_ms.append(elapsed)
+    _, stderr = scenario.run(env, importtime=True)
+    result.imports, result.import_ms = parse_importtime(stderr)
+    return result
+
+
+def bench_env(home: Path) -> Dict[str, str]:
+    env = {k: v for k, v in os.environ.items() if not k.startswith("YAI_")}
+    env.update({"HOME": str(home), "NO_COLOR": "1", "TERM": "xterm"})
+    return env
+
+
+def compare(results: List[Result], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Return regressions compared to a baseline json"""
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if not base:
+            continue
+        if result.min_ms > base["min_ms"] * (1 + threshold):
+            regressions.append(f"{result.name}: wall {base['min_ms']:.0f}ms -> {result.min_ms:.0f}ms")
+        if result.imports > base["imports"] * (1 + threshold):
+            regressions.append(f"{result.name}: imports {base['imports']} -> {result.imports}")
+    return regressions
+
+
+def print_table(results: List[Result]) -> None:
+    print(f"{'scenario':<32}{'min ms':>10}{'median ms':>12}{'imports':>10}{'import ms':>12}")
+    for r in results:
+        print(f"{r.name:<32}{r.min_ms:>10.1f}{r.median_ms:>12.1f}{r.imports:>10}{r.import_ms:>12.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark yaicli startup paths")
+    parser.add_argument("--repeat", type=int, default=5, help="Measured runs per scenario")
+    parser.add_argument("--only", action="append", help="Only run scenarios starting with this name, repeatable")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare with results written by --json")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression ratio against the baseline")
+    parser.add_argument("--bundle", type=Path, help="Also benchmark this bundle, see `python -m yaicli.bundle`")
+    args = parser.parse_args(argv)
+
+    server = start_fake_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    results = []
+    with tempfile.TemporaryDirectory(prefix="yaicli-bench-") as tmp:
+        home = Path(tmp)
+        env = bench_env(home)
+        for scenario in build_scenarios(base_url, home, bundle=args.bundle):
+            if args.only and not scenario.name.startswith(tuple(args.only)):
+                continue
+            results.append(measure(scenario, env, args.repeat))
+    server.shutdown()
+
+    print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps({r.name: r.to_dict() for r in results}, indent=2))
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
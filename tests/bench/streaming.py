@@ -0,0 +1,151 @@
+"""Streaming benchmark for the response printers.
+
+Feeds synthetic streams of small chunks, with <think> tags and code fences split across
+chunk boundaries, through:
+
+- `accumulate`: `Printer._process_chunk` alone, the tag parsing and buffering of every chunk
+- `pipe`: `PipePrinter.display_stream` writing to in-memory binary streams
+- `live`: `Printer.display_stream` drawing frames to an in-memory terminal
+
+Each scenario runs a stream of `--chunks` chunks and one ten times smaller. Processing a
+chunk must take about the same time in both, a per chunk cost growing with the stream
+length is reported as a failure.
+
+Usage:
+    python tests/bench/streaming.py
+    python tests/bench/streaming.py --chunks 20000 --only pipe --json bench.json
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from rich.console import Console
+
+from yaicli.printer import PipePrinter, Printer
+from yaicli.schemas import LLMResponse
+
+CHUNK_SIZE = 4
+CONFIG = {"CODE_THEME": "monokai", "SHOW_REASONING": True, "MAX_FPS": 20}
+REASONING = "<think>Plan the answer.\n\nCheck the edge cases.</think>"
+SECTION = (
+    "Some explanation of the next step, long enough to span a few chunks.\n\n"
+    "```python\ndef step(x):\n    return x + 1\n```\n\n"
+    "- first point\n- second point\n\n"
+)
+
+
+@dataclass
+class Result:
+    name: str
+    chunks: int
+    small_us_per_chunk: float
+    us_per_chunk: float
+
+    @property
+    def scaling(self) -> float:
+        """Per chunk cost of the long stream relative to the short one, 1.0 is linear time"""
+        return self.us_per_chunk / self.small_us_per_chunk
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "scaling": self.scaling}
+
+
+def synthetic_text(chunks: int) -> str:
+    """Response text of about `chunks` chunks"""
+    length = chunks * CHUNK_SIZE
+    return REASONING + SECTION * (length // len(SECTION) + 1)
+
+
+def synthetic_stream(chunks: int) -> List[LLMResponse]:
+    text = synthetic_text(chunks)
+    return [LLMResponse(content=text[i : i + CHUNK_SIZE]) for i in range(0, chunks * CHUNK_SIZE, CHUNK_SIZE)]
+
+
+def run_accumulate(stream: List[LLMResponse]) -> None:
+    printer = Printer(console=Console(file=io.StringIO()), config=CONFIG)
+    for chunk in stream:
+        printer._process_chunk(chunk)
+    printer._flush_chunks()
+    printer._response()
+
+
+def run_pipe(stream: List[LLMResponse]) -> None:
+    # Binary buffered streams, like stdout and stderr writing to a pipe
+    out = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    err = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    PipePrinter(config=CONFIG, stream=out, reasoning_stream=err).display_stream(iter(stream))
+
+
+def run_live(stream: List[LLMResponse]) -> None:
+    console = Console(file=io.StringIO(), force_terminal=True, width=100, height=40)
+    Printer(console=console, config=CONFIG).display_stream(iter(stream))
+
+
+SCENARIOS: Dict[str, Callable[[List[LLMResponse]], None]] = {
+    "accumulate": run_accumulate,
+    "pipe": run_pipe,
+    "live": run_live,
+}
+
+
+def us_per_chunk(run: Callable[[List[LLMResponse]], None], stream: List[LLMResponse], repeat: int) -> float:
+    """Best time per chunk of `repeat` runs, in microseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(stream)
+        best = min(best, time.perf_counter() - start)
+    return best / len(stream) * 1e6
+
+
+def measure(name: str, chunks: int, repeat: int) -> Result:
+    run = SCENARIOS[name]
+    small = us_per_chunk(run, synthetic_stream(chunks // 10), repeat)
+    full = us_per_chunk(run, synthetic_stream(chunks), repeat)
+    return Result(name, chunks, small, full)
+
+
+def iter_scenarios(only: Optional[List[str]]) -> Iterator[str]:
+    for name in SCENARIOS:
+        if not only or name.startswith(tuple(only)):
+            yield name
+
+
+def print_table(results: List[Result]) -> None:
+    print(f"{'scenario':<16}{'chunks':>10}{'us/chunk (1/10)':>18}{'us/chunk':>12}{'scaling':>10}")
+    for r in results:
+        print(f"{r.name:<16}{r.chunks:>10}{r.small_us_per_chunk:>18.2f}{r.us_per_chunk:>12.2f}{r.scaling:>10.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark printing streamed responses")
+    parser.add_argument("--chunks", type=int, default=100_000, help="Chunks of the long stream")
+    parser.add_argument("--repeat", type=int, default=3, help="Measured runs per stream")
+    parser.add_argument("--only", action="append", help="Only run scenarios starting with this name, repeatable")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument(
+        "--max-scaling", type=float, default=2.0, help="Allowed growth of the per chunk cost with the stream length"
+    )
+    args = parser.parse_args(argv)
+
+    results = [measure(name, args.chunks, args.repeat) for name in iter_scenarios(args.only)]
+
+    print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps({r.name: r.to_dict() for r in results}, indent=2))
+    superlinear = [r for r in results if r.scaling > args.max_scaling]
+    for r in superlinear:
+        print(
+            f"SUPERLINEAR {r.name}: {r.small_us_per_chunk:.2f}us -> {r.us_per_chunk:.2f}us per chunk", file=sys.stderr
+        )
+    return 1 if superlinear else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
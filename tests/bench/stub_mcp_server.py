@@ -0,0 +1,15 @@
+"""Minimal stdio MCP server used by the startup benchmark."""
+
+from fastmcp import FastMCP
+
+mcp = FastMCP("bench")
+
+
+@mcp.tool()
+def echo(text: str) -> str:
+    """Echo the text back"""
+    return text
+
+
+if __name__ == "__main__":
+    mcp.run()
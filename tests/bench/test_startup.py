@@ -0,0 +1,32 @@
+import json
+
+from .startup import Result, compare, main, parse_importtime
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   json.decoder\n"
+        "import time:       200 |        300 | json\n"
+        "some program output\n"
+    )
+    assert parse_importtime(stderr) == (2, 0.3)
+
+
+def test_compare_reports_regressions():
+    baseline = {"version": {"min_ms": 100.0, "imports": 100}}
+    assert compare([Result("version", wall_ms=[110.0], imports=100)], baseline, 0.2) == []
+    assert compare([Result("version", wall_ms=[130.0], imports=130)], baseline, 0.2) == [
+        "version: wall 100ms -> 130ms",
+        "version: imports 100 -> 130",
+    ]
+
+
+def test_bench_version(tmp_path, capsys):
+    output = tmp_path / "bench.json"
+    assert main(["--repeat", "1", "--only", "version", "--json", str(output)]) == 0
+
+    results = json.loads(output.read_text())
+    assert list(results) == ["version"]
+    assert results["version"]["imports"] > 0
+    assert "version" in capsys.readouterr().out
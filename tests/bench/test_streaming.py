@@ -0,0 +1,29 @@
+import io
+import json
+
+from yaicli.printer import PipePrinter
+
+from .streaming import CONFIG, main, synthetic_stream
+
+
+def test_synthetic_stream_splits_tags_and_fences():
+    stream = synthetic_stream(500)
+    assert len(stream) == 500
+    assert any(chunk.content.startswith("k>") for chunk in stream)
+
+    out, err = io.StringIO(), io.StringIO()
+    content, reasoning = PipePrinter(config=CONFIG, stream=out, reasoning_stream=err).display_stream(iter(stream))
+    assert reasoning == "Plan the answer.\n\nCheck the edge cases."
+    assert "<think>" not in content and content.count("```") >= 2
+    assert out.getvalue() == content + "\n"
+
+
+def test_bench_streaming(tmp_path, capsys):
+    output = tmp_path / "bench.json"
+    # Too few chunks for stable timings, only check the output
+    main(["--chunks", "1000", "--repeat", "1", "--max-scaling", "1000", "--json", str(output)])
+
+    results = json.loads(output.read_text())
+    assert list(results) == ["accumulate", "pipe", "live"]
+    assert all(result["us_per_chunk"] > 0 for result in results.values())
+    assert "scaling" in capsys.readouterr().out
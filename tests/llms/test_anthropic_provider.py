@@ -4,7 +4,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from yaicli.llms.providers.anthropic_provider import AnthropicProvider
-from yaicli.schemas import ChatMessage, ToolPolicy
+from yaicli.schemas import ChatMessage, ToolCall, ToolPolicy, Usage
 
 
 class TestAnthropicProvider:
@@ -100,8 +100,10 @@ class TestAnthropicProvider:
             # Verify client call
             mock_client.messages.create.assert_called_once()
             call_args = mock_client.messages.create.call_args
-            assert call_args[1]["messages"] == [{"role": "user", "content": "Hello"}]
-            assert "tools" in call_args[1]
+            assert call_args[1]["messages"] == [
+                {"role": "user", "content": [{"type": "text", "text": "Hello", "cache_control": {"type": "ephemeral"}}]}
+            ]
+            assert call_args[1]["tools"][-1]["cache_control"] == {"type": "ephemeral"}
 
             # Verify response
             assert len(responses) == 1
@@ -202,6 +204,94 @@ class TestAnthropicProvider:
         finally:
             AnthropicProvider.CLIENT_CLS = real_cls
 
+    @patch("yaicli.llms.providers.anthropic_provider.Anthropic")
+    def test_parallel_tool_calls(self, mock_anthropic_cls, mock_config):
+        """Every tool_use block of a response is returned"""
+        real_cls = AnthropicProvider.CLIENT_CLS
+        try:
+            AnthropicProvider.CLIENT_CLS = mock_anthropic_cls
+            mock_client = MagicMock()
+            mock_anthropic_cls.return_value = mock_client
+
+            blocks = []
+            for index, city in enumerate(("Paris", "Tokyo")):
+                block = MagicMock()
+                block.type = "tool_use"
+                block.id = f"tool_{index}"
+                block.name = "get_weather"
+                block.input = {"location": city}
+                blocks.append(block)
+            mock_response = MagicMock()
+            mock_response.content = blocks
+            mock_response.stop_reason = "tool_use"
+            mock_client.messages.create.return_value = mock_response
+
+            provider = AnthropicProvider(config=mock_config)
+            responses = list(provider.completion([ChatMessage(role="user", content="Weather?")]))
+
+            assert [r.tool_call.id for r in responses] == ["tool_0", "tool_1"]
+            assert responses[-1].finish_reason == "tool_use"
+        finally:
+            AnthropicProvider.CLIENT_CLS = real_cls
+
+    def test_stream_parallel_tool_calls(self, mock_config):
+        """Every tool_use block of a stream is returned when it ends, before the final response"""
+        events = [MagicMock(type="message_start")]
+        for index in range(2):
+            start = MagicMock(type="content_block_start")
+            start.content_block.type = "tool_use"
+            start.content_block.id = f"tool_{index}"
+            start.content_block.name = "get_weather"
+            delta = MagicMock(type="content_block_delta", spec=["type", "delta"])
+            delta.delta = MagicMock(spec=["partial_json"], partial_json='{"location": "Paris"}')
+            events += [start, delta, MagicMock(type="content_block_stop")]
+        stop = MagicMock(type="message_delta")
+        stop.delta.stop_reason = "tool_use"
+        events.append(stop)
+
+        with patch("yaicli.llms.providers.anthropic_provider.Anthropic"):
+            provider = AnthropicProvider(config=mock_config)
+        responses = list(provider._handle_stream_response(iter(events)))
+
+        assert [r.tool_call.id for r in responses if r.tool_call] == ["tool_0", "tool_1"]
+        assert responses[-1].finish_reason == "tool_use"
+
+    def test_stream_tool_call_yielded_at_block_stop(self, mock_config):
+        """A tool call is returned as soon as its block ends, so it can be dispatched early"""
+        start = MagicMock(type="content_block_start")
+        start.content_block.type = "tool_use"
+        start.content_block.id = "tool_0"
+        start.content_block.name = "get_weather"
+        delta = MagicMock(type="content_block_delta", spec=["type", "delta"])
+        delta.delta = MagicMock(spec=["partial_json"], partial_json='{"location": "Paris"}')
+        text = MagicMock(type="content_block_delta", spec=["type", "delta"])
+        text.delta = MagicMock(spec=["text"], text="Checking")
+
+        with patch("yaicli.llms.providers.anthropic_provider.Anthropic"):
+            provider = AnthropicProvider(config=mock_config)
+        responses = provider._handle_stream_response(
+            iter([MagicMock(type="message_start"), start, delta, MagicMock(type="content_block_stop"), text])
+        )
+
+        assert next(responses).tool_call == ToolCall("tool_0", "get_weather", '{"location": "Paris"}')
+        assert next(responses).content == "Checking"
+
+    def test_stream_usage(self, mock_config):
+        """Input usage from message_start and output usage from message_delta are combined"""
+        start = MagicMock(type="message_start")
+        start.message.usage = MagicMock(
+            input_tokens=10, cache_read_input_tokens=1000, cache_creation_input_tokens=0, output_tokens=1
+        )
+        stop = MagicMock(type="message_delta")
+        stop.delta.stop_reason = "end_turn"
+        stop.usage = MagicMock(spec=["output_tokens"], output_tokens=42)
+
+        with patch("yaicli.llms.providers.anthropic_provider.Anthropic"):
+            provider = AnthropicProvider(config=mock_config)
+        responses = list(provider._handle_stream_response(iter([start, stop])))
+
+        assert responses[-1].usage == Usage(prompt_tokens=1010, completion_tokens=42, cached_tokens=1000)
+
     @patch("yaicli.llms.providers.anthropic_provider.Anthropic")
     @patch("yaicli.tools.get_anthropic_mcp_tools", return_value=[{"name": "_mcp__clock"}])
     @patch("yaicli.tools.get_anthropic_schemas", return_value=[{"name": "test_function"}])
@@ -324,3 +414,84 @@ class TestAnthropicProvider:
             assert converted[2]["content"][0]["type"] == "tool_result"
             assert converted[2]["content"][0]["tool_use_id"] == "tool_1"
             assert converted[2]["content"][0]["content"] == "15 degrees"
+
+    def test_cache_breakpoints(self, mock_config):
+        """System prompt, context, end of the history and last message are cacheable, @ references are not"""
+        with patch("yaicli.llms.providers.anthropic_provider.Anthropic"):
+            provider = AnthropicProvider(config={**mock_config, "ENABLE_FUNCTIONS": False})
+        messages = [
+            ChatMessage(role="system", content="You are helpful"),
+            ChatMessage(role="system", content="Context files"),
+            ChatMessage(role="user", content="first question"),
+            ChatMessage(role="assistant", content="first answer"),
+            ChatMessage(role="system", content="@ file references", transient=True),
+            ChatMessage(role="user", content="second question"),
+        ]
+
+        params = provider._build_request_params(messages, False, None)
+
+        cache_control = {"type": "ephemeral"}
+        assert params["system"] == [{"type": "text", "text": "You are helpful", "cache_control": cache_control}]
+        assert [m["role"] for m in params["messages"]] == ["user", "user", "assistant", "user", "user"]
+        cached = [m for m in params["messages"] if isinstance(m["content"], list)]
+        assert [m["content"][-1]["text"] for m in cached] == ["Context files", "first answer", "second question"]
+        assert all(m["content"][-1]["cache_control"] == cache_control for m in cached)
+
+    def test_cache_prefix_same_across_turns(self, mock_config):
+        """The first turn writes the prefix up to the context breakpoint that the second turn reads"""
+        with patch("yaicli.llms.providers.anthropic_provider.Anthropic"):
+            provider = AnthropicProvider(config={**mock_config, "ENABLE_FUNCTIONS": False})
+        system = ChatMessage(role="system", content="You are helpful")
+        context = ChatMessage(role="system", content="Context files")
+        first_turn = [
+            system,
+            context,
+            ChatMessage(role="system", content="@ first file", transient=True),
+            ChatMessage(role="user", content="first question"),
+        ]
+        second_turn = [
+            system,
+            context,
+            ChatMessage(role="user", content="first question"),
+            ChatMessage(role="assistant", content="first answer"),
+            ChatMessage(role="system", content="@ second file", transient=True),
+            ChatMessage(role="user", content="second question"),
+        ]
+
+        def prefix_to_first_breakpoint(messages):
+            params = provider._build_request_params(messages, False, None)
+            end = next(i for i, m in enumerate(params["messages"]) if isinstance(m["content"], list))
+            return params["system"], params["messages"][: end + 1]
+
+        first_prefix = prefix_to_first_breakpoint(first_turn)
+        assert first_prefix == prefix_to_first_breakpoint(second_turn)
+        assert first_prefix[1][-1]["content"][-1]["text"] == "Context files"
+
+    def test_cache_breakpoints_in_tool_loop(self, mock_config):
+        """After tool calls the assistant message and the tool results are cacheable"""
+        from yaicli.schemas import ToolCall
+
+        with patch("yaicli.llms.providers.anthropic_provider.Anthropic"):
+            provider = AnthropicProvider(config={**mock_config, "ENABLE_FUNCTIONS": False})
+        messages = [
+            ChatMessage(role="user", content="Weather?"),
+            ChatMessage(role="assistant", content="", tool_calls=[ToolCall("tool_1", "get_weather", "{}")]),
+            ChatMessage(role="tool", content="15 degrees", tool_call_id="tool_1"),
+        ]
+
+        converted = provider._build_request_params(messages, False, None)["messages"]
+
+        assert converted[0]["content"] == "Weather?"
+        assert converted[1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert converted[2]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+
+    @pytest.mark.parametrize("config", [{"PROMPT_CACHE": False}, {"PROVIDER": "longcat-anthropic"}])
+    def test_cache_breakpoints_disabled(self, mock_config, config):
+        with patch("yaicli.llms.providers.anthropic_provider.Anthropic"):
+            provider = AnthropicProvider(config={**mock_config, **config, "ENABLE_FUNCTIONS": False})
+        messages = [ChatMessage(role="system", content="sys"), ChatMessage(role="user", content="hi")]
+
+        params = provider._build_request_params(messages, False, None)
+
+        assert params["system"] == "sys"
+        assert params["messages"] == [{"role": "user", "content": "hi"}]
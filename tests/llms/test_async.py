@@ -0,0 +1,258 @@
+# type: ignore
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from openai.types.chat import ChatCompletionChunk
+
+from yaicli.accumulator import ResponseAccumulator
+from yaicli.llms.client import AsyncLLMClient, LLMClient
+from yaicli.llms.provider import Provider, iterate_in_thread
+from yaicli.schemas import ChatMessage, LLMResponse, RefreshLive, ToolCall, Usage
+
+
+def collect(agen):
+    async def run():
+        return [item async for item in agen]
+
+    return asyncio.run(run())
+
+
+async def aiter_of(items):
+    for item in items:
+        yield item
+
+
+class SyncOnlyProvider(Provider):
+    """Provider without an async client, each call answers the next scripted turn"""
+
+    def __init__(self, turns):
+        self.turns = list(turns)
+        self.calls = []
+        self.config = {"ENABLE_FUNCTIONS": True, "ENABLE_MCP": False}
+
+    def completion(self, messages, stream=False, tool_policy=None):
+        self.calls.append(list(messages))
+        yield from self.turns.pop(0)
+
+    def detect_tool_role(self):
+        return "tool"
+
+
+@pytest.fixture
+def config():
+    return {"ENABLE_FUNCTIONS": True, "ENABLE_MCP": False, "MAX_TOOL_CALL_DEPTH": 3}
+
+
+@pytest.fixture
+def mock_config():
+    return {
+        "API_KEY": "fake_api_key",
+        "BASE_URL": None,
+        "MODEL": "test-model",
+        "TEMPERATURE": 0.7,
+        "TOP_P": 1.0,
+        "FREQUENCY_PENALTY": 0.0,
+        "MAX_TOKENS": 1024,
+        "TIMEOUT": 10,
+        "EXTRA_HEADERS": {},
+        "ENABLE_FUNCTIONS": False,
+        "ENABLE_MCP": False,
+    }
+
+
+def test_iterate_in_thread():
+    assert collect(iterate_in_thread(iter([1, 2, 3]))) == [1, 2, 3]
+
+
+def test_default_acompletion_runs_completion():
+    provider = SyncOnlyProvider([[LLMResponse(content="a"), LLMResponse(content="b")]])
+    responses = collect(provider.acompletion([ChatMessage(role="user", content="hi")]))
+    assert [r.content for r in responses] == ["a", "b"]
+
+
+@patch("yaicli.llms.provider.ProviderFactory.create_provider")
+def test_async_client_tool_loop(mock_factory, config):
+    tool_call = ToolCall(id="call_1", name="get_time", arguments="{}")
+    provider = SyncOnlyProvider(
+        [
+            [LLMResponse(content="Let me check", tool_call=tool_call)],
+            [LLMResponse(content="It is noon")],
+        ]
+    )
+    mock_factory.return_value = provider
+    client = AsyncLLMClient(provider_name="openai", config=config)
+    messages = [ChatMessage(role="user", content="time?")]
+
+    with patch("yaicli.llms.client.execute_tool_call", return_value=("12:00", True)) as execute:
+        responses = collect(client.completion_with_tools(messages, stream=True))
+
+    execute.assert_called_once_with(tool_call)
+    assert isinstance(responses[1], RefreshLive)
+    assert [r.content for r in responses if isinstance(r, LLMResponse)] == ["Let me check", "It is noon"]
+    assert [m.role for m in messages] == ["user", "assistant", "tool", "assistant"]
+    assert messages[2].content == "12:00"
+    assert messages[2].tool_call_id == "call_1"
+    assert len(provider.calls[1]) == 3
+
+
+@patch("yaicli.llms.provider.ProviderFactory.create_provider")
+def test_async_client_max_depth(mock_factory, config):
+    tool_call = ToolCall(id="call_1", name="get_time", arguments="{}")
+    provider = SyncOnlyProvider([[LLMResponse(tool_call=tool_call)] for _ in range(5)])
+    mock_factory.return_value = provider
+    client = AsyncLLMClient(provider_name="openai", config=config)
+
+    with patch("yaicli.llms.client.execute_tool_call", return_value=("ok", True)):
+        collect(client.completion_with_tools([ChatMessage(role="user", content="loop")]))
+
+    assert len(provider.calls) == config["MAX_TOOL_CALL_DEPTH"]
+
+
+@patch("yaicli.llms.provider.ProviderFactory.create_provider")
+def test_async_client_matches_sync_client(mock_factory, config):
+    """Both tool loops run the same turns: messages, usage and metrics agree"""
+    tool_call = ToolCall(id="call_1", name="get_time", arguments="{}")
+    turns = [
+        [LLMResponse(content="<think>plan</think>Checking", tool_call=tool_call, usage=Usage(10, 2))],
+        [LLMResponse(content="noon", usage=Usage(15, 1))],
+    ]
+    results = []
+    for client_class in (LLMClient, AsyncLLMClient):
+        mock_factory.return_value = SyncOnlyProvider([list(turn) for turn in turns])
+        client = client_class(provider_name="openai", config=config)
+        messages = [ChatMessage(role="user", content="time?")]
+        response = ResponseAccumulator()
+        with patch("yaicli.llms.client.execute_tool_call", return_value=("12:00", True)):
+            outputs = client.completion_with_tools(messages, stream=True, response=response)
+            if client_class is AsyncLLMClient:
+                collect(outputs)
+            else:
+                list(outputs)
+        results.append((messages, response.total_usage, [m.input_tokens for m in client.metrics]))
+
+    assert results[0] == results[1]
+    assert results[0][1] == Usage(25, 3)
+
+
+def openai_chunk(content="", finish_reason=None, tool_calls=None):
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "test-model",
+            "choices": [
+                {"index": 0, "delta": {"content": content, "tool_calls": tool_calls}, "finish_reason": finish_reason}
+            ],
+        }
+    )
+
+
+def test_openai_acompletion_stream(mock_config):
+    from yaicli.llms.providers.openai_provider import OpenAIProvider
+
+    tool_call = {"index": 0, "id": "call_1", "function": {"name": "get_time", "arguments": '{"tz": "UTC"}'}}
+    chunks = [
+        openai_chunk("Hel"),
+        openai_chunk("lo"),
+        openai_chunk(tool_calls=[tool_call]),
+        openai_chunk(finish_reason="tool_calls"),
+    ]
+    with patch("openai.OpenAI"), patch.object(OpenAIProvider, "ASYNC_CLIENT_CLS") as async_cls:
+        provider = OpenAIProvider(config=mock_config)
+        async_cls.return_value.chat.completions.create = AsyncMock(return_value=aiter_of(chunks))
+        responses = collect(provider.acompletion([ChatMessage(role="user", content="hi")], stream=True))
+
+    # The pooled async client, not the synchronous one of the sync SDK client
+    assert isinstance(async_cls.call_args.kwargs["http_client"], httpx.AsyncClient)
+    assert "".join(r.content for r in responses) == "Hello"
+    assert [r.tool_call for r in responses if r.tool_call] == [ToolCall("call_1", "get_time", '{"tz": "UTC"}')]
+
+
+def test_openai_subclass_with_custom_stream_uses_threads(mock_config):
+    from yaicli.llms.providers.openai_compatible_provider import OpenAICompatibleProvider
+
+    with patch("openai.OpenAI"):
+        provider = OpenAICompatibleProvider(config=mock_config)
+    assert not provider._has_native_async()
+    with patch.object(provider, "completion", return_value=iter([LLMResponse(content="sync")])):
+        responses = collect(provider.acompletion([ChatMessage(role="user", content="hi")]))
+    assert [r.content for r in responses] == ["sync"]
+
+
+def test_anthropic_acompletion_stream(mock_config):
+    from yaicli.llms.providers.anthropic_provider import AnthropicProvider
+
+    events = [
+        SimpleNamespace(type="message_start"),
+        SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(text="Hi")),
+        SimpleNamespace(
+            type="content_block_start", content_block=SimpleNamespace(type="tool_use", id="tu_1", name="get_time")
+        ),
+        SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(partial_json='{"tz": "UTC"}')),
+        SimpleNamespace(type="content_block_stop"),
+        SimpleNamespace(type="message_delta", delta=SimpleNamespace(stop_reason="tool_use")),
+    ]
+    with (
+        patch("yaicli.llms.providers.anthropic_provider.Anthropic"),
+        patch.object(AnthropicProvider, "ASYNC_CLIENT_CLS") as async_cls,
+    ):
+        provider = AnthropicProvider(config=mock_config)
+        async_cls.return_value.messages.create = AsyncMock(return_value=aiter_of(events))
+        responses = collect(provider.acompletion([ChatMessage(role="user", content="hi")], stream=True))
+
+    assert responses[0].content == "Hi"
+    assert responses[1].tool_call.name == "get_time"
+    assert responses[-1].finish_reason == "tool_use"
+    assert async_cls.return_value.messages.create.call_args.kwargs["stream"] is True
+
+
+def test_ollama_acompletion_stream(mock_config):
+    from yaicli.llms.providers.ollama_provider import OllamaProvider
+
+    def chunk(content="", tool_calls=None):
+        return SimpleNamespace(message=SimpleNamespace(content=content, thinking="", tool_calls=tool_calls))
+
+    tool = {"id": "call_1", "function": {"name": "get_time", "arguments": {"tz": "UTC"}}}
+    chunks = [chunk("Hi"), chunk(tool_calls=[tool])]
+    with (
+        patch("ollama.Client"),
+        patch("ollama.AsyncClient") as async_cls,
+        patch("yaicli.llms.providers.ollama_provider.get_openai_schemas", return_value=[]),
+    ):
+        provider = OllamaProvider(config={**mock_config, "ENABLE_FUNCTIONS": True})
+        async_cls.return_value.chat = AsyncMock(return_value=aiter_of(chunks))
+        responses = collect(provider.acompletion([ChatMessage(role="user", content="hi")], stream=True))
+
+    assert responses[0].content == "Hi"
+    assert responses[-1].tool_call == ToolCall("call_1", "get_time", '{"tz": "UTC"}')
+    assert isinstance(async_cls.call_args.kwargs["transport"], httpx.AsyncHTTPTransport)
+
+
+def test_gemini_acompletion_stream(mock_config):
+    from yaicli.llms.providers.gemini_provider import GeminiProvider
+
+    def chunk(text=None, function_call=None):
+        part = SimpleNamespace(function_call=function_call, thought=False, text=text)
+        candidate = SimpleNamespace(finish_reason=None, content=SimpleNamespace(parts=[part]))
+        return SimpleNamespace(candidates=[candidate])
+
+    chunks = [chunk("Hi"), chunk(function_call=SimpleNamespace(name="get_time", args={"tz": "UTC"}))]
+    with patch("google.genai.Client") as client_cls:
+        provider = GeminiProvider(config=mock_config)
+        chat = MagicMock()
+        chat.send_message_stream = AsyncMock(return_value=aiter_of(chunks))
+        client_cls.return_value.aio.chats.create.return_value = chat
+        with patch.object(provider, "get_chat_config", return_value=MagicMock()):
+            responses = collect(
+                provider.acompletion(
+                    [ChatMessage(role="system", content="sys"), ChatMessage(role="user", content="hi")], stream=True
+                )
+            )
+
+    assert responses[0].content == "Hi"
+    assert responses[-1].tool_call.name == "get_time"
+    assert responses[-1].tool_call.arguments == '{"tz": "UTC"}'
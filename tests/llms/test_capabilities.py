@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+from yaicli.llms.capabilities import (
+    DEFAULT_CAPABILITIES,
+    PROVIDER_CAPABILITIES,
+    get_provider_capabilities,
+)
+from yaicli.llms.provider import ProviderFactory
+
+
+def test_manifest_covers_all_providers():
+    assert set(PROVIDER_CAPABILITIES) == set(ProviderFactory.providers_map)
+
+
+def test_get_provider_capabilities():
+    assert get_provider_capabilities("Anthropic").prompt_caching is True
+    assert get_provider_capabilities("cohere").vision is False
+    assert get_provider_capabilities("openai").vision is True
+    assert get_provider_capabilities("unknown") == DEFAULT_CAPABILITIES
+
+
+def test_query_does_not_import_providers():
+    code = (
+        "import sys\n"
+        "from yaicli.llms.capabilities import get_provider_capabilities\n"
+        "get_provider_capabilities('anthropic')\n"
+        "loaded = [m for m in sys.modules if m.startswith('yaicli.llms.providers') or m in ('openai', 'anthropic')]\n"
+        "assert not loaded, loaded\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
@@ -90,6 +90,7 @@ class TestCerebrasProvider:
                     "X-Title": provider.APP_NAME,
                     "HTTP_Referer": provider.APP_REFERER,
                 },
+                "http_client": ANY,
             }
             assert provider.client_params == expected_client_params
 
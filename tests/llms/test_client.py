@@ -1,11 +1,14 @@
 # type: ignore
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from yaicli.accumulator import ResponseAccumulator
 from yaicli.llms.client import LLMClient
 from yaicli.llms.provider import Provider
-from yaicli.schemas import ChatMessage, LLMResponse, RefreshLive, ToolCall, ToolPolicy
+from yaicli.schemas import ChatMessage, LLMResponse, RefreshLive, ToolCall, ToolPolicy, Usage
 
 
 class MockProvider(Provider):
@@ -296,3 +299,188 @@ class TestLLMClient:
         assert mock_execute_tool.call_args[0][0].name == "_mcp__clock"
         assert any(isinstance(response, RefreshLive) for response in responses)
         assert messages[-3].tool_calls == [mcp_tool_call]
+
+    @patch("yaicli.llms.provider.ProviderFactory.create_provider")
+    def test_tool_calls_run_concurrently_in_order(self, mock_factory, mock_config):
+        """Tool calls of one response run in parallel, results keep the call order"""
+        tool_calls = [ToolCall(id=f"call_{i}", name="fetch", arguments="{}") for i in range(3)]
+        mock_factory.return_value = MockProvider()
+        client = LLMClient(provider_name="mock_provider", config={**mock_config, "MAX_PARALLEL_TOOL_CALLS": 3})
+        barrier = threading.Barrier(3, timeout=5)
+
+        def execute(tool_call, output=None):
+            # Fails with BrokenBarrierError unless all three calls run at the same time
+            barrier.wait()
+            if tool_call.id == "call_0":
+                time.sleep(0.05)
+            output.print(f"running {tool_call.id}")
+            return f"result {tool_call.id}", True
+
+        with (
+            patch("yaicli.llms.client.execute_tool_call", side_effect=execute),
+            patch.object(client, "console") as console,
+        ):
+            results = client._execute_tool_calls(tool_calls)
+
+        assert results == [("result call_0", True), ("result call_1", True), ("result call_2", True)]
+        printed = [c.args[0] for c in console.print.call_args_list]
+        assert printed == ["running call_0", "running call_1", "running call_2"]
+
+    @patch("yaicli.llms.client.execute_tool_call")
+    @patch("yaicli.llms.provider.ProviderFactory.create_provider")
+    def test_tool_calls_sequential_when_limited(self, mock_factory, mock_execute_tool, mock_config):
+        """MAX_PARALLEL_TOOL_CALLS=1 runs the calls one by one on the console"""
+        tool_calls = [ToolCall(id=f"call_{i}", name="fetch", arguments="{}") for i in range(2)]
+        mock_factory.return_value = MockProvider()
+        mock_execute_tool.side_effect = lambda tool_call: (tool_call.id, True)
+        client = LLMClient(provider_name="mock_provider", config={**mock_config, "MAX_PARALLEL_TOOL_CALLS": 1})
+
+        assert client._execute_tool_calls(tool_calls) == [("call_0", True), ("call_1", True)]
+
+    @patch("yaicli.llms.client.execute_tool_call")
+    @patch("yaicli.llms.provider.ProviderFactory.create_provider")
+    def test_tool_results_follow_tool_call_order(self, mock_factory, mock_execute_tool, mock_config):
+        """Tool messages are appended in the order of the assistant's tool calls"""
+        tool_calls = [ToolCall(id=f"call_{i}", name="fetch", arguments="{}") for i in range(3)]
+        provider = MagicMock(spec=Provider)
+        provider.detect_tool_role.return_value = "tool"
+        provider.resolve_tool_policy.return_value = ToolPolicy(enable_functions=True, enable_mcp=False)
+        provider.completion.side_effect = [
+            iter([LLMResponse(tool_call=tool_call) for tool_call in tool_calls]),
+            iter([LLMResponse(content="done")]),
+        ]
+        mock_factory.return_value = provider
+        mock_execute_tool.side_effect = lambda tool_call, output=None: (f"result {tool_call.id}", True)
+        client = LLMClient(provider_name="mock_provider", config=mock_config)
+        messages = [ChatMessage(role="user", content="fetch all")]
+
+        list(client.completion_with_tools(messages))
+
+        tool_messages = [m for m in messages if m.role == "tool"]
+        assert [m.tool_call_id for m in tool_messages] == ["call_0", "call_1", "call_2"]
+        assert [m.content for m in tool_messages] == ["result call_0", "result call_1", "result call_2"]
+
+    @patch("yaicli.llms.provider.ProviderFactory.create_provider")
+    def test_early_tool_dispatch_overlaps_stream(self, mock_factory, mock_config):
+        """A tool call with complete arguments runs while the response is still streaming"""
+        tool_ran = threading.Event()
+        complete = ToolCall(id="call_0", name="fetch", arguments='{"url": "a"}')
+        partial = ToolCall(id="call_1", name="fetch", arguments='{"url": ')
+        overlapped = []
+
+        def stream():
+            yield LLMResponse(tool_call=complete)
+            yield LLMResponse(tool_call=partial)
+            # The first tool finishes before the response does
+            overlapped.append(tool_ran.wait(timeout=5))
+            yield LLMResponse(content="still talking")
+
+        provider = MagicMock(spec=Provider)
+        provider.detect_tool_role.return_value = "tool"
+        provider.resolve_tool_policy.return_value = ToolPolicy(enable_functions=True, enable_mcp=False)
+        provider.completion.side_effect = [stream(), iter([LLMResponse(content="done")])]
+        mock_factory.return_value = provider
+        client = LLMClient(provider_name="mock_provider", config={**mock_config, "EARLY_TOOL_DISPATCH": True})
+
+        def execute(tool_call, output=None):
+            tool_ran.set()
+            return f"result {tool_call.id}", True
+
+        messages = [ChatMessage(role="user", content="fetch")]
+        with patch("yaicli.llms.client.execute_tool_call", side_effect=execute) as execute_mock:
+            list(client.completion_with_tools(messages, stream=True))
+
+        assert overlapped == [True]
+        assert [c.args[0].id for c in execute_mock.call_args_list] == ["call_0", "call_1"]
+        tool_messages = [m for m in messages if m.role == "tool"]
+        assert [m.content for m in tool_messages] == ["result call_0", "result call_1"]
+
+    @patch("yaicli.llms.client.execute_tool_call")
+    @patch("yaicli.llms.provider.ProviderFactory.create_provider")
+    def test_early_tool_dispatch_skips_disallowed_calls(self, mock_factory, mock_execute_tool, mock_config):
+        """Only tool calls allowed by the policy are dispatched early"""
+        mock_factory.return_value = MockProvider()
+        client = LLMClient(provider_name="mock_provider", config={**mock_config, "EARLY_TOOL_DISPATCH": True})
+        dispatcher = client._early_dispatcher(stream=True)
+        try:
+            tool_call = ToolCall(id="call_0", name="_mcp__clock", arguments="{}")
+            client._dispatch_early(dispatcher, tool_call, ToolPolicy(enable_functions=True, enable_mcp=False))
+        finally:
+            dispatcher.close()
+
+        assert dispatcher.started == {}
+        assert client._early_dispatcher(stream=False) is None
+
+    @patch("yaicli.llms.provider.ProviderFactory.create_provider")
+    def test_early_tool_dispatch_needs_parallel_tool_calls(self, mock_factory, mock_config):
+        """No dispatcher for providers returning a single tool call per response"""
+        mock_factory.return_value = MockProvider()
+        config = {**mock_config, "EARLY_TOOL_DISPATCH": True}
+        assert LLMClient(provider_name="cohere", config=config)._early_dispatcher(stream=True) is None
+        dispatcher = LLMClient(provider_name="openai", config=config)._early_dispatcher(stream=True)
+        assert dispatcher is not None
+        dispatcher.close()
+
+    @patch("yaicli.llms.client.execute_tool_call", return_value=("ok", True))
+    @patch("yaicli.llms.provider.ProviderFactory.create_provider")
+    def test_usage_aggregated_across_tool_calls(self, mock_factory, mock_execute_tool, mock_config):
+        """Usage of the requests after tool calls adds up, and settles the rate limit reservations"""
+        tool_call = ToolCall(id="call_1", name="get_time", arguments="{}")
+        mock_provider = MagicMock(spec=Provider)
+        mock_provider.detect_tool_role.return_value = "tool"
+        mock_provider.resolve_tool_policy.return_value = ToolPolicy(enable_functions=True, enable_mcp=False)
+        mock_provider.completion.side_effect = [
+            iter([LLMResponse(tool_call=tool_call), LLMResponse(usage=Usage(100, 10, cached_tokens=50))]),
+            iter([LLMResponse(content="noon", usage=Usage(120, 5, cached_tokens=100))]),
+        ]
+        mock_factory.return_value = mock_provider
+        client = LLMClient(provider_name="mock_provider", config={**mock_config, "RATE_LIMIT_TPM": 100000})
+        client.rate_limiter = MagicMock()
+        client.rate_limiter.reserve.return_value = 0.0
+
+        response = ResponseAccumulator()
+        list(client.completion_with_tools([ChatMessage(role="user", content="time?")], response=response))
+
+        assert response.total_usage == Usage(prompt_tokens=220, completion_tokens=15, cached_tokens=150)
+        assert [c.args[1] for c in client.rate_limiter.record_usage.call_args_list] == [110, 125]
+        assert [m.input_tokens for m in client.metrics] == [100, 120]
+
+    @patch("yaicli.llms.client.execute_tool_call", return_value=("ok", True))
+    @patch("yaicli.llms.provider.ProviderFactory.create_provider")
+    def test_shared_response_accumulator(self, mock_factory, mock_execute_tool, mock_config):
+        """Each request fills the caller's accumulator, think tags end up in the message reasoning"""
+        tool_call = ToolCall(id="call_1", name="get_time", arguments="{}")
+        mock_provider = MagicMock(spec=Provider)
+        mock_provider.detect_tool_role.return_value = "tool"
+        mock_provider.resolve_tool_policy.return_value = ToolPolicy(enable_functions=True, enable_mcp=False)
+        mock_provider.completion.side_effect = [
+            iter([LLMResponse(content="<think>plan</think>Checking"), LLMResponse(tool_call=tool_call)]),
+            iter([LLMResponse(content="no"), LLMResponse(content="on")]),
+        ]
+        mock_factory.return_value = mock_provider
+        client = LLMClient(provider_name="mock_provider", config=mock_config)
+        messages = [ChatMessage(role="user", content="time?")]
+        response = ResponseAccumulator()
+
+        seen = []
+        for llm_response in client.completion_with_tools(messages, response=response):
+            if isinstance(llm_response, LLMResponse):
+                seen.append(response.last is llm_response)
+
+        assert all(seen)
+        assert response.content == "noon"
+        assert (messages[1].content, messages[1].reasoning) == ("Checking", "plan")
+        assert messages[1].tool_calls == [tool_call]
+
+    @patch("yaicli.llms.provider.ProviderFactory.create_provider")
+    def test_fork_shares_provider_with_own_metrics(self, mock_factory, mock_config):
+        mock_factory.return_value = MockProvider()
+        client = LLMClient(provider_name="mock_provider", config=mock_config)
+
+        fork = client.fork()
+        list(fork.completion_with_tools([ChatMessage(role="user", content="hi")]))
+
+        assert fork.provider is client.provider
+        assert fork.rate_limiter is client.rate_limiter
+        assert len(fork.metrics) == 1
+        assert len(client.metrics) == 0
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
@@ -41,6 +41,7 @@ class TestLongCatProvider:
                     "X-Title": provider.APP_NAME,
                     "HTTP_Referer": provider.APP_REFERER,
                 },
+                "http_client": ANY,
             }
 
             # Check completion params (should use LongCat-specific mapping)
@@ -0,0 +1,152 @@
+# type: ignore
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from yaicli.llms import metrics as metrics_module
+from yaicli.llms.client import LLMClient
+from yaicli.llms.metrics import MetricsExporter, RequestMetrics, current_metrics, mark, span
+from yaicli.schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy
+
+
+def provider_stream():
+    with span("convert_messages"):
+        assert current_metrics() is not None
+    mark("response_headers")
+    yield LLMResponse(content="Hello")
+    yield LLMResponse(content=" world")
+    yield LLMResponse(finish_reason="stop")
+
+
+def test_observe_records_phases():
+    metrics = RequestMetrics("openai", "gpt-4o")
+    responses = []
+    for response in metrics.observe(provider_stream()):
+        responses.append(response)
+        time.sleep(0.01)
+
+    assert [r.content for r in responses] == ["Hello", " world", ""]
+    assert metrics.ttfb is not None and metrics.ttft >= metrics.ttfb
+    phases = metrics.phase_durations()
+    assert set(phases) == {"convert_messages", "stream", "render"}
+    assert phases["render"] >= 0.03
+    assert len(metrics.chunk_times) == 2
+    assert metrics.output_chars == len("Hello world")
+    # The context is only set while the provider runs
+    assert current_metrics() is None
+
+
+def test_span_and_mark_without_request():
+    with span("noop"):
+        mark("noop")
+
+
+def test_latency_histogram_and_rate():
+    metrics = RequestMetrics("openai", "gpt-4o", start=0.0)
+    metrics.first_token = 1.0
+    metrics.chunk_times = [1.0, 1.003, 1.2, 3.2]
+    metrics.output_tokens = 110
+    metrics.end = 3.2
+    histogram = metrics.latency_histogram()
+    assert histogram["le_5ms"] == 1
+    assert histogram["le_250ms"] == 1
+    assert histogram["inf"] == 1
+    assert metrics.tokens_per_second == pytest.approx(50)
+    data = metrics.to_dict()
+    assert data["ttft_ms"] == 1000
+    assert data["output_tokens"] == 110
+
+
+def test_exporter_writes_json_lines(tmp_path):
+    path = tmp_path / "metrics" / "requests.jsonl"
+    exporter = MetricsExporter(str(path))
+    metrics = RequestMetrics("openai", "gpt-4o")
+    list(metrics.observe(provider_stream()))
+    exporter.export(metrics)
+    exporter.export(metrics)
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["provider"] == "openai"
+    assert "convert_messages" in lines[0]["phases_ms"]
+
+
+@patch("yaicli.llms.provider.ProviderFactory.create_provider")
+def test_unwritable_metrics_file(mock_factory, tmp_path):
+    """A metrics file that can't be written doesn't break the request"""
+    provider = mock_factory.return_value
+    provider.resolve_tool_policy.return_value = ToolPolicy(enable_functions=False, enable_mcp=False)
+    provider.completion.side_effect = lambda *args, **kwargs: iter([LLMResponse(content="done")])
+    # The parent of the metrics file is a file
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    config = {
+        "ENABLE_FUNCTIONS": False,
+        "ENABLE_MCP": False,
+        "MAX_TOOL_CALL_DEPTH": 3,
+        "METRICS_FILE": str(blocker / "metrics.jsonl"),
+    }
+    client = LLMClient(provider_name="openai", config=config)
+
+    with patch("yaicli.llms.metrics.get_console") as get_console:
+        for _ in range(2):
+            responses = list(client.completion_with_tools([ChatMessage(role="user", content="hi")]))
+            assert [r.content for r in responses] == ["done"]
+
+    get_console.return_value.print.assert_called_once()
+    assert "Cannot write metrics" in get_console.return_value.print.call_args.args[0]
+
+
+def test_otlp_payload():
+    metrics = RequestMetrics("anthropic", "claude", input_tokens=12)
+    list(metrics.observe(provider_stream()))
+    exporter = MetricsExporter(otlp_endpoint="http://localhost:4318/")
+    with patch("httpx.post") as post:
+        exporter._send_otlp(metrics)
+
+    assert post.call_args.args[0] == "http://localhost:4318/v1/traces"
+    spans = post.call_args.kwargs["json"]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    root, *children = spans
+    assert root["name"] == "chat claude"
+    assert {"key": "gen_ai.usage.input_tokens", "value": {"intValue": "12"}} in root["attributes"]
+    assert {child["parentSpanId"] for child in children} == {root["spanId"]}
+    assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+
+
+@patch("yaicli.llms.provider.ProviderFactory.create_provider")
+def test_client_times_tool_execution(mock_factory, tmp_path):
+    provider = mock_factory.return_value
+    provider.resolve_tool_policy.return_value = ToolPolicy(enable_functions=True, enable_mcp=False)
+    provider.detect_tool_role.return_value = "tool"
+    provider.completion.side_effect = [
+        iter([LLMResponse(tool_call=ToolCall("call_1", "fetch", "{}"))]),
+        iter([LLMResponse(content="done")]),
+    ]
+    path = tmp_path / "metrics.jsonl"
+    config = {"ENABLE_FUNCTIONS": True, "ENABLE_MCP": False, "MAX_TOOL_CALL_DEPTH": 3, "METRICS_FILE": str(path)}
+    client = LLMClient(provider_name="openai", config=config, verbose=True)
+
+    with (
+        patch("yaicli.llms.client.execute_tool_call", return_value=("ok", True)),
+        patch.object(client, "console") as console,
+    ):
+        list(client.completion_with_tools([ChatMessage(role="user", content="hi")]))
+
+    assert len(client.metrics) == 2
+    assert "tool_execution" in client.metrics[0].phase_durations()
+    assert len(path.read_text().splitlines()) == 2
+    printed = [c.args[0] for c in console.print.call_args_list]
+    assert sum(str(p).startswith("Timing: openai/") for p in printed) == 2
+
+
+def test_context_is_reset_on_error():
+    def failing():
+        raise RuntimeError("boom")
+        yield
+
+    metrics = RequestMetrics("openai", "gpt-4o")
+    with pytest.raises(RuntimeError):
+        list(metrics.observe(failing()))
+    assert metrics_module._current.get() is None
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
@@ -65,6 +65,7 @@ class TestMoonshotProvider:
                     "X-Title": provider.APP_NAME,
                     "HTTP_Referer": provider.APP_REFERER,
                 },
+                "http_client": ANY,
             }
 
             # Check initialization of completion params
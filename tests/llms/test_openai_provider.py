@@ -1,10 +1,57 @@
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
+from openai.types.chat import ChatCompletionChunk
 
 from yaicli.exceptions import ProviderError
-from yaicli.llms.providers.openai_provider import OpenAIAzure, OpenAIProvider
-from yaicli.schemas import ChatMessage, ToolCall, ToolPolicy
+from yaicli.llms.providers.openai_provider import OpenAIAzure, OpenAIProvider, ToolCallAccumulator
+from yaicli.schemas import ChatMessage, ToolCall, ToolPolicy, Usage
+
+
+def tool_delta(index, id=None, name=None, arguments=None):
+    return {"index": index, "id": id, "function": {"name": name, "arguments": arguments}}
+
+
+def stream_chunk(tool_calls=None, finish_reason=None):
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4",
+            "choices": [{"index": 0, "delta": {"tool_calls": tool_calls}, "finish_reason": finish_reason}],
+        }
+    )
+
+
+def deltas(*items):
+    return stream_chunk(list(items)).choices[0].delta.tool_calls
+
+
+class TestToolCallAccumulator:
+    def test_completes_on_valid_json(self):
+        acc = ToolCallAccumulator()
+        assert acc.add(deltas(tool_delta(0, "call_1", "f", '{"a": "}'))) == []
+        assert acc.add(deltas(tool_delta(0, arguments='"}'))) == [ToolCall("call_1", "f", '{"a": "}"}')]
+        assert acc.flush() == []
+
+    def test_incomplete_calls_wait_for_flush(self):
+        acc = ToolCallAccumulator()
+        acc.add(deltas(tool_delta(0, "call_1", "f", "")))
+        assert acc.add(deltas(tool_delta(1, "call_2", "g", '{"b"'))) == []
+        assert acc.flush() == [ToolCall("call_1", "f", ""), ToolCall("call_2", "g", '{"b"')]
+
+    def test_new_id_at_same_index_starts_new_call(self):
+        acc = ToolCallAccumulator()
+        acc.add(deltas(tool_delta(0, "call_1", "f", "{")))
+        assert acc.add(deltas(tool_delta(0, "call_2", "g", "{}"))) == [ToolCall("call_2", "g", "{}")]
+        assert acc.flush() == [ToolCall("call_1", "f", "{")]
+
+    def test_missing_id_is_generated(self):
+        acc = ToolCallAccumulator()
+        (tool_call,) = acc.add(deltas(tool_delta(0, None, "f", "{}")))
+        assert tool_call.id
 
 
 class TestOpenAIProvider:
@@ -55,6 +102,7 @@ class TestOpenAIProvider:
                     "X-Title": provider.APP_NAME,
                     "HTTP_Referer": provider.APP_REFERER,
                 },
+                "http_client": ANY,
             }
 
             # Check initialization of completion params
@@ -223,6 +271,99 @@ class TestOpenAIProvider:
             assert responses[0].tool_call.name == "get_weather"
             assert responses[0].tool_call.arguments == '{"location": "New York"}'
 
+    @patch("yaicli.tools.get_openai_schemas", return_value=[])
+    def test_completion_parallel_tool_calls(self, mock_get_schemas, mock_config, mock_openai_client):
+        """Every tool call of a non streaming response is returned"""
+        tool_calls = [
+            SimpleNamespace(id=f"call_{i}", function=SimpleNamespace(name="get_weather", arguments=f'{{"i": {i}}}'))
+            for i in range(3)
+        ]
+        message = SimpleNamespace(content="", reasoning_content=None, tool_calls=tool_calls)
+        mock_openai_client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=message, finish_reason="tool_calls")]
+        )
+        with patch("openai.OpenAI"):
+            provider = OpenAIProvider(config=mock_config)
+            provider.client = mock_openai_client
+            responses = list(provider.completion([ChatMessage(role="user", content="hi")], stream=False))
+
+        assert [r.tool_call.id for r in responses] == ["call_0", "call_1", "call_2"]
+        assert responses[-1].finish_reason == "tool_calls"
+
+    @patch("yaicli.tools.get_openai_schemas", return_value=[])
+    def test_stream_parallel_tool_calls(self, mock_get_schemas, mock_config, mock_openai_client):
+        """Interleaved deltas of parallel tool calls are kept apart by their index"""
+        chunks = [
+            stream_chunk([tool_delta(0, "call_a", "get_weather", '{"city": ')]),
+            stream_chunk([tool_delta(1, "call_b", "get_time", "")]),
+            stream_chunk([tool_delta(0, arguments='"Paris"}')]),
+            stream_chunk([tool_delta(1, arguments='{"tz": "CET"')]),
+            stream_chunk([tool_delta(1, arguments="}")]),
+            stream_chunk(finish_reason="tool_calls"),
+        ]
+        mock_openai_client.chat.completions.create.return_value = chunks
+        with patch("openai.OpenAI"):
+            provider = OpenAIProvider(config=mock_config)
+            provider.client = mock_openai_client
+            responses = list(provider.completion([ChatMessage(role="user", content="hi")], stream=True))
+
+        tool_calls = [(i, r.tool_call) for i, r in enumerate(responses) if r.tool_call]
+        assert [tc for _, tc in tool_calls] == [
+            ToolCall("call_a", "get_weather", '{"city": "Paris"}'),
+            ToolCall("call_b", "get_time", '{"tz": "CET"}'),
+        ]
+        # Each call is returned as soon as its arguments are complete
+        assert [i for i, _ in tool_calls] == [2, 4]
+
+    @patch("yaicli.tools.get_openai_schemas", return_value=[])
+    def test_stream_tool_calls_without_finish_reason(self, mock_get_schemas, mock_config, mock_openai_client):
+        """Incomplete tool calls are returned when the stream ends"""
+        mock_openai_client.chat.completions.create.return_value = [
+            stream_chunk([tool_delta(0, "call_a", "get_weather", '{"city": "Par')])
+        ]
+        with patch("openai.OpenAI"):
+            provider = OpenAIProvider(config=mock_config)
+            provider.client = mock_openai_client
+            responses = list(provider.completion([ChatMessage(role="user", content="hi")], stream=True))
+
+        assert responses[-1].tool_call == ToolCall("call_a", "get_weather", '{"city": "Par')
+
+    @patch("yaicli.tools.get_openai_schemas", return_value=[])
+    def test_stream_usage(self, mock_get_schemas, mock_config, mock_openai_client):
+        """Usage is requested for streams and returned from the final chunk without choices"""
+        usage_chunk = ChatCompletionChunk.model_validate(
+            {
+                "id": "chunk",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-4",
+                "choices": [],
+                "usage": {
+                    "prompt_tokens": 100,
+                    "completion_tokens": 20,
+                    "total_tokens": 120,
+                    "prompt_tokens_details": {"cached_tokens": 64},
+                    "completion_tokens_details": {"reasoning_tokens": 8},
+                },
+            }
+        )
+        mock_openai_client.chat.completions.create.return_value = [stream_chunk(finish_reason="stop"), usage_chunk]
+        with patch("openai.OpenAI"):
+            provider = OpenAIProvider(config=mock_config)
+            provider.client = mock_openai_client
+            responses = list(provider.completion([ChatMessage(role="user", content="hi")], stream=True))
+
+        assert mock_openai_client.chat.completions.create.call_args.kwargs["stream_options"] == {"include_usage": True}
+        assert responses[-1].usage == Usage(
+            prompt_tokens=100, completion_tokens=20, cached_tokens=64, reasoning_tokens=8
+        )
+
+    def test_stream_options_only_for_providers_reporting_usage(self, mock_config):
+        with patch("openai.OpenAI"):
+            provider = OpenAIProvider(config={**mock_config, "PROVIDER": "openai-compatible"})
+        params = provider._build_request_params([ChatMessage(role="user", content="hi")], True, None)
+        assert "stream_options" not in params
+
     @patch("yaicli.llms.providers.openai_provider.get_openai_mcp_tools")
     @patch("yaicli.tools.get_openai_schemas")
     def test_completion_request_tool_policy_disables_all_tools(
@@ -251,6 +251,7 @@ class TestProviderFactory:
             "moonshot",
             "fireworks",
             "openai-compatible",
+            "router",
         }
 
         assert set(ProviderFactory.providers_map.keys()) == expected_providers
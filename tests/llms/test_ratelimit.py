@@ -0,0 +1,148 @@
+# type: ignore
+import threading
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from yaicli.llms import ratelimit
+from yaicli.llms.client import LLMClient
+from yaicli.llms.ratelimit import RateLimiter, TokenBucket, estimate_tokens, get_rate_limiter, retry_after
+from yaicli.schemas import ChatMessage, LLMResponse, ToolCall
+
+
+@pytest.fixture(autouse=True)
+def clear_limiters():
+    ratelimit._rate_limiter.cache_clear()
+    yield
+    ratelimit._rate_limiter.cache_clear()
+
+
+def test_bucket_waits_for_refill():
+    bucket = TokenBucket(capacity=2, rate=1)
+    assert bucket.reserve(1, now=bucket.updated) == 0
+    assert bucket.reserve(1, now=bucket.updated) == 0
+    assert bucket.reserve(1, now=bucket.updated) == pytest.approx(1)
+    # The debt is paid back over time, reservations queue behind it
+    assert bucket.reserve(1, now=bucket.updated) == pytest.approx(2)
+    assert bucket.reserve(1, now=bucket.updated + 3) == pytest.approx(0)
+
+
+def test_bucket_clamps_large_reservations():
+    bucket = TokenBucket(capacity=10, rate=1)
+    assert bucket.reserve(100, now=bucket.updated) == 0
+    assert bucket.reserve(1, now=bucket.updated) == pytest.approx(1)
+
+
+def test_limiter_uses_slowest_bucket():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=60)
+    assert limiter.reserve(60) == 0
+    # Requests are left, but the tokens need 30 seconds to refill
+    assert limiter.reserve(30) == pytest.approx(30, abs=0.1)
+
+
+def test_record_usage_corrects_reservation():
+    limiter = RateLimiter(tokens_per_minute=60)
+    limiter.reserve(60)
+    limiter.record_usage(estimated=60, actual=30)
+    assert limiter.reserve(30) == pytest.approx(0, abs=0.1)
+
+
+def test_record_usage_settles_clamped_reservation():
+    limiter = RateLimiter(tokens_per_minute=60)
+    # Only the bucket's capacity of 60 is taken for the estimate of 600
+    limiter.reserve(600)
+    limiter.record_usage(estimated=600, actual=60)
+    assert limiter.reserve(30) == pytest.approx(30, abs=0.1)
+
+
+def test_record_usage_without_token_count_keeps_reservation():
+    limiter = RateLimiter(tokens_per_minute=60)
+    limiter.reserve(60)
+    limiter.record_usage(estimated=60, actual=0)
+    assert limiter.reserve(30) == pytest.approx(30, abs=0.1)
+
+
+def test_pause_holds_back_requests():
+    limiter = RateLimiter(requests_per_minute=600)
+    limiter.pause(5)
+    assert limiter.reserve() == pytest.approx(5, abs=0.1)
+
+
+def test_limiter_shared_by_provider_and_model():
+    config = {"MODEL": "gpt-4o", "RATE_LIMIT_RPM": 10, "RATE_LIMIT_TPM": 0}
+    limiter = get_rate_limiter("openai", config)
+    assert get_rate_limiter("openai", dict(config)) is limiter
+    assert get_rate_limiter("openai", {**config, "MODEL": "gpt-4o-mini"}) is not limiter
+    assert get_rate_limiter("openai", {"MODEL": "gpt-4o"}) is None
+
+
+def test_concurrent_reservations_are_spaced():
+    limiter = RateLimiter(requests_per_minute=60)
+    limiter._requests.tokens = 0
+    waits = []
+    threads = [threading.Thread(target=lambda: waits.append(limiter.reserve())) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(round(w) for w in waits) == [1, 2, 3]
+
+
+def test_estimate_tokens():
+    messages = [
+        ChatMessage(role="user", content="x" * 40),
+        ChatMessage(role="assistant", tool_calls=[ToolCall("1", "f", "y" * 39)]),
+    ]
+    assert estimate_tokens(messages) == 21
+
+
+def error_with(status_code, headers):
+    return (
+        Exception()
+        if status_code is None
+        else SimpleNamespace(response=SimpleNamespace(status_code=status_code, headers=headers))
+    )
+
+
+@pytest.mark.parametrize(
+    "status_code, headers, expected",
+    [
+        (429, {"retry-after": "7"}, 7),
+        (429, {"retry-after-ms": "1500", "retry-after": "2"}, 1.5),
+        (503, {"retry-after": "3"}, 3),
+        (500, {"retry-after": "3"}, None),
+        (429, {}, None),
+        (None, None, None),
+    ],
+)
+def test_retry_after(status_code, headers, expected):
+    assert retry_after(error_with(status_code, headers)) == expected
+
+
+def test_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert retry_after(error_with(429, {"retry-after": format_datetime(when, usegmt=True)})) == pytest.approx(30, abs=2)
+
+
+class RateLimitError(Exception):
+    def __init__(self):
+        super().__init__("429")
+        self.response = SimpleNamespace(status_code=429, headers={"retry-after": "12"})
+
+
+@patch("yaicli.llms.provider.ProviderFactory.create_provider")
+def test_client_pauses_on_rate_limit_error(mock_factory):
+    def completion(messages, stream=False, tool_policy=None):
+        raise RateLimitError()
+        yield LLMResponse()
+
+    mock_factory.return_value.completion.side_effect = completion
+    config = {"ENABLE_FUNCTIONS": False, "ENABLE_MCP": False, "MAX_TOOL_CALL_DEPTH": 3, "RATE_LIMIT_RPM": 60}
+    client = LLMClient(provider_name="openai", config=config)
+
+    with pytest.raises(RateLimitError):
+        list(client.completion_with_tools([ChatMessage(role="user", content="hi")]))
+    assert client.rate_limiter.reserve() == pytest.approx(12, abs=0.1)
@@ -0,0 +1,214 @@
+# type: ignore
+import threading
+import time
+
+import pytest
+
+from yaicli.exceptions import ProviderError
+from yaicli.llms import transport
+from yaicli.llms.metrics import RequestMetrics, span
+from yaicli.llms.providers.router_provider import BackendHealth, RouterProvider
+from yaicli.schemas import ChatMessage, LLMResponse
+
+
+class FakeProvider:
+    """Answers with `content`, after `delay` seconds or failing with `error`, or nothing when `silent`"""
+
+    def __init__(self, content="", delay=0.0, error=None, tool_role="tool", silent=False):
+        self.content = content
+        self.delay = delay
+        self.error = error
+        self.silent = silent
+        self.tool_role = tool_role
+        self.calls = 0
+        self.closed = threading.Event()
+
+    def completion(self, messages, stream=False, tool_policy=None):
+        self.calls += 1
+        try:
+            time.sleep(self.delay)
+            if self.error:
+                raise self.error
+            if self.silent:
+                # Like providers that print a request error and return
+                return
+            yield LLMResponse(content=self.content)
+            yield LLMResponse(content="!", finish_reason="stop")
+        finally:
+            self.closed.set()
+
+    def detect_tool_role(self):
+        return self.tool_role
+
+
+@pytest.fixture
+def config():
+    return {
+        "ENABLE_FUNCTIONS": False,
+        "ENABLE_MCP": False,
+        "MODEL": "base-model",
+        "ROUTER_BACKENDS": '{"primary": {"PROVIDER": "openai", "MODEL": "gpt-4o"}, "deepseek": {}}',
+    }
+
+
+def make_router(config, *providers, **overrides):
+    router = RouterProvider(config={**config, **overrides})
+    for backend, provider in zip(router.backends, providers):
+        backend.__dict__["provider"] = provider
+    return router
+
+
+def contents(responses):
+    return "".join(r.content for r in responses)
+
+
+def test_load_backends(config):
+    router = RouterProvider(config=config)
+    primary, deepseek = router.backends
+    assert (primary.name, primary.provider_name, primary.config["MODEL"]) == ("primary", "openai", "gpt-4o")
+    assert (deepseek.provider_name, deepseek.config["MODEL"]) == ("deepseek", "base-model")
+
+
+@pytest.mark.parametrize("backends", ["", "[]", "{not json", '{"x": {"PROVIDER": "nope"}}', '{"router": {}}'])
+def test_invalid_backends(config, backends):
+    with pytest.raises(ProviderError):
+        RouterProvider(config={**config, "ROUTER_BACKENDS": backends})
+
+
+def test_failover_to_next_backend(config):
+    failing, healthy = FakeProvider(error=ConnectionError("down")), FakeProvider("hi", tool_role="user")
+    router = make_router(config, failing, healthy)
+
+    assert contents(router.completion([ChatMessage(role="user", content="hi")])) == "hi!"
+    assert router.detect_tool_role() == "user"
+    # The failed backend cools down and is tried last
+    assert [b.name for b in router._ordered_backends()] == ["deepseek", "primary"]
+
+
+def test_failover_when_backend_returns_nothing(config):
+    silent, healthy = FakeProvider(silent=True), FakeProvider("hi")
+    router = make_router(config, silent, healthy)
+
+    assert contents(router.completion([])) == "hi!"
+    primary = router.backends[0]
+    assert primary.health.failures == 1
+    assert len(primary.health.ttft) == 0
+
+
+def test_hedged_backend_returning_nothing_fails(config):
+    silent, healthy = FakeProvider(silent=True), FakeProvider("hi", delay=0.1)
+    router = make_router(config, silent, healthy, ROUTER_HEDGE=True, ROUTER_HEDGE_DELAY=5)
+
+    assert contents(router.completion([], stream=True)) == "hi!"
+    assert router.backends[0].health.failures == 1
+    assert router.last_backend.name == "deepseek"
+
+
+def test_all_backends_failed(config):
+    router = make_router(config, FakeProvider(error=ConnectionError("a")), FakeProvider(error=TimeoutError("b")))
+    with pytest.raises(ProviderError, match="b"):
+        list(router.completion([]))
+
+
+def test_hedged_request_uses_first_response(config):
+    slow, fast = FakeProvider("slow", delay=1.0), FakeProvider("fast")
+    router = make_router(config, slow, fast, ROUTER_HEDGE=True, ROUTER_HEDGE_DELAY=0.05)
+
+    started = time.monotonic()
+    assert contents(router.completion([], stream=True)) == "fast!"
+    assert time.monotonic() - started < 0.9
+    assert router.last_backend.name == "deepseek"
+    # The slow request is dropped once it responds
+    assert slow.closed.wait(timeout=5)
+
+
+class EndlessProvider(FakeProvider):
+    """Streams chunks until the stream is closed"""
+
+    def completion(self, messages, stream=False, tool_policy=None):
+        self.calls += 1
+        try:
+            with span("backend_request"):
+                pass
+            while True:
+                yield LLMResponse(content="x")
+                time.sleep(0.01)
+        finally:
+            self.closed.set()
+
+
+class StalledProvider(FakeProvider):
+    """Receives response headers, then waits for a first chunk that only ends with the response"""
+
+    def completion(self, messages, stream=False, tool_policy=None):
+        self.calls += 1
+        aborted = threading.Event()
+        response = type("Response", (), {"close": lambda _: aborted.set()})()
+        try:
+            # What the shared HTTP client's response hook does
+            transport._on_response_headers(response)
+            if not aborted.wait(timeout=10):
+                yield LLMResponse(content="too late")
+            raise ConnectionError("response closed")
+        finally:
+            self.closed.set()
+
+
+def test_hedged_winner_stops_when_consumer_stops(config):
+    endless, spare = EndlessProvider(), FakeProvider("spare", delay=1)
+    router = make_router(config, endless, spare, ROUTER_HEDGE=True, ROUTER_HEDGE_DELAY=1)
+
+    responses = router.completion([], stream=True)
+    assert next(responses).content == "x"
+    responses.close()
+
+    assert endless.closed.wait(timeout=5)
+
+
+def test_hedged_loser_response_aborted(config):
+    stalled, fast = StalledProvider(), FakeProvider("fast")
+    router = make_router(config, stalled, fast, ROUTER_HEDGE=True, ROUTER_HEDGE_DELAY=0.05)
+
+    started = time.monotonic()
+    assert contents(router.completion([], stream=True)) == "fast!"
+    # Closing its response ends the stalled request long before its own timeout
+    assert stalled.closed.wait(timeout=5)
+    assert time.monotonic() - started < 5
+
+
+def test_hedged_backend_records_request_metrics(config):
+    router = make_router(config, EndlessProvider(), FakeProvider(), ROUTER_HEDGE=True, ROUTER_HEDGE_DELAY=1)
+    metrics = RequestMetrics("router", "base-model")
+
+    responses = metrics.observe(router.completion([], stream=True))
+    next(responses)
+    responses.close()
+
+    assert "backend_request" in metrics.phase_durations()
+
+
+def test_hedge_not_started_when_primary_is_fast(config):
+    fast, spare = FakeProvider("fast"), FakeProvider("spare")
+    router = make_router(config, fast, spare, ROUTER_HEDGE=True, ROUTER_HEDGE_DELAY=1)
+
+    assert contents(router.completion([], stream=True)) == "fast!"
+    assert spare.calls == 0
+
+
+def test_hedge_delay_follows_p95(config):
+    router = make_router(config, FakeProvider(), FakeProvider(), ROUTER_HEDGE_DELAY=3)
+    backend = router.backends[0]
+    assert router._hedge_delay(backend) == 3
+    for ttft in range(1, 21):
+        backend.health.record_success(ttft / 10)
+    assert router._hedge_delay(backend) == 2.0
+
+
+def test_backoff_grows_with_failures():
+    health = BackendHealth()
+    health.record_failure(cooldown=10)
+    first = health.retry_at
+    health.record_failure(cooldown=10)
+    assert health.retry_at - first > 9
+    health.record_success(0.1)
+    assert health.available(time.monotonic())
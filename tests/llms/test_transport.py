@@ -0,0 +1,170 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpcore
+import pytest
+
+from yaicli.llms import transport
+from yaicli.llms.transport import (
+    AsyncCachingResolverBackend,
+    CachingResolverBackend,
+    HTTPSettings,
+    get_async_http_client,
+    get_http_client,
+    get_http_transport,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches(monkeypatch):
+    for key in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "http_proxy", "https_proxy", "all_proxy"):
+        monkeypatch.delenv(key, raising=False)
+    transport._http_transport.cache_clear()
+    transport._http_client.cache_clear()
+    transport._async_pools.clear()
+    yield
+    transport._http_transport.cache_clear()
+    transport._http_client.cache_clear()
+    transport._async_pools.clear()
+
+
+def test_settings_from_config():
+    config = {"HTTP2": False, "HTTP_MAX_CONNECTIONS": 5, "HTTP_KEEPALIVE_EXPIRY": 30, "DNS_CACHE_TTL": 10, "TIMEOUT": 9}
+    settings = HTTPSettings.from_config(config)
+    assert settings == HTTPSettings(
+        http2=False, max_connections=5, keepalive_expiry=30.0, dns_cache_ttl=10, timeout=9.0
+    )
+    assert settings.limits.max_keepalive_connections == 5
+
+
+def test_settings_defaults_for_missing_keys():
+    settings = HTTPSettings.from_config({})
+    assert settings.max_connections == transport.DEFAULT_HTTP_MAX_CONNECTIONS
+    assert settings.dns_cache_ttl == 0
+
+
+def test_client_shared_for_equal_settings():
+    client = get_http_client({"TIMEOUT": 10})
+    assert get_http_client({"TIMEOUT": 10}) is client
+    assert get_http_client({"TIMEOUT": 20}) is not client
+    assert isinstance(get_http_transport({"TIMEOUT": 10}), transport.PooledTransport)
+
+
+def test_env_proxies_skip_custom_transport(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.local:8080")
+    assert get_http_transport({}) is None
+    client = get_http_client({})
+    assert any(mount is not None for mount in client._mounts.values())
+
+
+def test_dns_cache_backend_used_when_ttl_set():
+    pooled = transport.PooledTransport(HTTPSettings(dns_cache_ttl=30))
+    assert isinstance(pooled._pool._network_backend, CachingResolverBackend)
+
+
+def test_resolver_caches_addresses():
+    backend = CachingResolverBackend(ttl=60)
+    infos = [(None, None, None, "", ("10.0.0.1", 443)), (None, None, None, "", ("10.0.0.1", 443))]
+    with patch("yaicli.llms.transport.socket.getaddrinfo", return_value=infos) as getaddrinfo:
+        assert backend.resolve("api.example.com", 443) == ["10.0.0.1"]
+        assert backend.resolve("api.example.com", 443) == ["10.0.0.1"]
+    getaddrinfo.assert_called_once()
+
+
+def test_resolver_expires_entries():
+    backend = CachingResolverBackend(ttl=0)
+    infos = [(None, None, None, "", ("10.0.0.1", 443))]
+    with patch("yaicli.llms.transport.socket.getaddrinfo", return_value=infos) as getaddrinfo:
+        backend.resolve("api.example.com", 443)
+        backend.resolve("api.example.com", 443)
+    assert getaddrinfo.call_count == 2
+
+
+def test_resolver_lookup_error_is_connect_error():
+    backend = CachingResolverBackend(ttl=60)
+    with patch("yaicli.llms.transport.socket.getaddrinfo", side_effect=OSError("no such host")):
+        with pytest.raises(httpcore.ConnectError):
+            backend.resolve("nope.invalid", 443)
+
+
+def test_connect_tries_next_address_and_evicts_on_failure():
+    backend = CachingResolverBackend(ttl=60)
+    backend._cache[("api.example.com", 443)] = (float("inf"), ["10.0.0.1", "10.0.0.2"])
+    stream = object()
+    with patch.object(
+        httpcore.SyncBackend, "connect_tcp", side_effect=[httpcore.ConnectError("refused"), stream]
+    ) as connect:
+        assert backend.connect_tcp("api.example.com", 443) is stream
+    assert [call.args[0] for call in connect.call_args_list] == ["10.0.0.1", "10.0.0.2"]
+
+    with patch.object(httpcore.SyncBackend, "connect_tcp", side_effect=httpcore.ConnectError("refused")):
+        with pytest.raises(httpcore.ConnectError):
+            backend.connect_tcp("api.example.com", 443)
+    assert ("api.example.com", 443) not in backend._cache
+
+
+def test_client_reuses_connection():
+    """Consecutive requests go over one kept-alive connection"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = str(self.client_address[1]).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = get_http_client({"DNS_CACHE_TTL": 30})
+        url = f"http://127.0.0.1:{server.server_port}/"
+        ports = {client.get(url).text for _ in range(3)}
+        assert len(ports) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_client_marks_response_headers():
+    client = get_http_client({})
+    assert transport._on_response_headers in client.event_hooks["response"]
+
+
+def test_async_client_shared_within_a_loop():
+    async def clients():
+        return get_async_http_client({"TIMEOUT": 10}), get_async_http_client({"TIMEOUT": 10})
+
+    first, again = asyncio.run(clients())
+    assert first is again
+    assert isinstance(first._transport, transport.AsyncPooledTransport)
+    assert transport._aon_response_headers in first.event_hooks["response"]
+    # Connections of a closed loop can't be reused, a new loop gets a new pool
+    second, _ = asyncio.run(clients())
+    assert second is not first
+    assert len(transport._async_pools) == 1
+
+
+def test_async_dns_cache_backend_used_when_ttl_set():
+    pooled = transport.AsyncPooledTransport(HTTPSettings(dns_cache_ttl=30))
+    assert isinstance(pooled._pool._network_backend, AsyncCachingResolverBackend)
+
+
+def test_async_resolver_caches_addresses():
+    backend = AsyncCachingResolverBackend(ttl=60)
+    infos = [(None, None, None, "", ("10.0.0.1", 443))]
+
+    async def resolve_twice():
+        return [await backend.resolve("api.example.com", 443) for _ in range(2)]
+
+    with patch("anyio.getaddrinfo", return_value=infos) as getaddrinfo:
+        assert asyncio.run(resolve_twice()) == [["10.0.0.1"], ["10.0.0.1"]]
+    getaddrinfo.assert_called_once()
@@ -0,0 +1,88 @@
+import unittest
+
+from yaicli.accumulator import ResponseAccumulator, ThinkTagParser
+from yaicli.schemas import LLMResponse, ToolCall, Usage
+
+
+class TestThinkTagParser(unittest.TestCase):
+    def feed_all(self, chunks):
+        parser = ThinkTagParser()
+        parts = [parser.feed(chunk) for chunk in chunks] + [parser.flush()]
+        return "".join(p[0] for p in parts), "".join(p[1] for p in parts)
+
+    def test_opening_tag(self):
+        parser = ThinkTagParser()
+        self.assertEqual(parser.feed("Hello <think>thinking content"), ("Hello ", "thinking content"))
+        self.assertTrue(parser.in_reasoning)
+
+    def test_closing_tag(self):
+        parser = ThinkTagParser()
+        parser.in_reasoning = True
+        self.assertEqual(
+            parser.feed("thinking content</think> additional content"), (" additional content", "thinking content")
+        )
+        self.assertFalse(parser.in_reasoning)
+
+    def test_complete_tags(self):
+        self.assertEqual(
+            self.feed_all(["Hello <think>thinking content</think> goodbye"]), ("Hello  goodbye", "thinking content")
+        )
+
+    def test_tags_split_across_chunks(self):
+        text = "a<think>plan</think>answer<think>more</think>end"
+        for size in (1, 2, 3, 5):
+            chunks = [text[i : i + size] for i in range(0, len(text), size)]
+            self.assertEqual(self.feed_all(chunks), ("aanswerend", "planmore"))
+
+    def test_partial_tag_held_back(self):
+        parser = ThinkTagParser()
+        self.assertEqual(parser.feed("x <thi"), ("x ", ""))
+        self.assertEqual(parser.feed("s is not a tag"), ("<this is not a tag", ""))
+        self.assertEqual(parser.feed("trailing <"), ("trailing ", ""))
+        self.assertEqual(parser.flush(), ("<", ""))
+
+
+class TestResponseAccumulator(unittest.TestCase):
+    def test_content_and_think_tags(self):
+        response = ResponseAccumulator()
+        for chunk in ["Hi <thi", "nk>plan</think> the", " answer"]:
+            response.add(LLMResponse(content=chunk))
+        response.finish()
+
+        self.assertEqual(response.content, "Hi  the answer")
+        self.assertEqual(response.reasoning, "plan")
+        self.assertFalse(response.in_reasoning)
+
+    def test_tool_calls_deduplicated(self):
+        response = ResponseAccumulator()
+        tool_call = ToolCall(id="1", name="execute_shell_command", arguments="{}")
+
+        self.assertTrue(response.add(LLMResponse(tool_call=tool_call)))
+        self.assertFalse(response.add(LLMResponse(tool_call=tool_call)))
+        self.assertEqual(list(response.tool_calls), ["1"])
+
+    def test_usage_summed(self):
+        response = ResponseAccumulator()
+        response.add(LLMResponse(usage=Usage(prompt_tokens=10, completion_tokens=1)))
+        response.add(LLMResponse(usage=Usage(prompt_tokens=0, completion_tokens=2)))
+
+        self.assertEqual(response.usage.completion_tokens, 3)
+
+    def test_total_usage_kept_across_reset(self):
+        response = ResponseAccumulator()
+        response.add(LLMResponse(usage=Usage(prompt_tokens=10, completion_tokens=1)))
+        response.reset()
+        response.add(LLMResponse(usage=Usage(prompt_tokens=12, completion_tokens=2)))
+
+        self.assertEqual(response.usage, Usage(prompt_tokens=12, completion_tokens=2))
+        self.assertEqual(response.total_usage, Usage(prompt_tokens=22, completion_tokens=3))
+
+    def test_reset(self):
+        response = ResponseAccumulator()
+        response.add(LLMResponse(content="<think>plan", usage=Usage(prompt_tokens=1)))
+        response.reset()
+
+        self.assertEqual((response.content, response.reasoning), ("", ""))
+        self.assertIsNone(response.usage)
+        self.assertIsNone(response.last)
+        self.assertFalse(response.in_reasoning)
@@ -0,0 +1,64 @@
+import subprocess
+import sys
+import zipfile
+from importlib.metadata import distribution
+from pathlib import PurePosixPath
+from unittest.mock import patch
+
+import pytest
+
+from yaicli import bundle
+
+
+def test_provider_modules_follow_sibling_imports():
+    assert bundle.provider_modules(["deepseek"]) == {"deepseek_provider", "openai_provider"}
+    assert bundle.provider_modules(["openai", "openai-azure"]) == {"openai_provider"}
+
+
+def test_provider_modules_unknown_provider():
+    with pytest.raises(SystemExit, match="Unknown provider"):
+        bundle.provider_modules(["nope"])
+
+
+def test_requirement_extras_only_for_selected_providers():
+    assert bundle.requirement_extras(["openai"]) == {"anthropic": set()}
+    assert bundle.requirement_extras(["anthropic-bedrock"]) == {"anthropic": {"bedrock"}}
+
+
+def test_needs_filesystem():
+    paths = [PurePosixPath(p) for p in ("pkg/__init__.py", "pkg/py.typed", "pkg/lib/.keep", "pkg-1.0.dist-info/RECORD")]
+    assert not bundle._needs_filesystem("pkg", paths)
+    assert bundle._needs_filesystem("pkg", paths + [PurePosixPath("pkg/_speedups.cpython-311-x86_64-linux-gnu.so")])
+    assert bundle._needs_filesystem("pkg", paths + [PurePosixPath("pkg/data/table.json")])
+    assert bundle._needs_filesystem("yaicli", [])
+
+
+def test_top_level_names():
+    paths = [
+        PurePosixPath(p) for p in ("pkg/__init__.py", "_ext.cpython-311.so", "mod.py", "pkg-1.0.dist-info/METADATA")
+    ]
+    assert bundle._top_level_names(paths) == {"pkg", "_ext", "mod"}
+
+
+def test_build_and_run_bundle(tmp_path):
+    output = tmp_path / "ai.pyz"
+    # Only yaicli itself, the dependencies come from the running environment
+    with patch.object(bundle, "resolve_distributions", return_value=[distribution("yaicli")]):
+        bundle.build_bundle(output, providers=["deepseek"])
+
+    with zipfile.ZipFile(output) as zf:
+        names = set(zf.namelist())
+    assert "site-packages/yaicli/llms/providers/deepseek_provider.py" in names
+    assert (
+        f"site-packages/yaicli/llms/providers/__pycache__/openai_provider.{sys.implementation.cache_tag}.pyc" in names
+    )
+    assert "site-packages/yaicli/llms/providers/gemini_provider.py" not in names
+
+    root = tmp_path / "root"
+    env = {"HOME": str(tmp_path), "YAI_BUNDLE_ROOT": str(root), "PATH": ""}
+    result = subprocess.run([sys.executable, str(output), "--version"], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines()[-1].startswith("yaicli ")
+    (bundle_dir,) = root.iterdir()
+    assert (bundle_dir / ".yaicli.extracted").exists()
+    assert (bundle_dir / "site-packages" / "yaicli" / "entry.py").exists()
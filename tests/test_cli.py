@@ -1,4 +1,5 @@
 # type: ignore
+import io
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -21,7 +22,8 @@ from yaicli.const import (
     TEMP_MODE,
     DefaultRoleNames,
 )
-from yaicli.schemas import ToolPolicy
+from yaicli.printer import PipePrinter
+from yaicli.schemas import ChatMessage, LLMResponse, ToolPolicy
 
 
 @pytest.fixture
@@ -115,7 +117,6 @@ class TestCLIInitialization:
             patch("yaicli.cli.Printer"),
             patch("yaicli.cli.FileChatManager"),
             patch("pathlib.Path.mkdir"),
-            patch("yaicli.cli.PromptSession"),
         ):
             # Create a mock LLMClient and pass it directly to CLI
             mock_client = MagicMock()
@@ -134,7 +135,6 @@ class TestCLIInitialization:
             patch("yaicli.cli.Printer"),
             patch("yaicli.cli.FileChatManager"),
             patch("pathlib.Path.mkdir"),
-            patch("yaicli.cli.PromptSession"),
         ):
             mock_console = MagicMock()
             mock_console_func.return_value = mock_console
@@ -147,6 +147,31 @@ class TestCLIInitialization:
             # Verify console.print was called for config display
             mock_console.print.assert_any_call("Loading Configuration:", style="bold cyan")
 
+    def test_init_pipe_mode(self):
+        """Pipeline mode prints plain text and never prompts."""
+        with (
+            patch("yaicli.cli.get_console") as mock_console_func,
+            patch("yaicli.cli.FileChatManager"),
+        ):
+            mock_client = MagicMock()
+            mock_client.completion_with_tools.return_value = iter([LLMResponse(content="ls -la")])
+            cli = CLI(client=mock_client, role_manager=MagicMock(), pipe=True)
+            assert isinstance(cli.printer, PipePrinter)
+
+            with (
+                patch.object(cli.printer, "stream", new=io.StringIO()) as out,
+                patch.object(CLI, "_confirm_and_execute") as mock_confirm,
+                patch("sys.stderr", new=io.StringIO()) as err,
+            ):
+                cli.run(shell=True, user_input="list files")
+
+            assert out.getvalue() == "ls -la\n"
+            assert "Command not executed" in err.getvalue()
+            assert cli.current_mode == EXEC_MODE
+            mock_confirm.assert_not_called()
+            assert isinstance(cli.printer, PipePrinter)
+            mock_console_func.return_value.print.assert_not_called()
+
     def test_get_prompt_tokens(self, cli_with_mocks):
         """Test prompt token generation for different modes."""
         cli = cli_with_mocks
@@ -493,6 +518,28 @@ class TestAPIInteraction:
         assert messages[3].role == "user"
         assert messages[3].content == "new question"
 
+    @pytest.mark.parametrize(
+        "provider, expected",
+        [
+            # Prompt caching: the history before the references stays a stable prefix
+            ("anthropic", ["context", "q", "a", "file content", "explain file"]),
+            ("openai", ["context", "file content", "q", "a", "explain file"]),
+        ],
+    )
+    def test_build_messages_at_references_order(self, cli_with_mocks, provider, expected):
+        """@ references go after the history only for providers with prompt caching"""
+        cli = cli_with_mocks
+        cli.chat.history = [ChatMessage(role="user", content="q"), ChatMessage(role="assistant", content="a")]
+        cli.context_manager = MagicMock()
+        cli.context_manager.get_context_messages.return_value = [ChatMessage(role="system", content="context")]
+        cli.context_manager.parse_at_references.return_value = ("file content", "explain file", [])
+
+        with patch.dict(cfg, {"PROVIDER": provider}):
+            messages = cli._build_messages("explain @file")
+
+        assert [m.content for m in messages[1:]] == expected
+        assert [m.content for m in messages if m.transient] == ["file content"]
+
     @patch("yaicli.cli.CLI._build_messages")
     @patch("yaicli.printer.Printer.display_stream")
     def test_handle_llm_response_streaming(self, mock_display_stream, mock_build_messages, cli_with_mocks):
@@ -654,7 +701,7 @@ class TestMessageFiltering:
 class TestCommandExecution:
     """Test command execution functionality."""
 
-    @patch("yaicli.cli.prompt")
+    @patch("prompt_toolkit.prompt")
     @patch("yaicli.cli.subprocess.call")
     def test_confirm_and_execute_yes(self, mock_subprocess, mock_prompt, cli_with_mocks):
         """Test command execution with 'yes' confirmation."""
@@ -669,7 +716,7 @@ class TestCommandExecution:
             mock_subprocess.assert_called_once_with("ls -la", shell=True)
             mock_prompt.assert_not_called()  # Should not prompt for edit
 
-    @patch("yaicli.cli.prompt")
+    @patch("prompt_toolkit.prompt")
     @patch("yaicli.cli.subprocess.call")
     def test_confirm_and_execute_no(self, mock_subprocess, mock_prompt, cli_with_mocks):
         """Test command execution with 'no' confirmation."""
@@ -683,7 +730,7 @@ class TestCommandExecution:
             mock_subprocess.assert_not_called()
             mock_prompt.assert_not_called()
 
-    @patch("yaicli.cli.prompt")
+    @patch("prompt_toolkit.prompt")
     @patch("yaicli.cli.subprocess.call")
     def test_confirm_and_execute_edit(self, mock_subprocess, mock_prompt, cli_with_mocks):
         """Test command execution with 'edit' confirmation."""
@@ -2,7 +2,7 @@ from unittest.mock import MagicMock, mock_open, patch
 
 import pytest
 
-from yaicli.config import DEFAULT_CONFIG_MAP, Config
+from yaicli.config import CONFIG_CACHE_FILENAME, DEFAULT_CONFIG_MAP, Config
 
 
 # Mock console fixture
@@ -264,3 +264,68 @@ EXTRA_BODY={"custom_param": 123, "option": true}
 
             # Should pick up the new URL
             assert config["BASE_URL"] == "https://updated-api.com/v1"
+
+
+class TestConfigCache:
+    @pytest.fixture
+    def config_path(self, tmp_path):
+        config_path = tmp_path / "config.ini"
+        config_path.write_text("[core]\nMODEL=file-model\nSTREAM=false\nCHAT_HISTORY_DIR=/tmp/chats\n")
+        with patch("yaicli.config.CONFIG_PATH", config_path):
+            yield config_path
+
+    def test_snapshot_written_and_used(self, config_path, mock_console, monkeypatch):
+        monkeypatch.delenv("YAI_MODEL", raising=False)
+        config = Config(mock_console, use_cache=True)
+        assert config["MODEL"] == "file-model"
+        assert config["STREAM"] is False
+        cache_path = config_path.with_name(CONFIG_CACHE_FILENAME)
+        assert cache_path.exists()
+        assert cache_path.stat().st_mode & 0o777 == 0o600
+
+        with patch.object(Config, "_load_from_file") as load_from_file:
+            cached = Config(mock_console, use_cache=True)
+        load_from_file.assert_not_called()
+        assert cached == config
+
+    def test_snapshot_invalidated_by_file_change(self, config_path, mock_console, monkeypatch):
+        monkeypatch.delenv("YAI_MODEL", raising=False)
+        Config(mock_console, use_cache=True)
+        config_path.write_text("[core]\nMODEL=other-model\nCHAT_HISTORY_DIR=/tmp/chats\n")
+        assert Config(mock_console, use_cache=True)["MODEL"] == "other-model"
+
+    def test_env_applied_over_snapshot(self, config_path, mock_console, monkeypatch):
+        monkeypatch.delenv("YAI_MODEL", raising=False)
+        Config(mock_console, use_cache=True)
+        monkeypatch.setenv("YAI_MODEL", "env-model")
+        monkeypatch.setenv("YAI_STREAM", "true")
+        config = Config(mock_console, use_cache=True)
+        assert config["MODEL"] == "env-model"
+        assert config["STREAM"] is True
+
+    def test_env_values_not_written(self, config_path, mock_console, monkeypatch):
+        monkeypatch.setenv("YAI_API_KEY", "sk-secret-from-env")
+        config = Config(mock_console, use_cache=True)
+        assert config["API_KEY"] == "sk-secret-from-env"
+        assert "sk-secret-from-env" not in config_path.with_name(CONFIG_CACHE_FILENAME).read_text()
+
+    def test_no_snapshot_on_conversion_warning(self, config_path, mock_console, monkeypatch):
+        config_path.write_text("[core]\nTEMPERATURE=hot\nCHAT_HISTORY_DIR=/tmp/chats\n")
+        Config(mock_console, use_cache=True)
+        assert not config_path.with_name(CONFIG_CACHE_FILENAME).exists()
+
+    def test_corrupt_snapshot_ignored(self, config_path, mock_console, monkeypatch):
+        monkeypatch.delenv("YAI_MODEL", raising=False)
+        config_path.with_name(CONFIG_CACHE_FILENAME).write_text("not json")
+        assert Config(mock_console, use_cache=True)["MODEL"] == "file-model"
+
+    def test_cache_disabled_by_default(self, config_path, mock_console):
+        Config(mock_console)
+        assert not config_path.with_name(CONFIG_CACHE_FILENAME).exists()
+
+    def test_created_config_is_read(self, tmp_path, mock_console, monkeypatch):
+        monkeypatch.delenv("YAI_PROVIDER", raising=False)
+        config_path = tmp_path / "new" / "config.ini"
+        with patch("yaicli.config.CONFIG_PATH", config_path):
+            assert Config(mock_console, use_cache=True)["PROVIDER"] == "openai"
+            assert Config(mock_console, use_cache=True)["PROVIDER"] == "openai"
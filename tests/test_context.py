@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 
 from yaicli.context import ContextManager
@@ -103,10 +105,12 @@ def test_get_context_messages_dir_recursive(context_manager, temp_workspace):
 
 
 def test_global_instance():
-    # Verify the global instance exists
-    from yaicli.context import ctx_mgr
+    # Verify the global instance is created on demand and reused
+    from yaicli.context import get_context_manager
 
+    ctx_mgr = get_context_manager()
     assert isinstance(ctx_mgr, ContextManager)
+    assert get_context_manager() is ctx_mgr
 
 
 def test_parse_at_references(context_manager, temp_workspace):
@@ -259,3 +263,22 @@ def test_parse_at_references_unreadable_image(context_manager, temp_workspace):
         if sys.platform != "win32":
             img.chmod(0o644)
         os.chdir(original_cwd)
+
+
+def test_parse_at_references_without_images(context_manager, temp_workspace):
+    """Images are not encoded when the provider has no vision support."""
+    import os
+
+    original_cwd = os.getcwd()
+    os.chdir(temp_workspace)
+    (temp_workspace / "pic.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+    try:
+        with patch("yaicli.context.encode_local_image") as encode:
+            at_content, cleaned_input, at_images = context_manager.parse_at_references(
+                "Check @pic.png", include_images=False
+            )
+        encode.assert_not_called()
+        assert at_images == []
+        assert cleaned_input == "Check 'pic.png'"
+    finally:
+        os.chdir(original_cwd)
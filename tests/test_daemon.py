@@ -0,0 +1,152 @@
+import io
+import json
+import socket
+import socketserver
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from yaicli import daemon_client
+from yaicli.daemon import Daemon
+from yaicli.exceptions import YaicliError
+from yaicli.role import Role
+from yaicli.schemas import LLMResponse, RefreshLive
+
+
+@pytest.fixture
+def socket_path():
+    # AF_UNIX paths are limited to ~100 chars, pytest tmp_path can be longer
+    with tempfile.TemporaryDirectory(prefix="yai") as tmp:
+        yield Path(tmp) / "daemon.sock"
+
+
+@pytest.fixture
+def mock_client():
+    client = MagicMock()
+    client.completion_with_tools.return_value = iter(
+        [
+            LLMResponse(reasoning="thinking"),
+            LLMResponse(content="Hello"),
+            RefreshLive(),
+            LLMResponse(content=" world"),
+        ]
+    )
+    # Requests use forks of the client, let them record on the fixture
+    client.fork.return_value = client
+    return client
+
+
+@pytest.fixture
+def running_daemon(socket_path, mock_client):
+    role_manager = MagicMock()
+    role_manager.get_role.side_effect = lambda name: Role(name=name, prompt=f"prompt of {name}", variables={"x": 1})
+    daemon = Daemon(socket_path=socket_path, client=mock_client, role_manager=role_manager)
+    server = daemon.start()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.stop()
+    thread.join(timeout=5)
+
+
+def run_client(argv, stdin=""):
+    with patch("sys.stdin", io.StringIO(stdin)):
+        return daemon_client.main(argv)
+
+
+def test_client_streams_daemon_response(running_daemon, socket_path, mock_client, capsys):
+    code = run_client(["--socket", str(socket_path), "--show-reasoning", "hi"])
+
+    assert code == 0
+    out, err = capsys.readouterr()
+    assert out == "Hello\n world\n"
+    assert "thinking" in err
+    messages = mock_client.completion_with_tools.call_args.args[0]
+    assert [m.role for m in messages] == ["system", "user"]
+    assert messages[1].content == "hi"
+
+
+def test_client_forwards_stdin_and_mode(running_daemon, socket_path, mock_client, capsys):
+    code = run_client(["--socket", str(socket_path), "--shell", "--no-stream", "explain"], stdin="some input")
+
+    assert code == 0
+    messages = mock_client.completion_with_tools.call_args.args[0]
+    assert messages[0].content == "prompt of Shell Command Generator"
+    assert messages[1].content == "some input\n\nexplain"
+    assert mock_client.completion_with_tools.call_args.kwargs["stream"] is False
+
+
+def test_client_reports_daemon_error(running_daemon, socket_path, mock_client, capsys):
+    mock_client.completion_with_tools.side_effect = RuntimeError("boom")
+
+    assert run_client(["--socket", str(socket_path), "hi"]) == 1
+    assert "boom" in capsys.readouterr().err
+
+
+def test_invalid_request(running_daemon, socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(b"not json\n")
+        event = json.loads(sock.makefile("rb").readline())
+    assert event["event"] == "error"
+
+
+def test_client_without_daemon(socket_path, capsys):
+    assert run_client(["--socket", str(socket_path), "hi"]) == 1
+    assert "ai --daemon" in capsys.readouterr().err
+
+
+def test_client_without_prompt(socket_path):
+    assert run_client(["--socket", str(socket_path)]) == 2
+
+
+def test_refuse_second_daemon(running_daemon, socket_path, mock_client):
+    with pytest.raises(YaicliError, match="already running"):
+        Daemon(socket_path=socket_path, client=mock_client, role_manager=MagicMock()).start()
+
+
+def test_remove_stale_socket(socket_path, mock_client):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(socket_path))
+    stale.close()
+
+    daemon = Daemon(socket_path=socket_path, client=mock_client, role_manager=MagicMock())
+    server = daemon.start()
+    try:
+        assert socket_path.exists()
+    finally:
+        server.server_close()
+        socket_path.unlink()
+
+
+def test_socket_private_from_bind(socket_path, mock_client):
+    daemon = Daemon(socket_path=socket_path, client=mock_client, role_manager=MagicMock())
+    modes = []
+    original_bind = socketserver.UnixStreamServer.server_bind
+
+    def server_bind(server):
+        original_bind(server)
+        modes.append(socket_path.stat().st_mode & 0o777)
+
+    with patch.object(socketserver.UnixStreamServer, "server_bind", server_bind):
+        daemon.start()
+    try:
+        assert modes == [0o600]
+    finally:
+        daemon.server.server_close()
+        socket_path.unlink()
+
+
+def test_stop_from_serving_thread(socket_path, mock_client):
+    daemon = Daemon(socket_path=socket_path, client=mock_client, role_manager=MagicMock())
+    server = daemon.start()
+    # A request handler stopping the daemon runs in a thread of the server
+    server.service_actions = daemon.stop
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert not socket_path.exists()
@@ -67,7 +67,7 @@ class TestTyperApp:
         prompt_text = "list files"
         result = runner.invoke(app, ["--shell", prompt_text])
         assert result.exit_code == 0
-        mock_cli_class.assert_called_once_with(verbose=False, role="DEFAULT")
+        mock_cli_class.assert_called_once_with(verbose=False, role="DEFAULT", pipe=True)
         mock_cli_instance.run.assert_called_once_with(
             chat=False, shell=True, code=False, user_input=prompt_text, images=[]
         )
@@ -78,7 +78,7 @@ class TestTyperApp:
         prompt_text = "what is the date?"
         result = runner.invoke(app, [prompt_text])
         assert result.exit_code == 0
-        mock_cli_class.assert_called_once_with(verbose=False, role="DEFAULT")
+        mock_cli_class.assert_called_once_with(verbose=False, role="DEFAULT", pipe=True)
         mock_cli_instance.run.assert_called_once_with(
             chat=False, shell=False, code=False, user_input=prompt_text, images=[]
         )
@@ -90,7 +90,7 @@ class TestTyperApp:
         result = runner.invoke(app, ["--verbose", prompt_text])
         assert result.exit_code == 0
         # Verify CLI was instantiated with verbose=True
-        mock_cli_class.assert_called_once_with(verbose=True, role="DEFAULT")
+        mock_cli_class.assert_called_once_with(verbose=True, role="DEFAULT", pipe=True)
         mock_cli_instance.run.assert_called_once_with(
             chat=False, shell=False, code=False, user_input=prompt_text, images=[]
         )
@@ -103,7 +103,7 @@ class TestTyperApp:
         with patch("sys.stdin.isatty", return_value=False):
             result = runner.invoke(app, input=stdin_text)
         assert result.exit_code == 0
-        mock_cli_class.assert_called_once_with(verbose=False, role="DEFAULT")
+        mock_cli_class.assert_called_once_with(verbose=False, role="DEFAULT", pipe=True)
         mock_cli_instance.run.assert_called_once_with(
             chat=False, shell=False, code=False, user_input=stdin_text, images=[]
         )
@@ -117,11 +117,81 @@ class TestTyperApp:
         with patch("sys.stdin.isatty", return_value=False):
             result = runner.invoke(app, [arg_text], input=stdin_text)
         assert result.exit_code == 0
-        mock_cli_class.assert_called_once_with(verbose=False, role="DEFAULT")
+        mock_cli_class.assert_called_once_with(verbose=False, role="DEFAULT", pipe=True)
         mock_cli_instance.run.assert_called_once_with(
             chat=False, shell=False, code=False, user_input=expected_prompt, images=[]
         )
 
+    @patch("yaicli.cli.CLI.evaluate_role_name", return_value=DefaultRoleNames.DEFAULT)
+    def test_pipe_mode_follows_stdin(self, mock_evaluate_role_name, mock_cli_class, mock_cli_instance):
+        """Pipeline mode is enabled when stdin or stdout is not a TTY, unless given explicitly."""
+        # CliRunner swaps sys.stdin during invoke, patch the sys module entry reads it from
+        with patch("yaicli.entry.sys") as mock_sys:
+            mock_sys.stdin.isatty.return_value = True
+            mock_sys.stdout.isatty.return_value = True
+            runner.invoke(app, ["hello"])
+            runner.invoke(app, ["--pipe", "hello"])
+            mock_sys.stdout.isatty.return_value = False
+            runner.invoke(app, ["hello"])
+        runner.invoke(app, ["--no-pipe", "hello"])
+        assert [c.kwargs["pipe"] for c in mock_cli_class.call_args_list] == [False, True, True, False]
+
+    @patch("yaicli.cli.CLI.evaluate_role_name", return_value=DefaultRoleNames.SHELL)
+    def test_shell_mode_not_piped_for_redirected_stdout(
+        self, mock_evaluate_role_name, mock_cli_class, mock_cli_instance
+    ):
+        """Redirecting the output of --shell keeps asking to run the command."""
+        with patch("yaicli.entry.sys") as mock_sys:
+            mock_sys.stdin.isatty.return_value = True
+            mock_sys.stdout.isatty.return_value = False
+            runner.invoke(app, ["--shell", "list files"])
+        assert mock_cli_class.call_args.kwargs["pipe"] is False
+
+    @patch("yaicli.cli.CLI.evaluate_role_name", return_value=DefaultRoleNames.DEFAULT)
+    def test_chat_with_piped_stdin(self, mock_evaluate_role_name, mock_cli_class, mock_cli_instance):
+        """The REPL never renders in pipeline mode, a redirected stdin turns --chat into a single prompt."""
+        with patch("yaicli.entry.sys") as mock_sys:
+            mock_sys.stdin.isatty.return_value = False
+            mock_sys.stdin.read.return_value = "piped question"
+            mock_sys.stdout.isatty.return_value = True
+            result = runner.invoke(app, ["--chat"])
+            # Only stdout redirected, the REPL still runs
+            mock_sys.stdin.isatty.return_value = True
+            mock_sys.stdout.isatty.return_value = False
+            runner.invoke(app, ["--chat"])
+        assert "--chat is ignored" in result.stdout
+        first, second = mock_cli_instance.run.call_args_list
+        assert first.kwargs["chat"] is False and first.kwargs["user_input"] == "piped question"
+        assert second.kwargs["chat"] is True
+        assert [c.kwargs["pipe"] for c in mock_cli_class.call_args_list] == [True, False]
+
+    @patch("yaicli.cli.CLI.evaluate_role_name", return_value=DefaultRoleNames.DEFAULT)
+    def test_pipe_ignored_in_chat(self, mock_evaluate_role_name, mock_cli_class, mock_cli_instance):
+        with patch("yaicli.entry.sys") as mock_sys:
+            mock_sys.stdin.isatty.return_value = True
+            result = runner.invoke(app, ["--pipe", "--chat"])
+        assert "--pipe is ignored" in result.stdout
+        assert mock_cli_class.call_args.kwargs["pipe"] is False
+
+    def test_images_only_without_vision(self, mock_cli_class):
+        """Images as the only input of a provider without vision are an error, not an empty prompt."""
+        with patch.dict("yaicli.entry.cfg", {"PROVIDER": "cohere"}), patch("yaicli.entry.sys") as mock_sys:
+            mock_sys.stdin.isatty.return_value = True
+            result = runner.invoke(app, ["--image", "photo.png"])
+        assert result.exit_code == 1
+        assert "Provider 'cohere' does not support image input" in result.stdout
+        mock_cli_class.assert_not_called()
+
+    @patch("yaicli.cli.CLI.evaluate_role_name", return_value=DefaultRoleNames.DEFAULT)
+    def test_images_ignored_without_vision(self, mock_evaluate_role_name, mock_cli_class, mock_cli_instance):
+        """With a prompt, the images a provider can't use are dropped with a warning."""
+        with patch.dict("yaicli.entry.cfg", {"PROVIDER": "cohere"}), patch("yaicli.entry.sys") as mock_sys:
+            mock_sys.stdin.isatty.return_value = True
+            result = runner.invoke(app, ["--image", "photo.png", "describe"])
+        assert "Images will be ignored" in result.stdout
+        assert mock_cli_instance.run.call_args.kwargs["images"] == []
+        assert mock_cli_instance.run.call_args.kwargs["user_input"] == "describe"
+
     def test_no_prompt_no_chat(self):
         """Test calling without prompt and without --chat."""
         # Ensure stdin is treated as a TTY
@@ -0,0 +1,68 @@
+"""Cold start budget for the `ai` entry points, measured with `python -X importtime`."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time budget in microseconds. Typer + rich alone take ~150ms on a
+# typical machine, the budget leaves headroom for slow CI runners but still catches
+# an eagerly imported provider SDK or prompt_toolkit (each ~100ms+).
+ENTRY_IMPORT_BUDGET_US = 800_000
+CLI_IMPORT_BUDGET_US = 1_000_000
+# Take the best of several runs to smooth out noise
+RUNS = 3
+
+# Modules that must never be imported on the one-shot path
+REPL_ONLY_MODULES = ("prompt_toolkit", "yaicli.history", "yaicli.completer", "yaicli.cmd_handler")
+# Modules only needed once an option callback or a prompt asks for them
+ENTRY_DEFERRED_MODULES = REPL_ONLY_MODULES + ("yaicli.cli", "yaicli.role", "yaicli.chat", "yaicli.llms", "openai")
+
+
+def import_profile(module: str, home) -> dict[str, int]:
+    """Import `module` in a fresh interpreter and return {module name: cumulative us}"""
+    env = {**os.environ, "HOME": str(home)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.fixture(scope="module")
+def home(tmp_path_factory):
+    home = tmp_path_factory.mktemp("home")
+    # Create the default config once, so it is not part of the measurement
+    import_profile("yaicli.config", home)
+    return home
+
+
+def test_entry_does_not_import_deferred_modules(home):
+    profile = import_profile("yaicli.entry", home)
+    loaded = [name for name in profile if name.startswith(ENTRY_DEFERRED_MODULES)]
+    assert loaded == []
+
+
+def test_cli_does_not_import_repl_modules(home):
+    profile = import_profile("yaicli.cli", home)
+    loaded = [name for name in profile if name.startswith(REPL_ONLY_MODULES)]
+    assert loaded == []
+
+
+@pytest.mark.parametrize(
+    "module,budget",
+    [("yaicli.entry", ENTRY_IMPORT_BUDGET_US), ("yaicli.cli", CLI_IMPORT_BUDGET_US)],
+)
+def test_import_time_budget(home, module, budget):
+    best = min(import_profile(module, home)[module] for _ in range(RUNS))
+    assert best < budget, f"import {module} took {best / 1000:.1f}ms, budget is {budget / 1000:.0f}ms"
@@ -2,7 +2,14 @@ from unittest.mock import patch
 
 import pytest
 
-from yaicli.utils import detect_os, detect_shell
+from yaicli.const import DEFAULT_OS_NAME, DEFAULT_SHELL_NAME
+from yaicli.utils import (
+    EnvironmentFingerprint,
+    _detected_environment,
+    detect_os,
+    detect_shell,
+    environment_fingerprint,
+)
 
 
 @pytest.mark.parametrize(
@@ -167,3 +174,69 @@ def test_detect_shell_default_sh(mock_getenv, mock_system):
     assert detect_shell(config) == "sh"
     mock_system.assert_called_once()
     mock_getenv.assert_called_once_with("SHELL")
+
+
+@pytest.fixture
+def environment_cache(tmp_path):
+    cache_path = tmp_path / ".environment.json"
+    _detected_environment.cache_clear()
+    with patch("yaicli.utils.ENVIRONMENT_CACHE_PATH", cache_path):
+        yield cache_path
+    _detected_environment.cache_clear()
+
+
+def test_environment_fingerprint_config_precedence(environment_cache):
+    with patch("yaicli.utils._detected_environment") as detected:
+        fingerprint = environment_fingerprint({"OS_NAME": "MyOS", "SHELL_NAME": "fish"})
+    detected.assert_not_called()
+    assert fingerprint == EnvironmentFingerprint(os_name="MyOS", shell_name="fish")
+    assert fingerprint.to_role_variables() == {"_os": "MyOS", "_shell": "fish"}
+
+
+@patch("yaicli.utils.detect_shell", return_value="zsh")
+@patch("yaicli.utils.detect_os", return_value="Linux/Test")
+def test_environment_fingerprint_memoized(mock_os, mock_shell, environment_cache):
+    config = {"OS_NAME": DEFAULT_OS_NAME, "SHELL_NAME": DEFAULT_SHELL_NAME}
+    assert environment_fingerprint(config) == EnvironmentFingerprint("Linux/Test", "zsh")
+    assert environment_fingerprint(config) == EnvironmentFingerprint("Linux/Test", "zsh")
+    mock_os.assert_called_once()
+    mock_shell.assert_called_once()
+    assert environment_cache.exists()
+
+
+@patch("yaicli.utils.detect_shell", return_value="zsh")
+@patch("yaicli.utils.detect_os", return_value="Linux/Test")
+def test_environment_fingerprint_disk_cache(mock_os, mock_shell, environment_cache, monkeypatch):
+    monkeypatch.setenv("SHELL", "/bin/zsh")
+    environment_fingerprint({})
+    # A new process starts with an empty memo but reuses the on-disk result
+    _detected_environment.cache_clear()
+    environment_fingerprint({})
+    mock_os.assert_called_once()
+
+    # Changing the shell invalidates the cache
+    _detected_environment.cache_clear()
+    monkeypatch.setenv("SHELL", "/usr/bin/fish")
+    mock_shell.return_value = "fish"
+    assert environment_fingerprint({}).shell_name == "fish"
+    assert mock_os.call_count == 2
+
+
+@patch("yaicli.utils.detect_shell", return_value="zsh")
+@patch("yaicli.utils.detect_os", return_value="Windows 10")
+def test_environment_fingerprint_os_upgrade(mock_os, mock_shell, environment_cache):
+    with patch("yaicli.utils.platform.release", return_value="10"):
+        environment_fingerprint({})
+    # Upgrading the OS invalidates the cache, even when no OS release file exists
+    _detected_environment.cache_clear()
+    mock_os.return_value = "Windows 11"
+    with patch("yaicli.utils.platform.release", return_value="11"):
+        assert environment_fingerprint({}).os_name == "Windows 11"
+    assert mock_os.call_count == 2
+
+
+@patch("yaicli.utils.detect_shell", return_value="zsh")
+@patch("yaicli.utils.detect_os", return_value="Linux/Test")
+def test_environment_fingerprint_corrupt_cache(mock_os, mock_shell, environment_cache):
+    environment_cache.write_text("not json")
+    assert environment_fingerprint({}).os_name == "Linux/Test"
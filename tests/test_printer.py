@@ -1,10 +1,13 @@
+import io
 import unittest
 from unittest.mock import MagicMock, patch
 
-from rich.console import Group
+from rich.console import Console, Group
 
-from yaicli.printer import Printer
-from yaicli.schemas import ChatMessage
+from yaicli.accumulator import ResponseAccumulator
+from yaicli.printer import FrameScheduler, LineWriter, PipePrinter, Printer
+from yaicli.render import BlockSplitter
+from yaicli.schemas import ChatMessage, LLMResponse, RefreshLive
 
 
 class TestPrinter(unittest.TestCase):
@@ -36,79 +39,45 @@ class TestPrinter(unittest.TestCase):
 
     def test_reset_state(self):
         """Test _reset_state method properly resets printer state."""
-        # Set in_reasoning to True first
-        self.printer.in_reasoning = True
+        self.printer._process_chunk(LLMResponse(content="<think>thinking"))
+        self.assertTrue(self.printer.in_reasoning)
 
         # Reset the state
         self.printer._reset_state()
 
         # Verify state was reset
         self.assertFalse(self.printer.in_reasoning)
-
-    def test_check_and_update_think_tags_opening(self):
-        """Test _check_and_update_think_tags with opening tag."""
-        content = "Hello <think>thinking content"
-        reasoning = ""
-
-        new_content, new_reasoning = self.printer._check_and_update_think_tags(content, reasoning)
-
-        self.assertEqual(new_content, "Hello ")
-        self.assertEqual(new_reasoning, "thinking content")
-        self.assertTrue(self.printer.in_reasoning)
-
-    def test_check_and_update_think_tags_closing(self):
-        """Test _check_and_update_think_tags with closing tag."""
-        content = "Hello "
-        reasoning = "thinking content</think> additional content"
-
-        # Set in_reasoning to True first
-        self.printer.in_reasoning = True
-
-        new_content, new_reasoning = self.printer._check_and_update_think_tags(content, reasoning)
-
-        self.assertEqual(new_content, "Hello  additional content")
-        self.assertEqual(new_reasoning, "thinking content")
-        self.assertFalse(self.printer.in_reasoning)
-
-    def test_check_and_update_think_tags_complete(self):
-        """Test _check_and_update_think_tags with complete tags in content."""
-        content = "Hello <think>thinking content</think> goodbye"
-        reasoning = ""
-
-        new_content, new_reasoning = self.printer._check_and_update_think_tags(content, reasoning)
-
-        self.assertEqual(new_content, "Hello  goodbye")
-        self.assertEqual(new_reasoning, "thinking content")
-        self.assertFalse(self.printer.in_reasoning)
+        self.assertEqual(self.printer._response(), ("", ""))
 
     def test_process_chunk_content_only(self):
         """Test _process_chunk with content only."""
-        result_content, result_reasoning = self.printer._process_chunk(
-            "new content", "", "existing content ", "existing reasoning"
-        )
+        self.printer._process_chunk(LLMResponse(content="existing content ", reasoning="existing reasoning"))
+        result = self.printer._process_chunk(LLMResponse(content="new content"))
 
-        self.assertEqual(result_content, "existing content new content")
-        self.assertEqual(result_reasoning, "existing reasoning")
+        self.assertEqual(result, ("new content", ""))
+        self.assertEqual(self.printer._response(), ("existing content new content", "existing reasoning"))
 
     def test_process_chunk_reasoning_only(self):
         """Test _process_chunk with reasoning only."""
-        result_content, result_reasoning = self.printer._process_chunk(
-            "", "new reasoning", "existing content", "existing reasoning "
-        )
+        self.printer._process_chunk(LLMResponse(content="existing content", reasoning="existing reasoning "))
+        result = self.printer._process_chunk(LLMResponse(content="", reasoning="new reasoning"))
 
-        self.assertEqual(result_content, "existing content")
-        self.assertEqual(result_reasoning, "existing reasoning new reasoning")
+        self.assertEqual(result, ("", "new reasoning"))
+        self.assertEqual(self.printer._response(), ("existing content", "existing reasoning new reasoning"))
 
     def test_process_chunk_with_think_tags(self):
         """Test _process_chunk with think tags in content."""
-        result_content, result_reasoning = self.printer._process_chunk(
-            "content <think>some thoughts", "", "previous ", ""
-        )
+        self.printer._process_chunk(LLMResponse(content="previous "))
+        result = self.printer._process_chunk(LLMResponse(content="content <think>some thoughts"))
 
-        self.assertEqual(result_content, "previous content ")
-        self.assertEqual(result_reasoning, "some thoughts")
+        self.assertEqual(result, ("content ", "some thoughts"))
+        self.assertEqual(self.printer._response(), ("previous content ", "some thoughts"))
         self.assertTrue(self.printer.in_reasoning)
 
+        self.printer._process_chunk(LLMResponse(content=" more</think> answer"))
+        self.assertEqual(self.printer._response(), ("previous content  answer", "some thoughts more"))
+        self.assertFalse(self.printer.in_reasoning)
+
     def test_format_display_text_content_only(self):
         """Test _format_display_text with only content."""
         result = self.printer._format_display_text("sample content", "")
@@ -226,3 +195,225 @@ class TestPrinter(unittest.TestCase):
         finally:
             # Restore original method
             self.printer.display_stream = original_display_stream
+
+    @patch("yaicli.printer.Live")
+    def test_display_stream_prints_completed_blocks(self, mock_live):
+        live = mock_live.return_value
+        live.console = MagicMock()
+        self.printer.max_fps = 0
+        text = "First paragraph.\n\n```python\nx = 1\n```\nLast"
+        chunks = [LLMResponse(content=text[i : i + 4]) for i in range(0, len(text), 4)]
+
+        content, _ = self.printer.display_stream(iter(chunks))
+
+        self.assertEqual(content, text)
+        printed = [call.args[0] for call in live.console.print.call_args_list]
+        self.assertEqual(
+            [p.markup if hasattr(p, "markup") else p for p in printed],
+            ["First paragraph.\n\n", "", "```python\nx = 1\n```\n"],
+        )
+        # Only the open block is left in the live display
+        last_update = live.update.call_args.args[0]
+        self.assertEqual(last_update.renderables[-1].markup, "Last")
+
+    def test_display_stream_output_matches_full_render(self):
+        text = "Intro\n\n- a\n- b\n\n```\ncode\n\nmore\n```\nOutro\n"
+        outputs = []
+        for stream in (True, False):
+            console = Console(file=io.StringIO(), width=40, force_terminal=False)
+            printer = Printer(console=console, config=self.mock_config)
+            if stream:
+                printer.display_stream(iter(LLMResponse(content=c) for c in text))
+            else:
+                console.print(printer._format_display_text(text, ""))
+            # Live leaves out the final line break without a terminal
+            outputs.append(console.file.getvalue().rstrip())
+
+        self.assertEqual(outputs[0], outputs[1])
+
+    @patch("yaicli.printer.Live")
+    @patch("yaicli.printer.FrameScheduler.due", side_effect=[True, False, False, True, False])
+    def test_display_stream_coalesces_chunks(self, mock_due, mock_live):
+        live = mock_live.return_value
+        self.printer.content_formatter = lambda text, **kwargs: text
+
+        content, _ = self.printer.display_stream(iter(LLMResponse(content=c) for c in "abcde"))
+
+        self.assertEqual(content, "abcde")
+        shown = [call.args[0].renderables[-1] for call in live.update.call_args_list]
+        # Two frames, and the last chunk is flushed at the end
+        self.assertEqual(shown, ["a", "abcd", "abcde"])
+
+
+class TestFrameScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.frames = FrameScheduler(10, clock=lambda: self.now)
+
+    def draw(self, seconds):
+        with self.frames.frame():
+            self.now += seconds
+
+    def test_limits_frame_rate(self):
+        self.assertTrue(self.frames.due())
+        self.draw(0.01)
+        self.now = 0.05
+        self.assertFalse(self.frames.due())
+        self.now = 0.1
+        self.assertTrue(self.frames.due())
+
+    def test_slow_frames_lower_the_rate(self):
+        self.draw(0.2)
+        self.assertAlmostEqual(self.frames.interval, 0.4)
+        self.draw(5)
+        self.assertEqual(self.frames.interval, FrameScheduler.MAX_INTERVAL)
+        # Back to the max rate once drawing is fast again
+        self.draw(0.001)
+        self.assertAlmostEqual(self.frames.interval, 0.1)
+
+    def test_unlimited(self):
+        frames = FrameScheduler(0)
+        with frames.frame():
+            pass
+        self.assertTrue(frames.due())
+
+
+class TestBlockSplitter(unittest.TestCase):
+    def feed_chars(self, text):
+        splitter = BlockSplitter()
+        blocks = []
+        for char in text:
+            splitter.append(char)
+            blocks.append(splitter.take())
+        return [block for block in blocks if block], splitter
+
+    def test_paragraphs(self):
+        blocks, splitter = self.feed_chars("one\n\ntwo\nlines\n\nthree")
+        self.assertEqual(blocks, ["one\n\n", "two\nlines\n\n"])
+        self.assertEqual(splitter.rest, "three")
+
+    def test_code_fence_kept_whole(self):
+        blocks, _ = self.feed_chars("```py\na\n\nb\n```\nafter")
+        self.assertEqual(blocks, ["```py\na\n\nb\n```\n"])
+
+    def test_indented_continuation_not_split(self):
+        blocks, _ = self.feed_chars("- item\n\n  more of item\n\nnext")
+        self.assertEqual(blocks, ["- item\n\n  more of item\n\n"])
+
+    def test_take_coalesced_chunks(self):
+        splitter = BlockSplitter()
+        for chunk in ("one\n", "\ntwo\n\n", "```\nco", "de\n```\nopen"):
+            splitter.append(chunk)
+        self.assertEqual(splitter.take(), "one\n\ntwo\n\n```\ncode\n```\n")
+        self.assertEqual(splitter.rest, "open")
+
+    def test_flush(self):
+        splitter = BlockSplitter()
+        splitter.append("open")
+        self.assertEqual(splitter.take(), "")
+        splitter.append(" block")
+        self.assertEqual(splitter.flush(), "open block")
+        self.assertEqual(splitter.rest, "")
+
+
+class FlushRecorder(io.BytesIO):
+    """Binary buffer recording its contents at each flush"""
+
+    def __init__(self):
+        super().__init__()
+        self.flushed = []
+
+    def flush(self):
+        self.flushed.append(self.getvalue())
+
+
+class TestLineWriter(unittest.TestCase):
+    def setUp(self):
+        self.buffer = FlushRecorder()
+        self.stream = io.TextIOWrapper(self.buffer, encoding="utf-8")
+
+    def test_writes_bytes_flushed_at_newlines(self):
+        writer = LineWriter(self.stream)
+        # Ignore the flush of earlier text
+        self.buffer.flushed.clear()
+
+        for text in ["caf", "é\n", "next", " line\nrest"]:
+            writer.write(text)
+
+        self.assertEqual(self.buffer.getvalue(), "café\nnext line\nrest".encode())
+        self.assertEqual(self.buffer.flushed, ["café\n".encode(), "café\nnext line\nrest".encode()])
+
+    def test_text_stream_without_buffer(self):
+        out = io.StringIO()
+        LineWriter(out).write("text\n")
+        self.assertEqual(out.getvalue(), "text\n")
+
+    def test_pipe_printer_keeps_earlier_text_first(self):
+        printer = PipePrinter(stream=self.stream, reasoning_stream=io.StringIO())
+        self.stream.write("header\n")
+
+        printer.display_stream(iter([LLMResponse(content="answer")]))
+
+        self.assertEqual(self.buffer.getvalue(), b"header\nanswer\n")
+
+
+class TestPipePrinter(unittest.TestCase):
+    def setUp(self):
+        self.out = io.StringIO()
+        self.err = io.StringIO()
+        self.printer = PipePrinter(stream=self.out, reasoning_stream=self.err)
+        self.printer.show_reasoning = True
+
+    def test_writes_plain_content(self):
+        chunks = [LLMResponse(content="# Title"), LLMResponse(content="\n**bold**")]
+
+        content, reasoning = self.printer.display_stream(iter(chunks))
+
+        self.assertEqual(content, "# Title\n**bold**")
+        self.assertEqual(self.out.getvalue(), "# Title\n**bold**\n")
+        self.assertEqual(self.err.getvalue(), "")
+
+    def test_think_tags_split_across_chunks(self):
+        chunks = [
+            LLMResponse(content="<thi"),
+            LLMResponse(content="nk>plan</th"),
+            LLMResponse(content="ink>Answer"),
+            LLMResponse(reasoning=None, content=" done"),
+        ]
+
+        content, reasoning = self.printer.display_stream(iter(chunks))
+
+        self.assertEqual((content, reasoning), ("Answer done", "plan"))
+        self.assertEqual(self.out.getvalue(), "Answer done\n")
+        self.assertEqual(self.err.getvalue(), "plan\n")
+
+    def test_hidden_reasoning(self):
+        self.printer.show_reasoning = False
+
+        self.printer.display_stream(iter([LLMResponse(reasoning="plan"), LLMResponse(content="Answer")]))
+
+        self.assertEqual(self.out.getvalue(), "Answer\n")
+        self.assertEqual(self.err.getvalue(), "")
+
+    def test_refresh_live_starts_new_response(self):
+        chunks = [LLMResponse(content="Calling tool"), RefreshLive(), LLMResponse(content="Result")]
+
+        content, _ = self.printer.display_normal(iter(chunks))
+
+        self.assertEqual(content, "Result")
+        self.assertEqual(self.out.getvalue(), "Calling tool\nResult\n")
+
+    def test_shared_response_filled_by_producer(self):
+        response = ResponseAccumulator()
+
+        def produce():
+            for chunk in [LLMResponse(content="<think>plan</think>"), LLMResponse(content="Answer")]:
+                response.add(chunk)
+                yield chunk
+            response.finish()
+
+        content, reasoning = self.printer.display_stream(produce(), response)
+
+        self.assertEqual((content, reasoning), ("Answer", "plan"))
+        self.assertEqual(response.content_parts, ["Answer"])
+        self.assertEqual(self.out.getvalue(), "Answer\n")
@@ -5,7 +5,7 @@ import pytest
 import typer
 from pytest import raises
 
-from yaicli.const import DEFAULT_ROLES
+from yaicli.const import DEFAULT_ROLES, DefaultRoleNames
 from yaicli.role import Role, RoleManager
 
 
@@ -391,3 +391,65 @@ class TestRoleManager:
             mock_console.print.assert_called_once_with(
                 "Role 'non_existent' does not exist. Using default role.", style="red"
             )
+
+
+class TestRoleRegistry:
+    """Test the lazily loaded role index"""
+
+    @pytest.fixture
+    def roles_dir(self, tmp_path):
+        return tmp_path / "roles"
+
+    def write_role(self, roles_dir, filename, name, prompt="Prompt"):
+        with open(roles_dir / filename, "w") as f:
+            json.dump({"name": name, "prompt": prompt, "variables": {"x": 1}}, f)
+
+    def test_index_persisted(self, roles_dir):
+        manager = RoleManager(roles_dir=roles_dir, console=MagicMock())
+        assert manager.roles.index_path.exists()
+        index = json.loads(manager.roles.index_path.read_text())
+        assert {entry["name"] for entry in index["files"].values()} >= set(DEFAULT_ROLES)
+
+    def test_get_role_loads_only_requested_role(self, roles_dir):
+        roles_dir.mkdir()
+        for i in range(5):
+            self.write_role(roles_dir, f"role{i}.json", f"role{i}")
+        RoleManager(roles_dir=roles_dir, console=MagicMock())
+
+        manager = RoleManager(roles_dir=roles_dir, console=MagicMock())
+        with patch("yaicli.role.Role", wraps=Role) as role_cls:
+            assert manager.get_role("role3").name == "role3"
+        role_cls.assert_called_once()
+
+    def test_unchanged_directory_is_not_rescanned(self, roles_dir):
+        RoleManager(roles_dir=roles_dir, console=MagicMock())
+        with patch("yaicli.role.os.scandir") as scandir:
+            manager = RoleManager(roles_dir=roles_dir, console=MagicMock())
+        scandir.assert_not_called()
+        assert DefaultRoleNames.SHELL in manager.roles
+
+    def test_new_role_file_invalidates_index(self, roles_dir):
+        RoleManager(roles_dir=roles_dir, console=MagicMock())
+        self.write_role(roles_dir, "added.json", "Added Role")
+
+        manager = RoleManager(roles_dir=roles_dir, console=MagicMock())
+        assert manager.get_role("Added Role").prompt == "Prompt"
+
+    def test_role_renamed_in_place(self, roles_dir):
+        roles_dir.mkdir()
+        self.write_role(roles_dir, "custom.json", "old name")
+        RoleManager(roles_dir=roles_dir, console=MagicMock())
+        # Rewriting a file does not change the directory mtime
+        self.write_role(roles_dir, "custom.json", "new name")
+
+        manager = RoleManager(roles_dir=roles_dir, console=MagicMock())
+        assert manager.get_role("new name").name == "new name"
+        with raises(ValueError, match="does not exist"):
+            manager.get_role("old name")
+
+    def test_corrupt_index_ignored(self, roles_dir):
+        manager = RoleManager(roles_dir=roles_dir, console=MagicMock())
+        manager.roles.index_path.write_text("not json")
+
+        manager = RoleManager(roles_dir=roles_dir, console=MagicMock())
+        assert manager.get_role(DefaultRoleNames.CODER).name == DefaultRoleNames.CODER
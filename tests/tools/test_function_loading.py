@@ -1,3 +1,4 @@
+import json
 import shutil
 import textwrap
 from pathlib import Path
@@ -202,6 +203,65 @@ class TestSchemasCaching:
         assert r1[0].__name__ == "test_func"
 
 
+class TestSchemaManifest:
+    def test_manifest_written(self, func_dir):
+        """Test schemas are stored in the manifest keyed on file content."""
+        (func_dir / "test_func.py").write_text(VALID_FUNC_SOURCE)
+        with patch.object(func_mod, "FUNCTIONS_DIR", func_dir):
+            func_mod.get_func_name_map()
+        manifest = json.loads((func_dir / func_mod.MANIFEST_FILENAME).read_text())
+        entry = manifest["files"]["test_func.py"]
+        assert entry["openai_schema"]["name"] == "test_func"
+        assert entry["anthropic_schema"]["name"] == "test_func"
+
+    def test_schemas_without_import(self, func_dir):
+        """Test tools are built from the manifest, the module is imported on execute."""
+        (func_dir / "test_func.py").write_text(VALID_FUNC_SOURCE)
+        with patch.object(func_mod, "FUNCTIONS_DIR", func_dir):
+            expected = tools_mod.get_openai_schemas()
+            func_mod._func_name_map = None
+            tools_mod._openai_schemas_cache = None
+
+            with patch.object(func_mod, "_load_function_class", wraps=func_mod._load_function_class) as load:
+                assert tools_mod.get_openai_schemas() == expected
+                assert tools_mod.get_anthropic_schemas()[0]["name"] == "test_func"
+                load.assert_not_called()
+
+                assert func_mod.get_function("test_func").execute(arg="hi") == "hi"
+                load.assert_called_once()
+
+    def test_changed_file_reloaded(self, func_dir):
+        """Test a changed function file is imported again for its new schema."""
+        (func_dir / "test_func.py").write_text(VALID_FUNC_SOURCE)
+        with patch.object(func_mod, "FUNCTIONS_DIR", func_dir):
+            func_mod.get_func_name_map()
+            func_mod._func_name_map = None
+            (func_dir / "test_func.py").write_text(VALID_FUNC_SOURCE.replace("test_func", "renamed_func"))
+            assert list(func_mod.get_func_name_map()) == ["renamed_func"]
+
+    def test_manifest_of_other_release_ignored(self, func_dir):
+        """Test schemas generated by another yaicli release are generated again."""
+        (func_dir / "test_func.py").write_text(VALID_FUNC_SOURCE)
+        with patch.object(func_mod, "FUNCTIONS_DIR", func_dir):
+            func_mod.get_func_name_map()
+            func_mod._func_name_map = None
+            with (
+                patch.object(func_mod, "__version__", "0.0.1"),
+                patch.object(func_mod, "_load_function_class", wraps=func_mod._load_function_class) as load,
+            ):
+                func_mod.get_func_name_map()
+            load.assert_called_once()
+        manifest = json.loads((func_dir / func_mod.MANIFEST_FILENAME).read_text())
+        assert manifest["yaicli"] == "0.0.1"
+
+    def test_corrupt_manifest_ignored(self, func_dir):
+        """Test an unreadable manifest falls back to importing the functions."""
+        (func_dir / "test_func.py").write_text(VALID_FUNC_SOURCE)
+        (func_dir / func_mod.MANIFEST_FILENAME).write_text("not json")
+        with patch.object(func_mod, "FUNCTIONS_DIR", func_dir):
+            assert "test_func" in func_mod.get_func_name_map()
+
+
 class TestReinstallFunctions:
     def test_reinstall_overwrites_builtin(self, tmp_path):
         """Test reinstall_functions overwrites existing builtin files."""
@@ -187,14 +187,12 @@ class TestMCPClient:
         # Verify initialization only happened once (client creation happens only during first instantiation)
         mock_client_class.assert_called_once_with(mock_config.servers)
 
-    @patch("yaicli.tools.mcp.get_or_create_event_loop")
+    @patch("yaicli.tools.mcp.MCPClient._run")
     @patch("yaicli.tools.mcp.MCPConfig.from_file")
     @patch("fastmcp.client.Client")
-    def test_ping(self, mock_client_class, mock_from_file, mock_get_loop):
+    def test_ping(self, mock_client_class, mock_from_file, mock_run):
         """Test MCPClient.ping method."""
         # Setup mocks
-        mock_loop = Mock()
-        mock_get_loop.return_value = mock_loop
         mock_config = Mock()
         mock_from_file.return_value = mock_config
         mock_client_instance = Mock()
@@ -207,21 +205,19 @@ class TestMCPClient:
         client.ping()
 
         # Verify
-        mock_loop.run_until_complete.assert_called_once()
+        mock_run.assert_called_once()
 
-    @patch("yaicli.tools.mcp.get_or_create_event_loop")
+    @patch("yaicli.tools.mcp.MCPClient._run")
     @patch("yaicli.tools.mcp.MCPConfig.from_file")
     @patch("fastmcp.client.Client")
-    def test_list_tools(self, mock_client_class, mock_from_file, mock_get_loop):
+    def test_list_tools(self, mock_client_class, mock_from_file, mock_run):
         """Test MCPClient.list_tools method."""
         # Setup mocks
-        mock_loop = Mock()
         mock_tools = [
             Tool(name="tool1", description="Tool 1", inputSchema={"type": "object"}),
             Tool(name="tool2", description="Tool 2", inputSchema={"type": "object"}),
         ]
-        mock_loop.run_until_complete.return_value = mock_tools
-        mock_get_loop.return_value = mock_loop
+        mock_run.return_value = mock_tools
 
         # Mock the async methods to return regular Mock objects instead of coroutines
         mock_client_instance = Mock()
@@ -237,26 +233,24 @@ class TestMCPClient:
         # Verify
         assert result == mock_tools
         assert client._tools == mock_tools
-        mock_loop.run_until_complete.assert_called_once()
+        mock_run.assert_called_once()
 
         # Call again and verify cache is used
-        mock_loop.reset_mock()
+        mock_run.reset_mock()
         result = client.list_tools()
         assert result == mock_tools
-        mock_loop.run_until_complete.assert_not_called()
+        mock_run.assert_not_called()
 
-    @patch("yaicli.tools.mcp.get_or_create_event_loop")
+    @patch("yaicli.tools.mcp.MCPClient._run")
     @patch("yaicli.tools.mcp.MCPConfig.from_file")
     @patch("fastmcp.client.Client")
-    def test_call_tool(self, mock_client_class, mock_from_file, mock_get_loop):
+    def test_call_tool(self, mock_client_class, mock_from_file, mock_run):
         """Test MCPClient.call_tool method."""
         # Setup mocks
-        mock_loop = Mock()
         mock_text_content = Mock(spec=TextContent)
         mock_text_content.text = "Test result"
         mock_content = [mock_text_content]
-        mock_loop.run_until_complete.return_value = mock_content
-        mock_get_loop.return_value = mock_loop
+        mock_run.return_value = mock_content
 
         # Create client and call tool
         client = MCPClient()
@@ -266,7 +260,41 @@ class TestMCPClient:
 
         # Verify
         assert result == mock_content
-        mock_loop.run_until_complete.assert_called_once()
+        mock_run.assert_called_once()
+
+    def test_concurrent_calls_share_one_loop(self):
+        """Tool calls from parallel threads all run on the loop the client connected on."""
+        import asyncio
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        from fastmcp import Client, FastMCP
+
+        server = FastMCP("test")
+        loops = set()
+
+        @server.tool
+        async def echo(text: str) -> str:
+            loops.add(id(asyncio.get_running_loop()))
+            await asyncio.sleep(0.2)
+            return f"{text} on {threading.current_thread().name}"
+
+        MCPClient._instance = None
+        with patch("fastmcp.client.Client", return_value=Client(server)):
+            client = MCPClient(MCPConfig(servers={}))
+        try:
+            started = time.monotonic()
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(lambda i: client.call_tool("_mcp__echo", text=str(i)), range(4)))
+            elapsed = time.monotonic() - started
+        finally:
+            MCPClient._instance = None
+
+        assert [result.content[0].text for result in results] == [f"{i} on yaicli-mcp" for i in range(4)]
+        assert len(loops) == 1
+        # The calls overlap instead of taking turns
+        assert elapsed < 0.7
 
     @patch("yaicli.tools.mcp.MCPConfig.from_file")
     @patch("fastmcp.client.Client")
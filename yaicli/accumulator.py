@@ -0,0 +1,119 @@
+"""Accumulation of the streamed responses of a completion request."""
+
+from typing import Dict, List, Optional, Tuple
+
+from .schemas import LLMResponse, ToolCall, Usage
+
+
+class ThinkTagParser:
+    """Splits streamed content at <think> tags into content and reasoning.
+
+    Each chunk is scanned once. A tag split across chunks is held back until the
+    chunk completing it arrives, or until `flush` at the end of the stream.
+    """
+
+    OPEN_TAG = "<think>"
+    CLOSE_TAG = "</think>"
+
+    def __init__(self) -> None:
+        self.in_reasoning = False
+        self._pending = ""
+
+    def feed(self, text: str) -> Tuple[str, str]:
+        """Return the content and reasoning parts of the next chunk"""
+        if self._pending:
+            text = self._pending + text
+            self._pending = ""
+        content: List[str] = []
+        reasoning: List[str] = []
+        start = 0
+        while True:
+            tag = self.CLOSE_TAG if self.in_reasoning else self.OPEN_TAG
+            parts = reasoning if self.in_reasoning else content
+            end = text.find(tag, start)
+            if end == -1:
+                break
+            parts.append(text[start:end])
+            start = end + len(tag)
+            self.in_reasoning = not self.in_reasoning
+        end = _partial_tag_start(text, start, tag)
+        parts.append(text[start:end])
+        self._pending = text[end:]
+        return "".join(content), "".join(reasoning)
+
+    def flush(self) -> Tuple[str, str]:
+        """Return the text held back at the end of the stream"""
+        pending, self._pending = self._pending, ""
+        return ("", pending) if self.in_reasoning else (pending, "")
+
+
+class ResponseAccumulator:
+    """Collects the responses of one completion request: content, reasoning, tool calls and usage.
+
+    Content and reasoning are kept as lists of parts and only joined when read, so a long
+    stream costs time proportional to its length. Content inside <think> tags counts as
+    reasoning. Readers showing the response while it streams follow the part lists by index.
+    """
+
+    def __init__(self) -> None:
+        # Usage of all responses added since creation, e.g. of every request of a tool calling conversation
+        self.total_usage = Usage()
+        self.reset()
+
+    def reset(self) -> None:
+        """Start collecting a new response"""
+        self.content_parts: List[str] = []
+        self.reasoning_parts: List[str] = []
+        # Providers may return identical tool calls with the same ID in a single response during streaming
+        self.tool_calls: Dict[str, ToolCall] = {}
+        self.usage: Optional[Usage] = None
+        # Last added response, so readers of a shared accumulator don't add it again
+        self.last: Optional[LLMResponse] = None
+        self._think_tags = ThinkTagParser()
+
+    @property
+    def in_reasoning(self) -> bool:
+        """Whether the content is inside <think> tags"""
+        return self._think_tags.in_reasoning
+
+    @property
+    def content(self) -> str:
+        return "".join(self.content_parts)
+
+    @property
+    def reasoning(self) -> str:
+        return "".join(self.reasoning_parts)
+
+    def add(self, response: LLMResponse) -> bool:
+        """Add a response, return whether it has a tool call not seen before"""
+        self.last = response
+        content, reasoning = self._think_tags.feed(response.content) if response.content else ("", "")
+        if response.reasoning:
+            reasoning = response.reasoning + reasoning
+        self._add_text(content, reasoning)
+        if response.usage:
+            self.usage = response.usage if self.usage is None else self.usage + response.usage
+            self.total_usage += response.usage
+        tool_call = response.tool_call
+        if tool_call is None or tool_call.id in self.tool_calls:
+            return False
+        self.tool_calls[tool_call.id] = tool_call
+        return True
+
+    def finish(self) -> None:
+        """Add the text held back at the end of the response"""
+        self._add_text(*self._think_tags.flush())
+
+    def _add_text(self, content: str, reasoning: str) -> None:
+        if content:
+            self.content_parts.append(content)
+        if reasoning:
+            self.reasoning_parts.append(reasoning)
+
+
+def _partial_tag_start(text: str, start: int, tag: str) -> int:
+    """Index where `text` ends with an incomplete `tag`, or its length if it does not"""
+    tail_start = text.rfind("<", max(start, len(text) - len(tag) + 1))
+    if tail_start != -1 and tag.startswith(text[tail_start:]):
+        return tail_start
+    return len(text)
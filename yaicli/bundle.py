@@ -0,0 +1,376 @@
+"""Build a single-file `ai` bundle with precompiled bytecode.
+
+The bundle is a zipapp holding a `site-packages` tree copied from the current environment:
+yaicli with only the selected provider modules, plus every installed distribution it
+depends on. All modules are compiled ahead of time with hash based `.pyc` files, so
+fresh machines do not pay for compiling openai, anthropic, rich, ... on their first run.
+
+Pure Python distributions are imported straight from the archive. Distributions with
+extension modules or data files need a real filesystem, the bundle extracts each of them
+to `~/.cache/yaicli/bundles/<id>` (override with `YAI_BUNDLE_ROOT`) the first time it is
+imported, so a run only pays for what it imports.
+
+The bytecode and extension modules match the interpreter that built the bundle, run it
+with the same Python version and platform.
+
+Usage:
+    python -m yaicli.bundle -o dist/ai.pyz
+    python -m yaicli.bundle -o dist/ai.pyz --provider openai --provider anthropic
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import py_compile
+import shutil
+import sys
+import tempfile
+import zipapp
+from importlib.metadata import Distribution, PackageNotFoundError, distribution
+from importlib.util import cache_from_source
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+PROVIDERS_DIR = PACKAGE_DIR / "llms" / "providers"
+SITE_PACKAGES = "site-packages"
+MANIFEST_NAME = "bundle.json"
+DEFAULT_INTERPRETER = "/usr/bin/env python3"
+
+# Optional dependency groups (pyproject extras) needed by a provider, when the provider
+# name is not an extra itself
+PROVIDER_EXTRAS: Dict[str, str] = {
+    "cohere-bedrock": "cohere",
+    "cohere-sagemaker": "cohere",
+    "vertexai": "gemini",
+}
+
+# Extras of yaicli's own requirements only needed by some providers, e.g. boto3 for Bedrock
+PROVIDER_REQUIREMENT_EXTRAS: Dict[str, Tuple[str, str]] = {
+    "anthropic-bedrock": ("anthropic", "bedrock"),
+    "anthropic-vertex": ("anthropic", "vertex"),
+}
+
+# Files which work from inside a zip, distributions with anything else are extracted
+_ZIP_SAFE_SUFFIXES = {".py", ".pyi", ".typed", ".md", ".rst"}
+_ZIP_SAFE_NAMES = {".keep", ".gitkeep"}
+# yaicli copies its builtin functions from the package directory
+_ALWAYS_EXTRACTED = {"yaicli"}
+
+# Metadata files which only make sense for the environment the package was installed into
+_SKIPPED_METADATA = {"RECORD", "INSTALLER", "REQUESTED", "direct_url.json"}
+
+BOOTSTRAP = '''\
+# Generated by yaicli.bundle
+import json
+import os
+import sys
+
+BUNDLE_ID = {bundle_id!r}
+ENTRY_POINT = {entry_point!r}
+PROG = {prog!r}
+ARCHIVE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(os.getenv("YAI_BUNDLE_ROOT") or os.path.expanduser("~/.cache/yaicli/bundles"), BUNDLE_ID)
+EXTRACTED = os.path.join(ROOT, "site-packages")
+
+
+class ExtractingFinder:
+    """Extract a distribution which needs a real filesystem on the first import of its modules"""
+
+    def __init__(self, manifest):
+        self.files = manifest["extract"]
+        self.top_level = manifest["top_level"]
+
+    def find_spec(self, fullname, path=None, target=None):
+        if path is None:
+            for dist in self.top_level.pop(fullname, ()):
+                self.extract(dist)
+        # Let the path finders import it
+        return None
+
+    def extract(self, dist):
+        marker = os.path.join(ROOT, f".{{dist}}.extracted")
+        if os.path.exists(marker):
+            return
+        import zipfile
+
+        with zipfile.ZipFile(ARCHIVE) as zf:
+            for name in self.files[dist]:
+                target = os.path.join(EXTRACTED, *name.split("/"))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                # Replace whole files, another process may be extracting the same bundle
+                tmp = f"{{target}}.{{os.getpid()}}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(zf.read(f"site-packages/{{name}}"))
+                os.replace(tmp, target)
+        open(marker, "wb").close()
+        # The cached directory listing predates the new files
+        sys.path_importer_cache.pop(EXTRACTED, None)
+
+
+os.makedirs(EXTRACTED, exist_ok=True)
+sys.meta_path.insert(0, ExtractingFinder(json.loads(__loader__.get_data({manifest_name!r}))))
+sys.path[:1] = [EXTRACTED, os.path.join(ARCHIVE, "site-packages")]
+sys.argv[0] = PROG
+module_name, _, attr = ENTRY_POINT.partition(":")
+sys.exit(getattr(__import__(module_name, fromlist=[attr]), attr)())
+'''
+
+
+def _requirement_cls():
+    try:
+        from packaging.requirements import Requirement
+    except ImportError:
+        try:
+            from pip._vendor.packaging.requirements import Requirement
+        except ImportError:
+            raise SystemExit("Building a bundle needs the `packaging` package, install it first.") from None
+    return Requirement
+
+
+def provider_modules(providers: Iterable[str]) -> Set[str]:
+    """Module names in yaicli/llms/providers needed by the providers, including modules they import"""
+    from .llms.provider import ProviderFactory
+
+    pending = []
+    for name in providers:
+        if name not in ProviderFactory.providers_map:
+            raise SystemExit(f"Unknown provider: {name}")
+        pending.append(ProviderFactory.providers_map[name][0].rsplit(".", 1)[-1])
+
+    modules: Set[str] = set()
+    while pending:
+        module = pending.pop()
+        if module in modules:
+            continue
+        modules.add(module)
+        tree = ast.parse((PROVIDERS_DIR / f"{module}.py").read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            # Sibling provider modules, e.g. `from .openai_provider import OpenAIProvider`
+            if isinstance(node, ast.ImportFrom) and node.level == 1 and node.module:
+                pending.append(node.module)
+    return modules
+
+
+def provider_extras(providers: Iterable[str]) -> Set[str]:
+    """Extras of the yaicli distribution needed by the providers"""
+    available = set(distribution("yaicli").metadata.get_all("Provides-Extra") or [])
+    extras = {PROVIDER_EXTRAS.get(name, name) for name in providers}
+    return extras & available
+
+
+def requirement_extras(providers: Iterable[str]) -> Dict[str, Set[str]]:
+    """Extras of yaicli's requirements to keep for the providers, see PROVIDER_REQUIREMENT_EXTRAS"""
+    kept: Dict[str, Set[str]] = {name: set() for name, _ in PROVIDER_REQUIREMENT_EXTRAS.values()}
+    for provider in providers:
+        if provider in PROVIDER_REQUIREMENT_EXTRAS:
+            name, extra = PROVIDER_REQUIREMENT_EXTRAS[provider]
+            kept[name].add(extra)
+    return kept
+
+
+def resolve_distributions(
+    extras: Set[str], strict: bool, trimmed_extras: Optional[Dict[str, Set[str]]] = None
+) -> List[Distribution]:
+    """Installed distributions needed by yaicli with the extras, yaicli first.
+
+    Args:
+        extras: Extras of yaicli to include
+        strict: Fail instead of skipping distributions which are not installed
+        trimmed_extras: Extras to keep for some of yaicli's own requirements, others are dropped
+    """
+    Requirement = _requirement_cls()
+    trimmed_extras = trimmed_extras or {}
+    resolved: Dict[str, Distribution] = {}
+    pending: List[Tuple[str, Set[str]]] = [("yaicli", extras)]
+    while pending:
+        name, dist_extras = pending.pop()
+        key = name.lower().replace("_", "-").replace(".", "-")
+        if key in resolved:
+            continue
+        try:
+            dist = distribution(name)
+        except PackageNotFoundError:
+            if strict:
+                raise SystemExit(f"{name} is required by the bundle but not installed.") from None
+            print(f"Skipping {name}, it is not installed.", file=sys.stderr)
+            continue
+        resolved[key] = dist
+        environments = [{"extra": extra} for extra in dist_extras] or [{"extra": ""}]
+        for requirement in map(Requirement, dist.requires or []):
+            if requirement.marker is None or any(requirement.marker.evaluate(env) for env in environments):
+                wanted = set(requirement.extras)
+                if key == "yaicli" and requirement.name in trimmed_extras:
+                    wanted &= trimmed_extras[requirement.name]
+                pending.append((requirement.name, wanted))
+    return list(resolved.values())
+
+
+def _distribution_files(dist: Distribution) -> Iterator[Tuple[Path, PurePosixPath]]:
+    """(source, path in site-packages) of the files installed by a distribution"""
+    for file in dist.files or []:
+        path = PurePosixPath(file.as_posix())
+        # Console scripts and data files live outside site-packages
+        if ".." in path.parts or "__pycache__" in path.parts or path.suffix in (".pyc", ".pth"):
+            continue
+        if path.parts[0].endswith(".dist-info") and path.name in _SKIPPED_METADATA:
+            continue
+        source = Path(str(dist.locate_file(file)))
+        if source.is_file():
+            yield source, path
+
+
+def _yaicli_files(dist: Distribution, modules: Set[str]) -> Iterator[Tuple[Path, PurePosixPath]]:
+    """Files of yaicli itself, from the package directory so editable installs work too"""
+    for source, path in _distribution_files(dist):
+        if path.parts[0].endswith(".dist-info"):
+            yield source, path
+    for source in sorted(PACKAGE_DIR.rglob("*")):
+        relative = source.relative_to(PACKAGE_DIR)
+        if not source.is_file() or "__pycache__" in relative.parts or source.suffix == ".pyc":
+            continue
+        if source.parent == PROVIDERS_DIR and source.stem != "__init__" and source.stem not in modules:
+            continue
+        yield source, PurePosixPath("yaicli", *relative.parts)
+
+
+def _needs_filesystem(name: str, paths: List[PurePosixPath]) -> bool:
+    """Whether a distribution has extension modules or data files, which do not work from a zip"""
+    if name in _ALWAYS_EXTRACTED:
+        return True
+    return any(
+        not path.parts[0].endswith(".dist-info")
+        and path.suffix not in _ZIP_SAFE_SUFFIXES
+        and path.name not in _ZIP_SAFE_NAMES
+        for path in paths
+    )
+
+
+def _top_level_names(paths: Iterable[PurePosixPath]) -> Set[str]:
+    """Importable top level names provided by the files, e.g. `_cffi_backend` for `_cffi_backend.cpython-311-....so`"""
+    return {
+        path.parts[0].split(".", 1)[0]
+        for path in paths
+        if not path.parts[0].endswith((".dist-info", ".data")) and path.parts[0] != "__pycache__"
+    }
+
+
+def _compile(source: Path, cfile: Path, dfile: str) -> bool:
+    # Hash based pycs stay valid whatever the file mtimes are after extraction
+    try:
+        py_compile.compile(
+            str(source),
+            cfile=str(cfile),
+            dfile=dfile,
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+    except (py_compile.PyCompileError, SyntaxError, ValueError):
+        # Templates or code for other Python versions, never imported
+        return False
+    return True
+
+
+def build_bundle(
+    output: Path,
+    providers: Optional[List[str]] = None,
+    interpreter: str = DEFAULT_INTERPRETER,
+    entry_point: str = "yaicli.entry:app",
+    prog: str = "ai",
+    compressed: bool = True,
+) -> Path:
+    """Build the bundle and return its path.
+
+    Args:
+        output: Path of the zipapp to create
+        providers: Names from `ProviderFactory.providers_map` to include, all if empty.
+            Optional SDKs of explicitly selected providers must be installed.
+        interpreter: Shebang of the zipapp
+        entry_point: Callable run by the bundle, as "module:attr"
+        prog: Program name shown in help messages
+        compressed: Deflate the archive, a stored one is larger but extracts faster
+    """
+    from .llms.provider import ProviderFactory
+
+    selected = providers or list(ProviderFactory.providers_map)
+    modules = provider_modules(selected)
+    dists = resolve_distributions(
+        provider_extras(selected), strict=bool(providers), trimmed_extras=requirement_extras(selected)
+    )
+
+    digest = hashlib.sha256(f"{sys.implementation.cache_tag}:{entry_point}".encode())
+    manifest: Dict[str, Dict[str, List[str]]] = {"extract": {}, "top_level": {}}
+    with tempfile.TemporaryDirectory(prefix="yaicli-bundle-") as tmp:
+        stage = Path(tmp)
+        site = stage / SITE_PACKAGES
+        for dist in dists:
+            name = dist.metadata["Name"]
+            files = list(_yaicli_files(dist, modules) if name == "yaicli" else _distribution_files(dist))
+            paths = [path for _, path in files]
+            extracted = _needs_filesystem(name, paths)
+            written: List[str] = []
+            for source, path in files:
+                target = site.joinpath(*path.parts)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(source, target)
+                digest.update(path.as_posix().encode())
+                digest.update(source.read_bytes())
+                written.append(path.as_posix())
+                if path.suffix != ".py":
+                    continue
+                # The path finder reads __pycache__, zipimport only reads a .pyc next to the source
+                cfile = Path(cache_from_source(str(target))) if extracted else target.with_suffix(".pyc")
+                if _compile(target, cfile, path.as_posix()):
+                    written.append(cfile.relative_to(site).as_posix())
+
+            if extracted:
+                # Metadata stays in the archive, importlib.metadata reads it from there
+                manifest["extract"][name] = [p for p in written if not p.split("/", 1)[0].endswith(".dist-info")]
+                for top_level in _top_level_names(paths):
+                    manifest["top_level"].setdefault(top_level, []).append(name)
+
+        (stage / MANIFEST_NAME).write_text(json.dumps(manifest), encoding="utf-8")
+        (stage / "__main__.py").write_text(
+            BOOTSTRAP.format(
+                bundle_id=digest.hexdigest()[:16], entry_point=entry_point, prog=prog, manifest_name=MANIFEST_NAME
+            ),
+            encoding="utf-8",
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        zipapp.create_archive(stage, output, interpreter=interpreter, compressed=compressed)
+    return output
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m yaicli.bundle",
+        description="Build a single-file `ai` zipapp with precompiled bytecode.",
+    )
+    parser.add_argument("-o", "--output", type=Path, default=Path("dist/ai.pyz"), help="Bundle path.")
+    parser.add_argument(
+        "-p",
+        "--provider",
+        action="append",
+        dest="providers",
+        help="Provider to include, repeatable. All providers with installed SDKs by default.",
+    )
+    parser.add_argument("--python", default=DEFAULT_INTERPRETER, help="Interpreter written to the shebang.")
+    parser.add_argument(
+        "--no-compress",
+        dest="compressed",
+        action="store_false",
+        help="Store files uncompressed, the first run extracts faster.",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    output = build_bundle(args.output, providers=args.providers, interpreter=args.python, compressed=args.compressed)
+    print(f"Bundle written to {output} ({output.stat().st_size / 1024 / 1024:.1f} MiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
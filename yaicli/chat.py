@@ -3,6 +3,7 @@ import os
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
@@ -394,5 +395,7 @@ class FileChatManager:
         return Chat(title=title, date=date_str, path=chat_file)
 
 
-# Create a global chat manager instance
-chat_mgr = FileChatManager()
+@lru_cache(1)
+def get_chat_manager() -> FileChatManager:
+    """Get the chat manager singleton, created on first use"""
+    return FileChatManager()
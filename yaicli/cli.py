@@ -2,21 +2,15 @@ import subprocess
 import sys
 import time
 import traceback
-from os import devnull
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, List, Optional, Union
 
 import typer
-from prompt_toolkit import PromptSession, prompt
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-from prompt_toolkit.key_binding import KeyBindings, KeyPressEvent
-from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Prompt
 
-from .chat import Chat, FileChatManager, chat_mgr
-from .cmd_handler import CmdHandler
-from .completer import AtPathCompleter
+from .accumulator import ResponseAccumulator
+from .chat import Chat, FileChatManager, get_chat_manager
 from .config import cfg
 from .console import get_console
 from .const import (
@@ -31,22 +25,26 @@ from .const import (
     CMD_MODE,
     CMD_SAVE_CHAT,
     CONFIG_PATH,
-    DEFAULT_OS_NAME,
-    DEFAULT_SHELL_NAME,
     EXEC_MODE,
     HISTORY_FILE,
-    NO_VISION_PROVIDERS,
     TEMP_MODE,
     DefaultRoleNames,
 )
-from .context import ContextManager, ctx_mgr
+from .context import ContextManager, get_context_manager
 from .exceptions import ChatSaveError, YaicliError
-from .history import LimitedFileHistory
-from .llms import LLMClient
-from .printer import Printer
-from .role import Role, RoleManager, role_mgr
+from .llms import LLMClient, get_provider_capabilities
+from .printer import PipePrinter, Printer
+from .role import Role, RoleManager, get_role_manager
 from .schemas import ChatMessage, ImageData, ToolPolicy
-from .utils import detect_os, detect_shell, filter_command
+from .utils import environment_fingerprint, filter_command
+
+# prompt_toolkit and the command handler are only needed by the REPL,
+# import them lazily so one-shot mode (`ai "question"`) stays fast.
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.key_binding import KeyBindings, KeyPressEvent
+
+    from .cmd_handler import CmdHandler
 
 
 class CLI:
@@ -55,12 +53,12 @@ class CLI:
         "init_role",
         "role_name",
         "console",
-        "chat_manager",
+        "_chat_manager",
         "role_manager",
         "role",
         "printer",
         "client",
-        "cmd_handler",
+        "_cmd_handler",
         "bindings",
         "current_mode",
         "interactive_round",
@@ -71,6 +69,7 @@ class CLI:
         "session",
         "history",
         "context_manager",
+        "pipe",
     )
 
     def __init__(
@@ -81,23 +80,28 @@ class CLI:
         role_manager: Optional[RoleManager] = None,
         context_manager: Optional[ContextManager] = None,
         client=None,
+        pipe: bool = False,
     ):
         self.verbose: bool = verbose
+        # Pipeline mode: plain text output, no prompts, for `cat file | ai "..."`
+        self.pipe: bool = pipe
         # --role can specify a role when enter interactive chat
         # TAB will switch between role and shell
         self.init_role: str = role
         self.role_name: str = role
 
         self.console = get_console()
-        self.chat_manager = chat_manager or chat_mgr
-        self.role_manager = role_manager or role_mgr
-        self.context_manager = context_manager or ctx_mgr
+        self._chat_manager: Optional[FileChatManager] = chat_manager
+        self.role_manager = role_manager or get_role_manager()
+        self.context_manager = context_manager or get_context_manager()
         self.role: Role = self.role_manager.get_role(self.role_name)
-        self.printer = Printer()
+        self.printer = PipePrinter() if pipe else Printer()
         self.client = client or self._create_client()
-        self.cmd_handler = CmdHandler(self)
+        self._cmd_handler: Optional["CmdHandler"] = None
 
-        self.bindings = KeyBindings()
+        # Key bindings and prompt session are created by prepare_chat_loop
+        self.bindings: Optional["KeyBindings"] = None
+        self.session: Optional["PromptSession"] = None
 
         self.current_mode: str = TEMP_MODE
 
@@ -112,12 +116,12 @@ class CLI:
         #     self.chat_history_dir.mkdir(parents=True, exist_ok=True)
 
         # Detect OS and Shell if set to auto
-        if cfg["OS_NAME"] == DEFAULT_OS_NAME:
-            cfg["OS_NAME"] = detect_os(cfg)
-        if cfg["SHELL_NAME"] == DEFAULT_SHELL_NAME:
-            cfg["SHELL_NAME"] = detect_shell(cfg)
+        environment = environment_fingerprint(cfg)
+        cfg["OS_NAME"], cfg["SHELL_NAME"] = environment.os_name, environment.shell_name
 
         if self.verbose:
+            from rich.markdown import Markdown
+
             # Print verbose configuration
             self.console.print("Loading Configuration:", style="bold cyan")
             self.console.print(f"Config file path: {CONFIG_PATH}")
@@ -127,24 +131,34 @@ class CLI:
             self.console.print(f"Current role: {self.role_name}")
             self.console.print(Markdown("---", code_theme=cfg["CODE_THEME"]))
 
-        # Disable prompt_toolkit warning when use non-tty input,
-        # e.g. when use pipe or redirect
-        _origin_stderr = None
-        if not sys.stdin.isatty():
-            _origin_stderr = sys.stderr
-            sys.stderr = open(devnull, "w", encoding="utf-8")
-        try:
-            self.session = PromptSession(key_bindings=self.bindings)
-        finally:
-            if _origin_stderr:
-                sys.stderr.flush()
-                sys.stderr.close()
-                sys.stderr = _origin_stderr
+    @property
+    def chat_manager(self) -> FileChatManager:
+        """Chat manager, the global one is created on first use"""
+        if self._chat_manager is None:
+            self._chat_manager = get_chat_manager()
+        return self._chat_manager
+
+    @chat_manager.setter
+    def chat_manager(self, value: FileChatManager) -> None:
+        self._chat_manager = value
+
+    @property
+    def cmd_handler(self) -> "CmdHandler":
+        """Special command handler, only needed by the REPL"""
+        if self._cmd_handler is None:
+            from .cmd_handler import CmdHandler
+
+            self._cmd_handler = CmdHandler(self)
+        return self._cmd_handler
+
+    @cmd_handler.setter
+    def cmd_handler(self, value: "CmdHandler") -> None:
+        self._cmd_handler = value
 
     def set_role(self, role_name: str) -> None:
         self.role_name = role_name
         self.role = self.role_manager.get_role(role_name)
-        if role_name == DefaultRoleNames.CODER:
+        if role_name == DefaultRoleNames.CODER and not self.pipe:
             self.printer = Printer(content_markdown=False)
         elif role_name == DefaultRoleNames.SHELL:
             self.current_mode = EXEC_MODE
@@ -281,20 +295,29 @@ class CLI:
         if context_msgs:
             messages.extend(context_msgs)
 
-        # Parse and add temporary @ file references
-        at_refs_content, cleaned_input, at_images = self.context_manager.parse_at_references(user_input)
-        if at_refs_content:
-            messages.append(ChatMessage(role="system", content=at_refs_content))
+        provider = cfg.get("PROVIDER", "").lower()
+        capabilities = get_provider_capabilities(provider)
+        supports_vision = capabilities.vision
 
-        # Add previous conversation if available
-        for msg in self.chat.history:
-            messages.append(msg)
+        # Parse temporary @ file references, images are not even encoded without vision support
+        at_refs_content, cleaned_input, at_images = self.context_manager.parse_at_references(
+            user_input, include_images=supports_vision
+        )
+        at_refs = [ChatMessage(role="system", content=at_refs_content, transient=True)] if at_refs_content else []
+
+        # Add @ references and previous conversation. With prompt caching the references go after the
+        # history, so the cached prefix up to the end of the history stays the same across turns.
+        if capabilities.prompt_caching:
+            messages.extend(self.chat.history)
+            messages.extend(at_refs)
+        else:
+            messages.extend(at_refs)
+            messages.extend(self.chat.history)
 
         # Add user input (with @ references cleaned up) and images
         effective_images = list(images or []) + at_images
         if effective_images:
-            provider = cfg.get("PROVIDER", "").lower()
-            if provider in NO_VISION_PROVIDERS:
+            if not supports_vision:
                 self.console.print(
                     f"Warning: Provider '{provider}' does not support image input. Images will be ignored.",
                     style="yellow",
@@ -325,16 +348,19 @@ class CLI:
             list[ChatMessage]: The updated message history.
         """
         messages = self._build_messages(user_input, images=images)
-        if self.role.name != DefaultRoleNames.CODER:
+        if self.role.name != DefaultRoleNames.CODER and not self.pipe:
             self.console.print("Assistant:", style="bold green")
         try:
+            # Filled by the client and read by the printer, so chunks are only accumulated once
+            response = ResponseAccumulator()
             response_iterator = self.client.completion_with_tools(
                 messages,
                 stream=cfg["STREAM"],
                 tool_policy=self._get_tool_policy(),
+                response=response,
             )
 
-            content, _ = self.printer.display_stream(response_iterator)
+            content, _ = self.printer.display_stream(response_iterator, response)
 
             # The 'messages' list is modified by the client in-place
             return content, messages
@@ -363,7 +389,11 @@ class CLI:
         self._check_history_len()
 
         if self.current_mode == EXEC_MODE:
-            self._confirm_and_execute(content or "")
+            if not self.pipe:
+                self._confirm_and_execute(content or "")
+            elif content:
+                # There is no terminal to confirm with in pipeline mode, the command is only printed
+                print("Command not executed in pipeline mode, use --no-pipe to run it.", file=sys.stderr)
         return True
 
     def _confirm_and_execute(self, raw_content: str) -> None:
@@ -386,6 +416,8 @@ class CLI:
         if _input == "y":
             executed_cmd = cmd
         elif _input == "e":
+            from prompt_toolkit import prompt
+
             try:
                 edited_cmd = prompt("Edit command: ", default=cmd).strip()
                 if edited_cmd and edited_cmd != cmd:
@@ -409,6 +441,12 @@ class CLI:
     # ------------------- REPL Methods -------------------
     def prepare_chat_loop(self) -> None:
         """Setup key bindings and history for interactive modes."""
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+
+        from .completer import AtPathCompleter
+        from .history import LimitedFileHistory
+
         self.current_mode = CHAT_MODE
         self._setup_key_bindings()
         HISTORY_FILE.touch(exist_ok=True)
@@ -430,9 +468,13 @@ class CLI:
 
     def _setup_key_bindings(self) -> None:
         """Setup keyboard shortcuts with Shift+Tab for mode switching."""
+        if self.bindings is None:
+            from prompt_toolkit.key_binding import KeyBindings
+
+            self.bindings = KeyBindings()
 
         @self.bindings.add("s-tab")  # Shift+Tab to switch mode
-        def _(event: KeyPressEvent) -> None:
+        def _(event: "KeyPressEvent") -> None:
             """Switch between chat and exec mode."""
             self.current_mode = EXEC_MODE if self.current_mode == CHAT_MODE else CHAT_MODE
             self.set_role(DefaultRoleNames.SHELL if self.current_mode == EXEC_MODE else self.init_role)
@@ -484,6 +526,8 @@ class CLI:
 
     def _run_repl(self) -> None:
         """Run the main Read-Eval-Print Loop (REPL)."""
+        from rich.markdown import Markdown
+
         self.prepare_chat_loop()
         self._print_welcome_message()
 
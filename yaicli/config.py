@@ -1,9 +1,12 @@
 import configparser
+import hashlib
 import json
+import os
 import sys
 from dataclasses import dataclass
 from functools import lru_cache
 from os import getenv
+from pathlib import Path
 from typing import Any, Optional
 
 from rich import get_console
@@ -20,6 +23,10 @@ from .const import (
 from .exceptions import ConfigError
 from .utils import str2bool
 
+# Bump when the snapshot layout changes
+CONFIG_CACHE_VERSION = 2
+CONFIG_CACHE_FILENAME = ".config.cache.json"
+
 
 class CasePreservingConfigParser(configparser.RawConfigParser):
     """Case preserving config parser"""
@@ -48,11 +55,18 @@ class Config(dict):
     3. Default values (lowest priority)
 
     It handles type conversion and validation based on DEFAULT_CONFIG_MAP.
+
+    With `use_cache`, the converted defaults and config file values are stored in a JSON
+    snapshot next to the config file, keyed on the file's mtime/size and the defaults, so
+    an unchanged setup loads without parsing the file. Environment variables may hold
+    secrets, they are never written to the snapshot and are applied on every load.
     """
 
-    def __init__(self, console: Optional[Console] = None):
+    def __init__(self, console: Optional[Console] = None, use_cache: bool = False):
         """Initializes and loads the configuration."""
         self.console = console or get_console()
+        self.use_cache = use_cache
+        self._cacheable = True
         super().__init__()
         self.reload()
 
@@ -61,17 +75,74 @@ class Config(dict):
 
         Follows priority order: env vars > config file > defaults
         """
-        # Start with defaults
         self.clear()
-        self._load_defaults()
+        if not (self.use_cache and self._load_from_cache()):
+            # Start with defaults
+            self._cacheable = True
+            self._load_defaults()
 
-        # Load from config file
-        self._load_from_file()
+            # Load from config file
+            self._load_from_file()
+            self._apply_type_conversion()
 
-        # Load from environment variables and apply type conversion
+            if self.use_cache and self._cacheable:
+                self._save_cache()
+
+        # Load from environment variables, only their values are converted again
         self._load_from_env()
         self._apply_type_conversion()
 
+    @staticmethod
+    def _cache_path() -> Path:
+        return CONFIG_PATH.with_name(CONFIG_CACHE_FILENAME)
+
+    def _cache_key(self) -> Optional[dict]:
+        """Fingerprint of the config file and the defaults, None if there is no config file"""
+        try:
+            stat = CONFIG_PATH.stat()
+        except OSError:
+            return None
+        defaults = [
+            (key, config_info["value"], config_info["type"].__name__) for key, config_info in DEFAULT_CONFIG_MAP.items()
+        ]
+        return {
+            "version": CONFIG_CACHE_VERSION,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "defaults": hashlib.sha256(repr(defaults).encode()).hexdigest(),
+        }
+
+    def _load_from_cache(self) -> bool:
+        """Load the converted config from the snapshot if it is still valid.
+
+        Returns:
+            True if the snapshot was used
+        """
+        try:
+            snapshot = json.loads(self._cache_path().read_bytes())
+        except (OSError, ValueError):
+            return False
+        if not isinstance(snapshot, dict) or snapshot.get("key") != self._cache_key():
+            return False
+        self.update(snapshot["config"])
+        return True
+
+    def _save_cache(self) -> None:
+        """Write the converted config snapshot, failures are ignored"""
+        key = self._cache_key()
+        if key is None:
+            return
+        cache_path = self._cache_path()
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            # API keys from the config file end up in the snapshot, keep it private like the file should be
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "config": dict(self)}, f)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            tmp_path.unlink(missing_ok=True)
+
     def _load_defaults(self) -> None:
         """Load default configuration values as strings."""
         # Direct update instead of creating temporary dict
@@ -95,14 +166,14 @@ class Config(dict):
     def _load_from_file(self) -> None:
         """Load configuration from the config file.
 
-        Creates default config file if it doesn't exist.
+        Creates default config file if it doesn't exist, then reads it like any other
+        config file, so the snapshot never misses keys only present in the file.
         """
         if not CONFIG_PATH.exists():
             self.console.print("Creating default configuration file.", style="bold yellow", justify=self["JUSTIFY"])
             CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
             with open(CONFIG_PATH, "w", encoding="utf-8") as f:
                 f.write(DEFAULT_CONFIG_INI)
-            return
 
         config_parser = CasePreservingConfigParser()
         try:
@@ -160,7 +231,8 @@ class Config(dict):
                 return json.loads(raw_value)
             return raw_value
         except (ValueError, TypeError, json.JSONDecodeError) as e:
-            # Log warning and fallback to default
+            # Log warning and fallback to default, don't cache so the warning is shown every run
+            self._cacheable = False
             default_value = DEFAULT_CONFIG_MAP[key]["value"]
             self.console.print(
                 f"[yellow]Warning:[/] Invalid value '{raw_value}' for '{key}'. "
@@ -207,7 +279,7 @@ class Config(dict):
 def get_config() -> Config:
     """Get the configuration singleton"""
     try:
-        return Config()
+        return Config(use_cache=True)
     except ConfigError:
         sys.exit()
 
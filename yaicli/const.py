@@ -7,6 +7,7 @@ except ImportError:
         """Compatible with python below 3.11"""
 
 
+from os import getenv
 from pathlib import Path
 from tempfile import gettempdir
 from typing import Any, Literal, Optional
@@ -46,6 +47,9 @@ CONFIG_PATH = Path("~/.config/yaicli/config.ini").expanduser()
 ROLES_DIR = CONFIG_PATH.parent / "roles"
 FUNCTIONS_DIR = CONFIG_PATH.parent / "functions"
 MCP_JSON_PATH = CONFIG_PATH.parent / "mcp.json"
+ENVIRONMENT_CACHE_PATH = CONFIG_PATH.parent / ".environment.json"
+# Unix socket of `ai --daemon`, keep in sync with yaicli/daemon_client.py
+DAEMON_SOCKET_PATH = Path(getenv("YAI_DAEMON_SOCKET") or CONFIG_PATH.parent / "daemon.sock").expanduser()
 
 # Default configuration values
 DEFAULT_CODE_THEME = "monokai"
@@ -70,6 +74,7 @@ DEFAULT_INTERACTIVE_ROUND: int = 25
 DEFAULT_CHAT_HISTORY_DIR: Path = Path(gettempdir()) / "yaicli/chats"
 DEFAULT_MAX_SAVED_CHATS = 20
 DEFAULT_JUSTIFY: JustifyMethod = "default"
+DEFAULT_MAX_FPS: int = 20
 DEFAULT_ROLE_MODIFY_WARNING: BOOL_STR = "true"
 DEFAULT_ENABLE_FUNCTIONS: BOOL_STR = "true"
 DEFAULT_SHOW_FUNCTION_OUTPUT: BOOL_STR = "true"
@@ -78,11 +83,18 @@ DEFAULT_REASONING_EFFORT: Optional[Literal["low", "high", "medium", "default", "
 DEFAULT_ENABLE_MCP: BOOL_STR = "false"
 DEFAULT_SHOW_MCP_OUTPUT: BOOL_STR = "false"
 DEFAULT_MAX_TOOL_CALL_DEPTH: int = 8
+DEFAULT_MAX_PARALLEL_TOOL_CALLS: int = 4
+DEFAULT_EARLY_TOOL_DISPATCH: BOOL_STR = "false"
+DEFAULT_PROMPT_CACHE: BOOL_STR = "true"
 DEFAULT_EXCLUDE_PARAMS: str = ""  # Empty by default
-
-# Providers known to not support vision/image input
-NO_VISION_PROVIDERS = {"cohere", "cohere-bedrock", "cohere-sagemaker", "huggingface", "chatglm", "modelscope"}
-
+DEFAULT_HTTP2: BOOL_STR = "true"
+DEFAULT_HTTP_MAX_CONNECTIONS: int = 20
+DEFAULT_HTTP_KEEPALIVE_EXPIRY: float = 60.0
+DEFAULT_DNS_CACHE_TTL: int = 0
+DEFAULT_RATE_LIMIT_RPM: int = 0
+DEFAULT_RATE_LIMIT_TPM: int = 0
+DEFAULT_METRICS_FILE: str = ""
+DEFAULT_METRICS_OTLP_ENDPOINT: str = ""
 
 SHELL_PROMPT = """You are YAICLI, a shell command generator.
 The context conversation may contain other types of messages,
@@ -154,6 +166,7 @@ DEFAULT_CONFIG_MAP = {
     "AUTO_SUGGEST": {"value": DEFAULT_AUTO_SUGGEST, "env_key": "YAI_AUTO_SUGGEST", "type": bool},
     "SHOW_REASONING": {"value": DEFAULT_SHOW_REASONING, "env_key": "YAI_SHOW_REASONING", "type": bool},
     "JUSTIFY": {"value": DEFAULT_JUSTIFY, "env_key": "YAI_JUSTIFY", "type": str},
+    "MAX_FPS": {"value": DEFAULT_MAX_FPS, "env_key": "YAI_MAX_FPS", "type": int},
     # Chat history settings
     "CHAT_HISTORY_DIR": {"value": DEFAULT_CHAT_HISTORY_DIR, "env_key": "YAI_CHAT_HISTORY_DIR", "type": str},
     "MAX_SAVED_CHATS": {"value": DEFAULT_MAX_SAVED_CHATS, "env_key": "YAI_MAX_SAVED_CHATS", "type": int},
@@ -169,7 +182,37 @@ DEFAULT_CONFIG_MAP = {
     "ENABLE_MCP": {"value": DEFAULT_ENABLE_MCP, "env_key": "YAI_ENABLE_MCP", "type": bool},
     "SHOW_MCP_OUTPUT": {"value": DEFAULT_SHOW_MCP_OUTPUT, "env_key": "YAI_SHOW_MCP_OUTPUT", "type": bool},
     "MAX_TOOL_CALL_DEPTH": {"value": DEFAULT_MAX_TOOL_CALL_DEPTH, "env_key": "YAI_MAX_TOOL_CALL_DEPTH", "type": int},
+    "MAX_PARALLEL_TOOL_CALLS": {
+        "value": DEFAULT_MAX_PARALLEL_TOOL_CALLS,
+        "env_key": "YAI_MAX_PARALLEL_TOOL_CALLS",
+        "type": int,
+    },
+    "EARLY_TOOL_DISPATCH": {
+        "value": DEFAULT_EARLY_TOOL_DISPATCH,
+        "env_key": "YAI_EARLY_TOOL_DISPATCH",
+        "type": bool,
+    },
+    "PROMPT_CACHE": {"value": DEFAULT_PROMPT_CACHE, "env_key": "YAI_PROMPT_CACHE", "type": bool},
     "EXCLUDE_PARAMS": {"value": DEFAULT_EXCLUDE_PARAMS, "env_key": "YAI_EXCLUDE_PARAMS", "type": str},
+    # HTTP connection settings, shared by all providers
+    "HTTP2": {"value": DEFAULT_HTTP2, "env_key": "YAI_HTTP2", "type": bool},
+    "HTTP_MAX_CONNECTIONS": {"value": DEFAULT_HTTP_MAX_CONNECTIONS, "env_key": "YAI_HTTP_MAX_CONNECTIONS", "type": int},
+    "HTTP_KEEPALIVE_EXPIRY": {
+        "value": DEFAULT_HTTP_KEEPALIVE_EXPIRY,
+        "env_key": "YAI_HTTP_KEEPALIVE_EXPIRY",
+        "type": float,
+    },
+    "DNS_CACHE_TTL": {"value": DEFAULT_DNS_CACHE_TTL, "env_key": "YAI_DNS_CACHE_TTL", "type": int},
+    # Client side rate limits per provider and model, 0 to disable
+    "RATE_LIMIT_RPM": {"value": DEFAULT_RATE_LIMIT_RPM, "env_key": "YAI_RATE_LIMIT_RPM", "type": int},
+    "RATE_LIMIT_TPM": {"value": DEFAULT_RATE_LIMIT_TPM, "env_key": "YAI_RATE_LIMIT_TPM", "type": int},
+    # Request timings
+    "METRICS_FILE": {"value": DEFAULT_METRICS_FILE, "env_key": "YAI_METRICS_FILE", "type": str},
+    "METRICS_OTLP_ENDPOINT": {
+        "value": DEFAULT_METRICS_OTLP_ENDPOINT,
+        "env_key": "YAI_METRICS_OTLP_ENDPOINT",
+        "type": str,
+    },
     # MiniMax specific settings
     "MINIMAX_REASONING_SPLIT": {
         "value": True,
@@ -216,6 +259,8 @@ AUTO_SUGGEST={DEFAULT_CONFIG_MAP["AUTO_SUGGEST"]["value"]}
 SHOW_REASONING={DEFAULT_CONFIG_MAP["SHOW_REASONING"]["value"]}
 # Text alignment (default, left, center, right, full)
 JUSTIFY={DEFAULT_CONFIG_MAP["JUSTIFY"]["value"]}
+# Max redraws per second of streamed output, lowered when rendering is slow
+MAX_FPS={DEFAULT_CONFIG_MAP["MAX_FPS"]["value"]}
 
 # Chat history settings
 CHAT_HISTORY_DIR={DEFAULT_CONFIG_MAP["CHAT_HISTORY_DIR"]["value"]}
@@ -239,8 +284,36 @@ SHOW_MCP_OUTPUT={DEFAULT_CONFIG_MAP["SHOW_MCP_OUTPUT"]["value"]}
 
 # Maximum number of tool calls to make in a single request
 MAX_TOOL_CALL_DEPTH={DEFAULT_CONFIG_MAP["MAX_TOOL_CALL_DEPTH"]["value"]}
+# Maximum number of tool calls from one response to run at the same time, 1 to run them one by one
+MAX_PARALLEL_TOOL_CALLS={DEFAULT_CONFIG_MAP["MAX_PARALLEL_TOOL_CALLS"]["value"]}
+# Start a streamed tool call as soon as its arguments are complete, while the response goes on
+EARLY_TOOL_DISPATCH={DEFAULT_CONFIG_MAP["EARLY_TOOL_DISPATCH"]["value"]}
+
+# Mark the tools, system prompt and chat history as cacheable for providers with explicit prompt caching
+PROMPT_CACHE={DEFAULT_CONFIG_MAP["PROMPT_CACHE"]["value"]}
 
 # Comma-separated list of API parameters to exclude from requests
 # Example: temperature,top_p,frequency_penalty
 EXCLUDE_PARAMS=
+
+# HTTP connections, one pool is shared by all requests of a run
+# Use HTTP/2 when the server supports it
+HTTP2={DEFAULT_CONFIG_MAP["HTTP2"]["value"]}
+HTTP_MAX_CONNECTIONS={DEFAULT_CONFIG_MAP["HTTP_MAX_CONNECTIONS"]["value"]}
+# Seconds an idle connection is kept open
+HTTP_KEEPALIVE_EXPIRY={DEFAULT_CONFIG_MAP["HTTP_KEEPALIVE_EXPIRY"]["value"]}
+# Seconds to cache DNS lookups, 0 to disable
+DNS_CACHE_TTL={DEFAULT_CONFIG_MAP["DNS_CACHE_TTL"]["value"]}
+
+# Client side rate limits of the provider and model, shared by all requests of the process
+# Requests per minute, 0 to disable
+RATE_LIMIT_RPM={DEFAULT_CONFIG_MAP["RATE_LIMIT_RPM"]["value"]}
+# Tokens per minute, 0 to disable
+RATE_LIMIT_TPM={DEFAULT_CONFIG_MAP["RATE_LIMIT_TPM"]["value"]}
+
+# Request timings (time to first token, phases, inter-token latency), also shown with --verbose
+# Append one JSON line per request to this file
+METRICS_FILE=
+# Send OpenTelemetry traces to this OTLP/HTTP collector, e.g. http://localhost:4318
+METRICS_OTLP_ENDPOINT=
 """
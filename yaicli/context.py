@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -151,7 +152,7 @@ class ContextManager:
         messages.append(ChatMessage(role="system", content=full_content))
         return messages
 
-    def parse_at_references(self, text: str) -> tuple[str, str, list[ImageData]]:
+    def parse_at_references(self, text: str, include_images: bool = True) -> tuple[str, str, list[ImageData]]:
         """Parse @ file references from text and read their content.
 
         This method extracts @path references from the input text, reads the file
@@ -161,6 +162,7 @@ class ContextManager:
 
         Args:
             text: Input text potentially containing @path references
+            include_images: Encode referenced images, False skips them for providers without vision
 
         Returns:
             Tuple of (file_contents_message, cleaned_text, at_images)
@@ -196,6 +198,13 @@ class ContextManager:
 
                 if path.exists() and path.is_file():
                     if path.suffix.lower() in SUPPORTED_IMAGE_EXTENSIONS:
+                        if not include_images:
+                            console.print(
+                                f"Warning: Provider does not support image input, @{path_str} is ignored.",
+                                style="yellow",
+                            )
+                            cleaned_text = cleaned_text.replace(full_match, f"'{path.name}'")
+                            continue
                         try:
                             at_images.append(encode_local_image(str(path)))
                             cleaned_text = cleaned_text.replace(full_match, f"'{path.name}'")
@@ -271,5 +280,7 @@ class ContextManager:
             console.print(f"Error scanning directory {dir_path}: {e}", style="red")
 
 
-# Global instance
-ctx_mgr = ContextManager()
+@lru_cache(1)
+def get_context_manager() -> ContextManager:
+    """Get the context manager singleton, created on first use"""
+    return ContextManager()
@@ -0,0 +1,189 @@
+"""Warm daemon mode.
+
+`ai --daemon` keeps a configured LLMClient (with its pooled HTTP connections), the roles,
+functions and MCP sessions loaded in one long running process, and serves one-shot
+requests from `yaicli-client` over a Unix socket.
+
+Protocol: the client sends one JSON line
+    {"prompt": str, "role": str, "shell": bool, "code": bool, "stream": bool|null}
+and the daemon answers with JSON lines, one event each:
+    {"event": "chunk", "content": str, "reasoning": str|null}
+    {"event": "refresh"}  # a tool call finished, a new completion starts
+    {"event": "error", "message": str}
+    {"event": "done"}
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Dict, Generator, Optional
+
+from .config import cfg
+from .console import get_console
+from .const import DAEMON_SOCKET_PATH
+from .exceptions import YaicliError
+from .llms import LLMClient
+from .role import RoleManager, get_role_manager
+from .schemas import ChatMessage, LLMResponse, RefreshLive
+from .utils import environment_fingerprint
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one client connection: read a request line and stream the events back"""
+
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            self._send({"event": "error", "message": f"Invalid request: {e}"})
+            return
+
+        try:
+            for event in self.server.daemon.iter_events(request):
+                self._send(event)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away, stop generating
+            return
+
+    def _send(self, event: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, daemon: "Daemon"):
+        self.daemon = daemon
+        super().__init__(str(socket_path), DaemonRequestHandler)
+
+
+class Daemon:
+    """Warm yaicli process serving requests over a Unix socket"""
+
+    def __init__(
+        self,
+        socket_path: Path = DAEMON_SOCKET_PATH,
+        verbose: bool = False,
+        client: Optional[LLMClient] = None,
+        role_manager: Optional[RoleManager] = None,
+    ):
+        self.socket_path = Path(socket_path)
+        self.verbose = verbose
+        self.console = get_console()
+        self.role_manager = role_manager or get_role_manager()
+        self.client = client or LLMClient(provider_name=cfg["PROVIDER"].lower(), verbose=verbose, config=cfg)
+        self.server: Optional[DaemonServer] = None
+
+    def warm_up(self) -> None:
+        """Load everything a request may need, so the first request is as fast as the others"""
+        environment = environment_fingerprint(cfg)
+        cfg["OS_NAME"], cfg["SHELL_NAME"] = environment.os_name, environment.shell_name
+
+        if cfg["ENABLE_FUNCTIONS"]:
+            from .tools.function import list_functions
+
+            list_functions()
+        if cfg["ENABLE_MCP"]:
+            try:
+                from .tools import get_mcp_manager
+
+                get_mcp_manager()
+            except Exception as e:
+                self.console.print(f"Failed to load MCP: {e}", style="red")
+
+    def build_messages(self, request: Dict[str, Any]) -> list[ChatMessage]:
+        """Build the message list for a request, same layout as one-shot mode"""
+        from .cli import CLI
+
+        role_name = CLI.evaluate_role_name(
+            bool(request.get("code")), bool(request.get("shell")), request.get("role") or cfg["DEFAULT_ROLE"]
+        )
+        role = self.role_manager.get_role(role_name)
+        return [
+            ChatMessage(role="system", content=role.prompt),
+            ChatMessage(role="user", content=request.get("prompt") or ""),
+        ]
+
+    def iter_events(self, request: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+        """Run a request and yield protocol events"""
+        try:
+            messages = self.build_messages(request)
+            stream = request.get("stream")
+            # Connections are served concurrently, each gets its own client over the shared provider
+            client = self.client.fork()
+            for chunk in client.completion_with_tools(
+                messages, stream=cfg["STREAM"] if stream is None else bool(stream)
+            ):
+                if isinstance(chunk, RefreshLive):
+                    yield {"event": "refresh"}
+                elif isinstance(chunk, LLMResponse) and (chunk.content or chunk.reasoning):
+                    yield {"event": "chunk", "content": chunk.content or "", "reasoning": chunk.reasoning}
+        except Exception as e:
+            if self.verbose:
+                self.console.print_exception()
+            yield {"event": "error", "message": str(e)}
+            return
+        yield {"event": "done"}
+
+    def _remove_stale_socket(self) -> None:
+        """Remove a socket file left behind by a dead daemon, refuse to start if one is alive"""
+        if not self.socket_path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except OSError:
+            self.socket_path.unlink()
+        else:
+            raise YaicliError(f"Daemon is already running on {self.socket_path}")
+        finally:
+            probe.close()
+
+    def start(self) -> DaemonServer:
+        """Bind the socket, the caller is responsible for serving"""
+        if not hasattr(socket, "AF_UNIX"):
+            raise YaicliError("Daemon mode requires Unix domain sockets, which are not available on this platform")
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_socket()
+        # Only the current user may talk to the daemon, it holds the API key. The socket is
+        # created private, changing its mode after the bind would leave it open until then.
+        umask = os.umask(0o177)
+        try:
+            self.server = DaemonServer(self.socket_path, self)
+        finally:
+            os.umask(umask)
+        return self.server
+
+    def stop(self) -> None:
+        """Stop a serving daemon, may be called from any thread, including the serving one"""
+        server, self.server = self.server, None
+        if server is not None:
+            # shutdown() waits for serve_forever to return, called from the serving thread it never would
+            threading.Thread(target=_shutdown, args=(server,), name="yaicli-daemon-stop", daemon=True).start()
+        self.socket_path.unlink(missing_ok=True)
+
+    def serve_forever(self) -> None:
+        self.warm_up()
+        server = self.start()
+        self.console.print(f"YAICLI daemon listening on {self.socket_path}", style="bold green")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.socket_path.unlink(missing_ok=True)
+            self.console.print("YAICLI daemon stopped.", style="bold green")
+
+
+def _shutdown(server: DaemonServer) -> None:
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,96 @@
+"""Thin client for `ai --daemon`.
+
+Only uses the standard library, so starting it costs a bare interpreter plus a socket
+round trip. Forwards the prompt (and stdin) to the daemon and writes the streamed
+answer to stdout, reasoning goes to stderr with --show-reasoning.
+
+Usage:
+    yaicli-client "What is the capital of France?"
+    git diff | yaicli-client "Write a commit message"
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Keep in sync with DAEMON_SOCKET_PATH in yaicli/const.py
+DEFAULT_SOCKET_PATH = Path(os.getenv("YAI_DAEMON_SOCKET") or Path("~/.config/yaicli/daemon.sock")).expanduser()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="yaicli-client",
+        description="Send a prompt to a running `ai --daemon`.",
+    )
+    parser.add_argument("prompt", nargs="?", default="", help="The prompt to send. Reads from stdin if available.")
+    parser.add_argument("-r", "--role", default="", help="Specify the assistant role to use.")
+    parser.add_argument("-s", "--shell", action="store_true", help="Generate a shell command (printed, not executed).")
+    parser.add_argument("--code", action="store_true", help="Generate code in plaintext.")
+    parser.add_argument("--stream", dest="stream", action="store_true", default=None, help="Stream the response.")
+    parser.add_argument("--no-stream", dest="stream", action="store_false", help="Do not stream the response.")
+    parser.add_argument("--show-reasoning", action="store_true", help="Write reasoning content to stderr.")
+    parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET_PATH, help="Daemon socket path.")
+    return parser
+
+
+def read_prompt(prompt: str) -> str:
+    """Combine the prompt argument with stdin content, like `ai` does"""
+    if sys.stdin is None or sys.stdin.isatty():
+        return prompt
+    stdin_content = sys.stdin.read().strip()
+    if stdin_content and prompt:
+        return f"{stdin_content}\n\n{prompt}"
+    return stdin_content or prompt
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    prompt = read_prompt(args.prompt)
+    if not prompt:
+        print("No input provided.", file=sys.stderr)
+        return 2
+
+    request = {"prompt": prompt, "role": args.role, "shell": args.shell, "code": args.code, "stream": args.stream}
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(args.socket))
+    except OSError as e:
+        print(f"Cannot connect to yaicli daemon at {args.socket}: {e}. Start it with `ai --daemon`.", file=sys.stderr)
+        sock.close()
+        return 1
+
+    ended_with_newline = True
+    with sock, sock.makefile("rwb") as conn:
+        conn.write(json.dumps(request).encode("utf-8") + b"\n")
+        conn.flush()
+        for line in conn:
+            event = json.loads(line)
+            kind = event.get("event")
+            if kind == "chunk":
+                if args.show_reasoning and event.get("reasoning"):
+                    sys.stderr.write(event["reasoning"])
+                    sys.stderr.flush()
+                if event.get("content"):
+                    sys.stdout.write(event["content"])
+                    sys.stdout.flush()
+                    ended_with_newline = event["content"].endswith("\n")
+            elif kind == "refresh":
+                if not ended_with_newline:
+                    sys.stdout.write("\n")
+                    ended_with_newline = True
+            elif kind == "error":
+                print(f"YAICLI Error: {event.get('message')}", file=sys.stderr)
+                return 1
+            elif kind == "done":
+                break
+    if not ended_with_newline:
+        sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
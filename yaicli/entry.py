@@ -1,16 +1,14 @@
+import importlib
 import sys
 from importlib.metadata import version as pkg_version
-from typing import Annotated, Any, List, Optional
+from typing import Annotated, Any, Callable, List, Optional
 
 import typer
+from typer.main import get_param_callback
 
-from .chat import FileChatManager
 from .config import cfg
 from .const import DEFAULT_CONFIG_INI, DefaultRoleNames, JustifyEnum
 from .exceptions import YaicliError
-from .functions import install_functions, print_functions, print_mcp, reinstall_functions
-from .llms.provider import ProviderFactory
-from .role import RoleManager
 
 app = typer.Typer(
     name="yaicli",
@@ -27,6 +25,30 @@ def version_callback(value: bool):
         raise typer.Exit()
 
 
+def lazy_callback(path: str) -> Callable[[Any], Any]:
+    """Create an option callback that imports its target only when the option is given.
+
+    Typer calls every option callback on each run, so importing roles, chats, functions
+    and providers up front would slow down every invocation.
+
+    Args:
+        path: Callback location as "module:attr", e.g. ".role:RoleManager.check_id_ok"
+    """
+    module_path, _, attr_path = path.partition(":")
+
+    def callback(ctx: typer.Context, param: typer.CallbackParam, value: Any) -> Any:
+        # All wrapped callbacks are no-ops for empty values
+        if not value:
+            return value
+        target: Any = importlib.import_module(module_path, package=__package__)
+        for attr in attr_path.split("."):
+            target = getattr(target, attr)
+        # Let typer map ctx/param/value onto the target's own signature
+        return get_param_callback(callback=target)(ctx, param, value)
+
+    return callback
+
+
 def override_config(
     ctx: typer.Context,  # noqa: F841
     param: typer.CallbackParam,
@@ -96,7 +118,7 @@ class RoleOptions:
         "-r",
         help="Specify the assistant role to use.",
         rich_help_panel="Role Options",
-        callback=RoleManager.check_id_ok,
+        callback=lazy_callback(".role:RoleManager.check_id_ok"),
     )
 
     create_role = typer.Option(
@@ -104,7 +126,7 @@ class RoleOptions:
         "--create-role",
         help="Create a new role with the specified name.",
         rich_help_panel="Role Options",
-        callback=RoleManager.create_role_option,
+        callback=lazy_callback(".role:RoleManager.create_role_option"),
     )
 
     delete_role = typer.Option(
@@ -112,7 +134,7 @@ class RoleOptions:
         "--delete-role",
         help="Delete a role with the specified name.",
         rich_help_panel="Role Options",
-        callback=RoleManager.delete_role_option,
+        callback=lazy_callback(".role:RoleManager.delete_role_option"),
     )
 
     list_roles = typer.Option(
@@ -120,7 +142,7 @@ class RoleOptions:
         "--list-roles",
         help="List all available roles.",
         rich_help_panel="Role Options",
-        callback=RoleManager.print_list_option,
+        callback=lazy_callback(".role:RoleManager.print_list_option"),
     )
 
     show_role = typer.Option(
@@ -128,7 +150,7 @@ class RoleOptions:
         "--show-role",
         help="Show the role with the specified name.",
         rich_help_panel="Role Options",
-        callback=RoleManager.show_role_option,
+        callback=lazy_callback(".role:RoleManager.show_role_option"),
     )
 
 
@@ -146,7 +168,7 @@ class ChatOptions:
         "--list-chats",
         help="List saved chat sessions.",
         rich_help_panel="Chat Options",
-        callback=FileChatManager.print_list_option,
+        callback=lazy_callback(".chat:FileChatManager.print_list_option"),
     )
 
 
@@ -195,12 +217,27 @@ class OtherOptions:
         rich_help_panel="Other Options",
     )
 
+    daemon = typer.Option(
+        False,
+        "--daemon",
+        help="Run a warm daemon serving `yaicli-client` requests over a Unix socket.",
+        rich_help_panel="Other Options",
+    )
+
+    pipe = typer.Option(
+        None,
+        "--pipe/--no-pipe",
+        help="Write plain text to stdout without rendering or prompts. [dim](default: when stdin is not a TTY, or stdout outside --shell)[/dim]",
+        rich_help_panel="Other Options",
+        show_default=False,
+    )
+
     list_providers = typer.Option(
         False,
         "--list-providers",
         help="List the available providers and exit.",
         rich_help_panel="Other Options",
-        callback=ProviderFactory.list_providers,
+        callback=lazy_callback(".llms.provider:ProviderFactory.list_providers"),
     )
 
     show_reasoning = typer.Option(
@@ -244,7 +281,7 @@ class MCPOptions:
         "--list-mcp",
         help="List all available mcp.",
         rich_help_panel="MCP Options",
-        callback=print_mcp,
+        callback=lazy_callback(".functions:print_mcp"),
     )
 
 
@@ -264,7 +301,7 @@ class FunctionOptions:
         "--install-functions",
         help="Install default functions.",
         rich_help_panel="Function Options",
-        callback=install_functions,
+        callback=lazy_callback(".functions:install_functions"),
     )
 
     list_functions = typer.Option(
@@ -272,7 +309,7 @@ class FunctionOptions:
         "--list-functions",
         help="List all available functions.",
         rich_help_panel="Function Options",
-        callback=print_functions,
+        callback=lazy_callback(".functions:print_functions"),
     )
 
     reinstall_functions = typer.Option(
@@ -280,7 +317,7 @@ class FunctionOptions:
         "--reinstall-functions",
         help="Reinstall builtin functions (overwrites existing builtin files, preserves custom ones).",
         rich_help_panel="Function Options",
-        callback=reinstall_functions,
+        callback=lazy_callback(".functions:reinstall_functions"),
     )
 
     enable_functions = typer.Option(
@@ -331,6 +368,8 @@ def main(
     version: Optional[bool] = OtherOptions.version,  # noqa: F841
     verbose: bool = OtherOptions.verbose,
     template: bool = OtherOptions.template,
+    daemon: bool = OtherOptions.daemon,
+    pipe: Optional[bool] = OtherOptions.pipe,
     list_providers: bool = OtherOptions.list_providers,  # noqa: F841
     show_reasoning: bool = OtherOptions.show_reasoning,  # noqa: F841
     justify: JustifyEnum = OtherOptions.justify,  # noqa: F841
@@ -362,9 +401,20 @@ def main(
         print(DEFAULT_CONFIG_INI)
         raise typer.Exit()
 
+    if daemon:
+        from .daemon import Daemon
+
+        try:
+            Daemon(verbose=verbose).serve_forever()
+        except YaicliError as e:
+            typer.echo(f"YAICLI Error: {e}")
+            raise typer.Exit(1)
+        return
+
     # # Combine prompt argument with stdin content if available
     final_prompt = prompt
-    if not sys.stdin.isatty():
+    stdin_is_tty = sys.stdin.isatty()
+    if not stdin_is_tty:
         stdin_content = sys.stdin.read().strip()
         if stdin_content:
             if final_prompt:
@@ -377,16 +427,35 @@ def main(
         if chat:
             print("Warning: --chat is ignored when stdin was redirected.")
             chat = False
-    if not any([final_prompt, chat]):
+    if not any([final_prompt, chat, image]):
         print(ctx.get_help())
         return
 
+    if pipe is None:
+        # Output piped to another program, e.g. `ai ... | jq`, is written as plain text too. Never in
+        # chat mode, like --pipe, and not in shell mode, which would stop asking to run the command
+        # when only the output is redirected.
+        pipe = not chat and (not stdin_is_tty or not (shell or sys.stdout.isatty()))
+    elif pipe and chat:
+        print("Warning: --pipe is ignored when --chat is used.")
+        pipe = False
+
     # Process image arguments
     image_data_list = []
     if image:
         from .image import process_image_source
-
-        for img_source in image:
+        from .llms.capabilities import get_provider_capabilities
+
+        image_sources = image
+        # Don't read and encode images the provider would discard
+        if not get_provider_capabilities(cfg["PROVIDER"]).vision:
+            if not (final_prompt or chat):
+                # Nothing left to send
+                print(f"Error: Provider '{cfg['PROVIDER']}' does not support image input.")
+                raise typer.Exit(1)
+            print(f"Warning: Provider '{cfg['PROVIDER']}' does not support image input. Images will be ignored.")
+            image_sources = []
+        for img_source in image_sources:
             try:
                 image_data_list.append(process_image_source(img_source))
             except typer.BadParameter as e:
@@ -394,7 +463,7 @@ def main(
                 raise typer.Exit(1)
 
     # Allow image-only invocation (no text prompt)
-    if image_data_list and not final_prompt and not chat:
+    if image and not final_prompt and not chat:
         final_prompt = ""
 
     if not any([final_prompt is not None, chat]):
@@ -412,7 +481,7 @@ def main(
 
     try:
         # Instantiate the main CLI class with the specified role
-        cli = CLI(verbose=verbose, role=role)
+        cli = CLI(verbose=verbose, role=role, pipe=pipe)
         # Run the appropriate mode
         cli.run(
             chat=chat,
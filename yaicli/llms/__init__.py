@@ -1,4 +1,12 @@
-from .client import LLMClient
+from .capabilities import ProviderCapabilities, get_provider_capabilities
+from .client import AsyncLLMClient, LLMClient
 from .provider import Provider, ProviderFactory
 
-__all__ = ["LLMClient", "Provider", "ProviderFactory"]
+__all__ = [
+    "AsyncLLMClient",
+    "LLMClient",
+    "Provider",
+    "ProviderCapabilities",
+    "ProviderFactory",
+    "get_provider_capabilities",
+]
@@ -0,0 +1,81 @@
+"""Static capability manifest of the providers in `ProviderFactory.providers_map`.
+
+Answers metadata questions (vision, parallel tool calls, streaming usage, ...) without
+importing the provider module or its SDK, so callers can skip work a provider would discard.
+"""
+
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class ProviderCapabilities:
+    """What a provider implementation supports"""
+
+    # Accepts image input
+    vision: bool = True
+    # May return several tool calls in one response, worth starting them before it ends
+    parallel_tool_calls: bool = False
+    # Reports token usage in streaming responses
+    stream_usage: bool = False
+    # Supports explicit prompt cache breakpoints (`cache_control`)
+    prompt_caching: bool = False
+
+
+# Used for providers missing from the manifest, e.g. OpenAI compatible endpoints
+DEFAULT_CAPABILITIES = ProviderCapabilities()
+
+_NO_VISION = ProviderCapabilities(vision=False)
+_ANTHROPIC = ProviderCapabilities(parallel_tool_calls=True, stream_usage=True, prompt_caching=True)
+_COHERE = ProviderCapabilities(vision=False, stream_usage=True)
+_GEMINI = ProviderCapabilities(parallel_tool_calls=True, stream_usage=True)
+_OPENAI = ProviderCapabilities(parallel_tool_calls=True, stream_usage=True)
+
+PROVIDER_CAPABILITIES: Dict[str, ProviderCapabilities] = {
+    "ai21": DEFAULT_CAPABILITIES,
+    "anthropic": _ANTHROPIC,
+    "anthropic-bedrock": _ANTHROPIC,
+    "anthropic-vertex": _ANTHROPIC,
+    "bailian": ProviderCapabilities(stream_usage=True),
+    "bailian-intl": ProviderCapabilities(stream_usage=True),
+    "cerebras": ProviderCapabilities(stream_usage=True),
+    "chatglm": _NO_VISION,
+    "chutes": DEFAULT_CAPABILITIES,
+    "cohere": _COHERE,
+    "cohere-bedrock": _COHERE,
+    "cohere-sagemaker": _COHERE,
+    "deepseek": ProviderCapabilities(stream_usage=True),
+    "doubao": ProviderCapabilities(stream_usage=True),
+    "fireworks": ProviderCapabilities(parallel_tool_calls=True, stream_usage=True),
+    "gemini": _GEMINI,
+    "groq": ProviderCapabilities(parallel_tool_calls=True, stream_usage=True),
+    "huggingface": _NO_VISION,
+    "infini-ai": DEFAULT_CAPABILITIES,
+    "longcat": DEFAULT_CAPABILITIES,
+    "longcat-anthropic": DEFAULT_CAPABILITIES,
+    "minimax": ProviderCapabilities(stream_usage=True),
+    "mistral": ProviderCapabilities(stream_usage=True),
+    "modelscope": _NO_VISION,
+    "moonshot": ProviderCapabilities(stream_usage=True),
+    "nvida": DEFAULT_CAPABILITIES,
+    "ollama": ProviderCapabilities(stream_usage=True),
+    "openai": _OPENAI,
+    "openai-azure": _OPENAI,
+    "openai-compatible": DEFAULT_CAPABILITIES,
+    "openrouter": ProviderCapabilities(parallel_tool_calls=True, stream_usage=True),
+    # Depends on the backends, see `ROUTER_BACKENDS`
+    "router": DEFAULT_CAPABILITIES,
+    "sambanova": ProviderCapabilities(stream_usage=True),
+    "siliconflow": ProviderCapabilities(stream_usage=True),
+    "spark": DEFAULT_CAPABILITIES,
+    "targon": DEFAULT_CAPABILITIES,
+    "together": ProviderCapabilities(parallel_tool_calls=True, stream_usage=True),
+    "vertexai": _GEMINI,
+    "xai": ProviderCapabilities(parallel_tool_calls=True, stream_usage=True),
+    "yi": DEFAULT_CAPABILITIES,
+}
+
+
+def get_provider_capabilities(provider_name: str) -> ProviderCapabilities:
+    """Get the capabilities of a provider by name, without importing it"""
+    return PROVIDER_CAPABILITIES.get(provider_name.lower(), DEFAULT_CAPABILITIES)
@@ -1,11 +1,86 @@
-from typing import Generator, List, Optional, Union
+import time
+from collections import deque
+from typing import TYPE_CHECKING, AsyncGenerator, Deque, Dict, Generator, List, Optional, Tuple, Union
 
+from ..accumulator import ResponseAccumulator
 from ..config import cfg
+from ..const import DEFAULT_EARLY_TOOL_DISPATCH, DEFAULT_MAX_PARALLEL_TOOL_CALLS
 from ..console import get_console
-from ..schemas import ChatMessage, LLMResponse, RefreshLive, ToolCall, ToolPolicy
-from ..tools import execute_tool_call
-from ..tools.mcp import MCP_TOOL_NAME_PREFIX
+from ..schemas import ChatMessage, LLMResponse, RefreshLive, ToolCall, ToolPolicy, Usage
+from ..tools import MCP_TOOL_NAME_PREFIX, DeferredConsole, execute_tool_call
+from ..utils import is_complete_json, str2bool
+from .capabilities import get_provider_capabilities
+from .metrics import MetricsExporter, RequestMetrics
 from .provider import ProviderFactory
+from .ratelimit import estimate_tokens, get_rate_limiter, retry_after
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    StartedToolCalls = Dict[str, Tuple[Future, DeferredConsole]]
+
+
+class EarlyToolDispatcher:
+    """
+    Runs tool calls while the response they come from is still streaming
+
+    A tool call starts as soon as its arguments are a complete JSON object, so tool
+    latency overlaps with generation. Its console output is held back until the results
+    are collected, so it doesn't interleave with the streamed response.
+    """
+
+    def __init__(self, max_workers: int):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.started: "StartedToolCalls" = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="yaicli-tool")
+
+    def submit(self, tool_call: ToolCall) -> bool:
+        """Start the tool call if its arguments are complete, return whether it was started"""
+        if tool_call.id in self.started or not is_complete_json(tool_call.arguments):
+            return False
+        output = DeferredConsole()
+        self.started[tool_call.id] = (self._executor.submit(execute_tool_call, tool_call, output), output)
+        return True
+
+    def close(self) -> None:
+        """Release the worker threads, tool calls that haven't started yet are cancelled"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _Turn:
+    """State of one provider request of a conversation, shared by the sync and async tool loops"""
+
+    __slots__ = ("tool_policy", "response", "metrics", "wait", "reserved_tokens", "dispatcher")
+
+    def __init__(
+        self,
+        tool_policy: ToolPolicy,
+        response: ResponseAccumulator,
+        metrics: RequestMetrics,
+        wait: float,
+        reserved_tokens: int,
+        dispatcher: Optional[EarlyToolDispatcher],
+    ):
+        self.tool_policy = tool_policy
+        self.response = response
+        self.metrics = metrics
+        # Seconds to wait for the rate limiter before sending the request
+        self.wait = wait
+        self.reserved_tokens = reserved_tokens
+        self.dispatcher = dispatcher
+
+    @property
+    def started_tool_calls(self) -> Optional["StartedToolCalls"]:
+        return self.dispatcher.started if self.dispatcher is not None else None
+
+    def close(self) -> None:
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+
+
+# Number of requests kept in `LLMClient.metrics`
+METRICS_HISTORY = 32
 
 
 class LLMClient:
@@ -18,7 +93,22 @@ class LLMClient:
     3. Handling conversation flow with tools
     """
 
-    __slots__ = ("config", "verbose", "console", "enable_function", "enable_mcp", "max_tool_call_depth", "provider")
+    __slots__ = (
+        "config",
+        "verbose",
+        "console",
+        "enable_function",
+        "enable_mcp",
+        "max_tool_call_depth",
+        "max_parallel_tool_calls",
+        "early_tool_dispatch",
+        "provider",
+        "provider_name",
+        "capabilities",
+        "rate_limiter",
+        "metrics",
+        "metrics_exporter",
+    )
 
     def __init__(
         self,
@@ -46,8 +136,30 @@ class LLMClient:
             self.console.print(f"Provider {provider_name} not found, using openai as default", style="yellow")
             provider_name = "openai"
         self.provider = ProviderFactory.create_provider(provider_name, config=config, verbose=verbose, **kwargs)
+        self.provider_name = provider_name
+        self.capabilities = get_provider_capabilities(provider_name)
+        self.rate_limiter = get_rate_limiter(provider_name, config)
 
         self.max_tool_call_depth = self.config["MAX_TOOL_CALL_DEPTH"]
+        self.max_parallel_tool_calls = self.config.get("MAX_PARALLEL_TOOL_CALLS", DEFAULT_MAX_PARALLEL_TOOL_CALLS)
+        self.early_tool_dispatch = str2bool(self.config.get("EARLY_TOOL_DISPATCH", DEFAULT_EARLY_TOOL_DISPATCH))
+
+        # Timings of the latest provider requests
+        self.metrics: Deque[RequestMetrics] = deque(maxlen=METRICS_HISTORY)
+        self.metrics_exporter = MetricsExporter(
+            self.config.get("METRICS_FILE") or "", self.config.get("METRICS_OTLP_ENDPOINT") or ""
+        )
+
+    def fork(self) -> "LLMClient":
+        """Client sharing the provider, rate limiter and exporter of this one, with its own request metrics.
+
+        Concurrent conversations each use a fork, so their metrics don't interleave.
+        """
+        import copy
+
+        client = copy.copy(self)
+        client.metrics = deque(maxlen=METRICS_HISTORY)
+        return client
 
     def completion_with_tools(
         self,
@@ -55,6 +167,7 @@ class LLMClient:
         stream: bool = False,
         recursion_depth: int = 0,
         tool_policy: Optional[ToolPolicy] = None,
+        response: Optional[ResponseAccumulator] = None,
     ) -> Generator[Union[LLMResponse, RefreshLive], None, None]:
         """
         Get completion from provider with tool calling support
@@ -63,62 +176,175 @@ class LLMClient:
             messages: List of messages for the conversation
             stream: Whether to stream the response
             recursion_depth: Current recursion depth for tool calls
+            response: Collects each response before it is yielded, so the caller can share it,
+                its `total_usage` sums the usage of all the requests of the call
 
         Yields:
             LLMResponse objects and control signals
         """
-        if recursion_depth >= self.max_tool_call_depth:
-            self.console.print(
-                f"Maximum tool call depth ({self.max_tool_call_depth}) reached. Stopping further tool calls...",
-                style="bold yellow",
+        response = response if response is not None else ResponseAccumulator()
+        while not self._max_depth_reached(recursion_depth):
+            turn = self._start_turn(messages, stream, tool_policy, response)
+            try:
+                if turn.wait:
+                    with turn.metrics.span("rate_limit"):
+                        time.sleep(turn.wait)
+                responses = self.provider.completion(messages, stream=stream, tool_policy=turn.tool_policy)
+                for llm_response in turn.metrics.observe(responses):
+                    self._collect(turn, llm_response)
+                    yield llm_response  # Forward response to caller
+                tool_calls = self._finish_turn(turn, messages)
+                if not tool_calls:
+                    return
+
+                # Signal that new content is coming
+                yield RefreshLive()
+                with turn.metrics.span("tool_execution"):
+                    results = self._execute_tool_calls(tool_calls, turn.started_tool_calls)
+            except Exception as e:
+                self._note_rate_limit_error(e)
+                raise
+            finally:
+                turn.close()
+            self._add_tool_results(turn, messages, tool_calls, results)
+            recursion_depth += 1
+            tool_policy = turn.tool_policy
+
+    def _start_turn(
+        self,
+        messages: List[ChatMessage],
+        stream: bool,
+        tool_policy: Optional[ToolPolicy],
+        response: ResponseAccumulator,
+    ) -> _Turn:
+        """Prepare the next provider request of a conversation, the caller waits `wait` seconds before sending it"""
+        response.reset()
+        tool_policy = self._resolve_tool_policy(tool_policy)
+        metrics = self._start_metrics()
+        wait, reserved_tokens = self._reserve_rate_limit(messages)
+        return _Turn(tool_policy, response, metrics, wait, reserved_tokens, self._early_dispatcher(stream))
+
+    def _collect(self, turn: _Turn, llm_response: LLMResponse) -> None:
+        """Collect content and tool calls of a response, starting complete tool calls early"""
+        if turn.response.add(llm_response):
+            self._dispatch_early(turn.dispatcher, llm_response.tool_call, turn.tool_policy)  # type: ignore[arg-type]
+
+    def _finish_turn(self, turn: _Turn, messages: List[ChatMessage]) -> List[ToolCall]:
+        """Add the assistant response to messages, return the tool calls to execute"""
+        turn.response.finish()
+        self._record_usage(turn.response.usage, turn.reserved_tokens)
+        tool_calls = self._add_assistant_message(messages, turn.response, turn.tool_policy)
+        if not tool_calls:
+            self._report_metrics(turn.metrics)
+        return tool_calls
+
+    def _add_tool_results(
+        self,
+        turn: _Turn,
+        messages: List[ChatMessage],
+        tool_calls: List[ToolCall],
+        results: List[Tuple[str, bool]],
+    ) -> None:
+        """Add the results of executed tool calls to messages"""
+        self._report_metrics(turn.metrics)
+        tool_role = self.provider.detect_tool_role()
+        for tool_call, (function_result, _) in zip(tool_calls, results):
+            messages.append(
+                ChatMessage(
+                    role=tool_role,
+                    content=function_result,
+                    name=tool_call.name,
+                    tool_call_id=tool_call.id,
+                )
             )
+
+    def _start_metrics(self) -> RequestMetrics:
+        metrics = RequestMetrics(self.provider_name, str(self.config.get("MODEL") or ""))
+        self.metrics.append(metrics)
+        return metrics
+
+    def _report_metrics(self, metrics: RequestMetrics) -> None:
+        """Show the timings of a finished request with --verbose and export them"""
+        if self.verbose:
+            self.console.print(f"Timing: {metrics.summary()}", style="dim")
+        if self.metrics_exporter.enabled:
+            self.metrics_exporter.export(metrics)
+
+    def _reserve_rate_limit(self, messages: List[ChatMessage]) -> Tuple[float, int]:
+        """Reserve the next request with the rate limiter, return the seconds to wait before sending it
+        and the tokens reserved"""
+        if self.rate_limiter is None:
+            return 0.0, 0
+        tokens = estimate_tokens(messages)
+        wait = self.rate_limiter.reserve(tokens)
+        if wait and self.verbose:
+            self.console.print(f"Rate limited, waiting {wait:.1f}s", style="dim")
+        return wait, tokens
+
+    def _record_usage(self, usage: Optional[Usage], reserved_tokens: int) -> None:
+        """Settle the rate limit reservation of a finished request with its usage"""
+        if usage is None:
             return
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_usage(reserved_tokens, usage.total_tokens)
 
-        effective_tool_policy = self.provider.resolve_tool_policy(tool_policy)
+    def _note_rate_limit_error(self, error: Exception) -> None:
+        """Hold back the next requests as long as a rate limit error asks to"""
+        seconds = retry_after(error) if self.rate_limiter is not None else None
+        if seconds:
+            self.rate_limiter.pause(seconds)  # type: ignore[union-attr]
 
-        # Get completion from provider and collect response data
-        assistant_response_content = ""
-        assistant_reasoning_content = ""  # Collect reasoning content
-        # Providers may return identical tool calls with the same ID in a single response during streaming
-        tool_calls: dict[str, ToolCall] = {}
+    def _early_dispatcher(self, stream: bool) -> Optional[EarlyToolDispatcher]:
+        """Dispatcher for the tool calls of the next response, None when they run after it"""
+        if not (stream and self.early_tool_dispatch and (self.enable_function or self.enable_mcp)):
+            return None
+        # A single tool call per response hardly starts before the response ends
+        if not self.capabilities.parallel_tool_calls:
+            return None
+        return EarlyToolDispatcher(self.max_parallel_tool_calls)
 
-        # Stream responses and collect data
-        for llm_response in self.provider.completion(messages, stream=stream, tool_policy=effective_tool_policy):
-            yield llm_response  # Forward response to caller
+    def _dispatch_early(
+        self, dispatcher: Optional[EarlyToolDispatcher], tool_call: ToolCall, tool_policy: ToolPolicy
+    ) -> None:
+        """Start an allowed tool call right away"""
+        if dispatcher is None or not self._get_valid_tool_calls({tool_call.id: tool_call}, tool_policy):
+            return
+        if dispatcher.submit(tool_call) and self.verbose:
+            self.console.print(f"Started tool call early: {tool_call.name}", style="dim")
 
-            # Collect content and tool calls for potential tool execution
-            if llm_response.content:
-                assistant_response_content += llm_response.content
-            if llm_response.reasoning:  # Collect reasoning content
-                assistant_reasoning_content += llm_response.reasoning
-            if llm_response.tool_call and llm_response.tool_call.id not in tool_calls:
-                tool_calls[llm_response.tool_call.id] = llm_response.tool_call
+    def _max_depth_reached(self, recursion_depth: int) -> bool:
+        """Check the tool call depth, warn when the limit is reached"""
+        if recursion_depth < self.max_tool_call_depth:
+            return False
+        self.console.print(
+            f"Maximum tool call depth ({self.max_tool_call_depth}) reached. Stopping further tool calls...",
+            style="bold yellow",
+        )
+        return True
 
-        # Always add assistant response to messages first
-        valid_tool_calls = self._get_valid_tool_calls(tool_calls, effective_tool_policy)
+    def _resolve_tool_policy(self, tool_policy: Optional[ToolPolicy]) -> ToolPolicy:
+        """Tool policy for the next request"""
+        return self.provider.resolve_tool_policy(tool_policy)
+
+    def _add_assistant_message(
+        self, messages: List[ChatMessage], response: ResponseAccumulator, tool_policy: ToolPolicy
+    ) -> List[ToolCall]:
+        """Append the assistant response to messages, return the tool calls to execute"""
+        tool_calls = response.tool_calls
+        reasoning = response.reasoning
+        valid_tool_calls = self._get_valid_tool_calls(tool_calls, tool_policy)
         if self.verbose and tool_calls and len(valid_tool_calls) != len(tool_calls):
             skipped_tools = [tool_call.name for tool_call in tool_calls.values() if tool_call not in valid_tool_calls]
             self.console.print(f"Skipping disallowed tool calls: {', '.join(skipped_tools)}", style="dim yellow")
 
         assistant_message = ChatMessage(
             role="assistant",
-            content=assistant_response_content,
+            content=response.content,
             tool_calls=valid_tool_calls,
-            reasoning=assistant_reasoning_content if assistant_reasoning_content else None,  # Save reasoning
+            reasoning=reasoning if reasoning else None,  # Save reasoning
         )
         messages.append(assistant_message)
-
-        if not valid_tool_calls:
-            return
-
-        # Execute tools and continue conversation
-        yield from self._execute_tools_and_continue(
-            messages,
-            valid_tool_calls,
-            stream,
-            recursion_depth,
-            effective_tool_policy,
-        )
+        return valid_tool_calls
 
     def _get_valid_tool_calls(self, tool_calls: dict[str, ToolCall], tool_policy: ToolPolicy) -> List[ToolCall]:
         """Filter tool calls based on enabled features"""
@@ -136,39 +362,96 @@ class LLMClient:
 
         return valid_tool_calls
 
-    def _execute_tools_and_continue(
+    def _execute_tool_calls(
+        self, tool_calls: List[ToolCall], started: Optional["StartedToolCalls"] = None
+    ) -> List[Tuple[str, bool]]:
+        """
+        Execute tool calls, up to `max_parallel_tool_calls` at the same time
+
+        Results are returned in the order of `tool_calls`, and the console output of each
+        call is printed as one block in that order. Calls in `started` were dispatched
+        early, only their results are collected.
+        """
+        started = started or {}
+        pending = [tool_call for tool_call in tool_calls if tool_call.id not in started]
+        workers = min(self.max_parallel_tool_calls, len(pending))
+        if workers <= 1 and not started:
+            return [execute_tool_call(tool_call) for tool_call in tool_calls]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="yaicli-tool") as executor:
+            jobs = []
+            for tool_call in tool_calls:
+                if tool_call.id in started:
+                    jobs.append(started[tool_call.id])
+                    continue
+                output = DeferredConsole()
+                jobs.append((executor.submit(execute_tool_call, tool_call, output), output))
+            for future, output in jobs:
+                results.append(future.result())
+                output.replay(self.console)
+        return results
+
+
+class AsyncLLMClient(LLMClient):
+    """
+    Async counterpart of LLMClient
+
+    Uses `Provider.acompletion`, so a single event loop can drive many conversations.
+    Tools run in worker threads as they are blocking.
+    """
+
+    __slots__ = ()
+
+    async def completion_with_tools(  # type: ignore[override]
         self,
         messages: List[ChatMessage],
-        tool_calls: List[ToolCall],
-        stream: bool,
-        recursion_depth: int,
-        tool_policy: ToolPolicy,
-    ) -> Generator[Union[LLMResponse, RefreshLive], None, None]:
-        """Execute tool calls and continue the conversation"""
-        # Signal that new content is coming
-        yield RefreshLive()
-
-        # Assistant message has already been added to messages in completion_with_tools
+        stream: bool = False,
+        recursion_depth: int = 0,
+        tool_policy: Optional[ToolPolicy] = None,
+        response: Optional[ResponseAccumulator] = None,
+    ) -> AsyncGenerator[Union[LLMResponse, RefreshLive], None]:
+        """
+        Get completion from provider with tool calling support
 
-        # Execute each tool call and add results to messages
-        tool_role = self.provider.detect_tool_role()
+        Args:
+            messages: List of messages for the conversation
+            stream: Whether to stream the response
+            recursion_depth: Current recursion depth for tool calls
+            response: Collects each response before it is yielded, so the caller can share it,
+                its `total_usage` sums the usage of all the requests of the call
 
-        for tool_call in tool_calls:
-            function_result, _ = execute_tool_call(tool_call)
+        Yields:
+            LLMResponse objects and control signals
+        """
+        import asyncio
 
-            messages.append(
-                ChatMessage(
-                    role=tool_role,
-                    content=function_result,
-                    name=tool_call.name,
-                    tool_call_id=tool_call.id,
-                )
-            )
+        response = response if response is not None else ResponseAccumulator()
+        while not self._max_depth_reached(recursion_depth):
+            turn = self._start_turn(messages, stream, tool_policy, response)
+            try:
+                if turn.wait:
+                    with turn.metrics.span("rate_limit"):
+                        await asyncio.sleep(turn.wait)
+                responses = self.provider.acompletion(messages, stream=stream, tool_policy=turn.tool_policy)
+                async for llm_response in turn.metrics.aobserve(responses):
+                    self._collect(turn, llm_response)
+                    yield llm_response
+                tool_calls = self._finish_turn(turn, messages)
+                if not tool_calls:
+                    return
 
-        # Continue the conversation with updated history
-        yield from self.completion_with_tools(
-            messages,
-            stream=stream,
-            recursion_depth=recursion_depth + 1,
-            tool_policy=tool_policy,
-        )
+                # Signal that new content is coming
+                yield RefreshLive()
+                with turn.metrics.span("tool_execution"):
+                    results = await asyncio.to_thread(self._execute_tool_calls, tool_calls, turn.started_tool_calls)
+            except Exception as e:
+                self._note_rate_limit_error(e)
+                raise
+            finally:
+                turn.close()
+            self._add_tool_results(turn, messages, tool_calls, results)
+            recursion_depth += 1
+            tool_policy = turn.tool_policy
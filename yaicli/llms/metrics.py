@@ -0,0 +1,332 @@
+"""Timing of LLM requests.
+
+Each provider request gets a `RequestMetrics` with spans for its phases (message
+conversion, tool schemas, waiting for the response, streaming, rendering, tool
+execution), the time to first token and the latency between streamed chunks.
+
+Code running inside a provider request records into it with `span()` and `mark()`
+without having it passed along; outside a request both are no-ops.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Generator, Iterator, List, Optional
+
+from ..console import get_console
+from ..schemas import LLMResponse, Usage
+
+# Upper bounds in milliseconds of the inter-token latency histogram buckets, the last one is open
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000)
+# Rough characters per token, used when the response reports no usage
+CHARS_PER_TOKEN = 4
+
+_current: ContextVar[Optional["RequestMetrics"]] = ContextVar("yaicli_request_metrics", default=None)
+
+
+@dataclass
+class Span:
+    """A timed phase, times are `perf_counter` seconds"""
+
+    name: str
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class RequestMetrics:
+    """Timings of one provider request"""
+
+    provider: str
+    model: str
+    start: float = field(default_factory=time.perf_counter)
+    start_wall_ns: int = field(default_factory=time.time_ns)
+    end: Optional[float] = None
+    spans: List[Span] = field(default_factory=list)
+    marks: Dict[str, float] = field(default_factory=dict)
+    first_token: Optional[float] = None
+    chunk_times: List[float] = field(default_factory=list)
+    output_chars: int = 0
+    # Time the caller spent on the responses, e.g. rendering them
+    render_time: float = 0.0
+    # Token counts reported by the response
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
+
+    @contextmanager
+    def span(self, name: str) -> Generator[None, None, None]:
+        """Record the time spent in the block as a span"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append(Span(name, start, time.perf_counter()))
+
+    def observe(self, responses: Iterator[LLMResponse]) -> Generator[LLMResponse, None, None]:
+        """Forward the responses of a provider, timing the provider and the caller"""
+        while True:
+            token = _current.set(self)
+            try:
+                response = next(responses)
+            except StopIteration:
+                break
+            finally:
+                _current.reset(token)
+            self._on_response(response)
+            handed_over = time.perf_counter()
+            yield response
+            self.render_time += time.perf_counter() - handed_over
+        self.finish()
+
+    async def aobserve(self, responses: AsyncIterator[LLMResponse]) -> AsyncGenerator[LLMResponse, None]:
+        """Async counterpart of `observe`"""
+        while True:
+            token = _current.set(self)
+            try:
+                response = await responses.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                _current.reset(token)
+            self._on_response(response)
+            handed_over = time.perf_counter()
+            yield response
+            self.render_time += time.perf_counter() - handed_over
+        self.finish()
+
+    def _on_response(self, response: LLMResponse) -> None:
+        now = time.perf_counter()
+        if response.usage is not None:
+            self.add_usage(response.usage)
+        if not (response.content or response.reasoning or response.tool_call):
+            return
+        if self.first_token is None:
+            self.first_token = now
+        self.chunk_times.append(now)
+        self.output_chars += len(response.content) + len(response.reasoning or "")
+
+    def add_usage(self, usage: Usage) -> None:
+        self.input_tokens = (self.input_tokens or 0) + usage.prompt_tokens
+        self.output_tokens = (self.output_tokens or 0) + usage.completion_tokens
+        self.cached_tokens = (self.cached_tokens or 0) + usage.cached_tokens
+
+    def finish(self) -> None:
+        if self.end is None:
+            self.end = time.perf_counter()
+            if self.first_token is not None:
+                self.spans.append(Span("stream", self.first_token, self.end))
+
+    @property
+    def ttft(self) -> Optional[float]:
+        """Seconds from the request to the first content"""
+        return None if self.first_token is None else self.first_token - self.start
+
+    @property
+    def ttfb(self) -> Optional[float]:
+        """Seconds from the request to the response headers, when the shared HTTP client was used"""
+        received = self.marks.get("response_headers")
+        return None if received is None else received - self.start
+
+    def inter_token_latencies(self) -> List[float]:
+        return [b - a for a, b in zip(self.chunk_times, self.chunk_times[1:])]
+
+    def latency_histogram(self) -> Dict[str, int]:
+        """Inter-token latency counts per bucket, keyed by the bucket's upper bound in ms"""
+        histogram = {f"le_{bound}ms": 0 for bound in LATENCY_BUCKETS_MS}
+        histogram["inf"] = 0
+        for latency in self.inter_token_latencies():
+            ms = latency * 1000
+            key = next((f"le_{bound}ms" for bound in LATENCY_BUCKETS_MS if ms <= bound), "inf")
+            histogram[key] += 1
+        return histogram
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Output tokens per second of streaming, estimated from the text when there is no usage"""
+        if self.first_token is None or self.end is None or self.end <= self.first_token:
+            return None
+        tokens = self.output_tokens if self.output_tokens is not None else self.output_chars / CHARS_PER_TOKEN
+        return tokens / (self.end - self.first_token)
+
+    def phase_durations(self) -> Dict[str, float]:
+        """Total seconds per phase"""
+        durations: Dict[str, float] = {}
+        for span in self.spans:
+            durations[span.name] = durations.get(span.name, 0.0) + span.duration
+        if self.render_time:
+            durations["render"] = self.render_time
+        return durations
+
+    def to_dict(self) -> Dict[str, Any]:
+        def ms(seconds: Optional[float]) -> Optional[float]:
+            return None if seconds is None else round(seconds * 1000, 3)
+
+        end = self.end if self.end is not None else time.perf_counter()
+        tokens_per_second = self.tokens_per_second
+        return {
+            "provider": self.provider,
+            "model": self.model,
+            "timestamp": self.start_wall_ns / 1e9,
+            "total_ms": ms(end - self.start),
+            "ttfb_ms": ms(self.ttfb),
+            "ttft_ms": ms(self.ttft),
+            "phases_ms": {name: ms(duration) for name, duration in self.phase_durations().items()},
+            "chunks": len(self.chunk_times),
+            "inter_token_latency_ms": self.latency_histogram(),
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cached_tokens": self.cached_tokens,
+            "tokens_per_second": None if tokens_per_second is None else round(tokens_per_second, 2),
+        }
+
+    def summary(self) -> str:
+        """One line summary for verbose output"""
+        parts = [f"{self.provider}/{self.model}"]
+        if self.ttft is not None:
+            parts.append(f"ttft {self.ttft * 1000:.0f}ms")
+        if self.end is not None:
+            parts.append(f"total {(self.end - self.start) * 1000:.0f}ms")
+        if self.input_tokens is not None:
+            parts.append(f"tokens {self.input_tokens} in ({self.cached_tokens or 0} cached) / {self.output_tokens} out")
+        if self.tokens_per_second is not None:
+            parts.append(f"{self.tokens_per_second:.1f} tok/s")
+        parts.extend(f"{name} {duration * 1000:.1f}ms" for name, duration in self.phase_durations().items())
+        return ", ".join(parts)
+
+    def to_otlp_spans(self, trace_id: str, span_id: str) -> List[Dict[str, Any]]:
+        """The request and its phases as OTLP/JSON spans"""
+        import secrets
+
+        def unix_ns(t: float) -> str:
+            return str(self.start_wall_ns + int((t - self.start) * 1e9))
+
+        def attribute(key: str, value: Any) -> Dict[str, Any]:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return {"key": key, "value": {"stringValue": str(value)}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            return {"key": key, "value": {"doubleValue": value}}
+
+        attributes = {"gen_ai.system": self.provider, "gen_ai.request.model": self.model}
+        if self.input_tokens is not None:
+            attributes["gen_ai.usage.input_tokens"] = self.input_tokens
+        if self.output_tokens is not None:
+            attributes["gen_ai.usage.output_tokens"] = self.output_tokens
+        if self.cached_tokens:
+            attributes["gen_ai.usage.cache_read_input_tokens"] = self.cached_tokens
+        if self.ttft is not None:
+            attributes["yaicli.ttft_ms"] = round(self.ttft * 1000, 3)
+        if self.render_time:
+            attributes["yaicli.render_ms"] = round(self.render_time * 1000, 3)
+        end = self.end if self.end is not None else time.perf_counter()
+        spans = [
+            {
+                "traceId": trace_id,
+                "spanId": span_id,
+                "name": f"chat {self.model}",
+                "kind": 3,  # SPAN_KIND_CLIENT
+                "startTimeUnixNano": unix_ns(self.start),
+                "endTimeUnixNano": unix_ns(end),
+                "attributes": [attribute(k, v) for k, v in attributes.items()],
+            }
+        ]
+        for span in self.spans:
+            spans.append(
+                {
+                    "traceId": trace_id,
+                    "spanId": secrets.token_hex(8),
+                    "parentSpanId": span_id,
+                    "name": span.name,
+                    "kind": 1,  # SPAN_KIND_INTERNAL
+                    "startTimeUnixNano": unix_ns(span.start),
+                    "endTimeUnixNano": unix_ns(span.end),
+                }
+            )
+        return spans
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    """Metrics of the provider request running in this context"""
+    return _current.get()
+
+
+@contextmanager
+def span(name: str) -> Generator[None, None, None]:
+    """Record the block as a span of the current request, if there is one"""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.span(name):
+        yield
+
+
+def mark(name: str) -> None:
+    """Record the time of an event in the current request, the first occurrence counts"""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.marks.setdefault(name, time.perf_counter())
+
+
+class MetricsExporter:
+    """Writes finished request metrics to a JSON lines file and/or an OTLP/HTTP collector"""
+
+    def __init__(self, path: str = "", otlp_endpoint: str = ""):
+        self.path = Path(path).expanduser() if path else None
+        self.otlp_endpoint = otlp_endpoint.rstrip("/")
+        self._lock = threading.Lock()
+        self._write_warned = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path or self.otlp_endpoint)
+
+    def export(self, metrics: RequestMetrics) -> None:
+        """Export the metrics of a finished request"""
+        if self.path:
+            self._write_json_line(metrics)
+        if self.otlp_endpoint:
+            # Don't hold up the response, the thread finishes before exit
+            threading.Thread(target=self._send_otlp, args=(metrics,), name="yaicli-otlp").start()
+
+    def _write_json_line(self, metrics: RequestMetrics) -> None:
+        line = json.dumps(metrics.to_dict()) + "\n"
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)  # type: ignore[union-attr]
+                with open(self.path, "a", encoding="utf-8") as f:  # type: ignore[arg-type]
+                    f.write(line)
+            except OSError as e:
+                # Telemetry must never break a request, warn once per exporter
+                if not self._write_warned:
+                    self._write_warned = True
+                    get_console().print(f"Cannot write metrics to {self.path}: {e}", style="dim")
+
+    def _send_otlp(self, metrics: RequestMetrics) -> None:
+        import secrets
+
+        import httpx
+
+        spans = metrics.to_otlp_spans(secrets.token_hex(16), secrets.token_hex(8))
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "yaicli"}}]},
+                    "scopeSpans": [{"scope": {"name": "yaicli"}, "spans": spans}],
+                }
+            ]
+        }
+        try:
+            httpx.post(f"{self.otlp_endpoint}/v1/traces", json=payload, timeout=2)
+        except httpx.HTTPError:
+            # Telemetry must never break a request
+            pass
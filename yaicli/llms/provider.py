@@ -1,13 +1,27 @@
 import importlib
 import warnings
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, AsyncGenerator, Dict, Generator, Iterator, List, Optional, TypeVar
 
 from ..schemas import ChatMessage, LLMResponse, ToolPolicy
 from ..utils import option_callback
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+T = TypeVar("T")
+_EXHAUSTED = object()
+
+
+async def iterate_in_thread(iterator: Iterator[T]) -> AsyncGenerator[T, None]:
+    """Iterate a blocking iterator in worker threads without blocking the event loop"""
+    import asyncio
+
+    while True:
+        item = await asyncio.to_thread(next, iterator, _EXHAUSTED)
+        if item is _EXHAUSTED:
+            return
+        yield item  # type: ignore[misc]
+
 
 class Provider(ABC):
     """Base abstract class for LLM providers"""
@@ -34,6 +48,21 @@ class Provider(ABC):
         """
         pass
 
+    async def acompletion(
+        self,
+        messages: List[ChatMessage],
+        stream: bool = False,
+        tool_policy: Optional[ToolPolicy] = None,
+    ) -> AsyncGenerator[LLMResponse, None]:
+        """
+        Async counterpart of `completion`
+
+        Providers with an async SDK client override this; the default runs the
+        synchronous `completion` in worker threads.
+        """
+        async for response in iterate_in_thread(self.completion(messages, stream=stream, tool_policy=tool_policy)):
+            yield response
+
     @abstractmethod
     def detect_tool_role(self) -> str:
         """Return the role that should be used for tool responses"""
@@ -193,6 +222,7 @@ class ProviderFactory:
         "openai-azure": (".providers.openai_provider", "OpenAIAzure"),
         "openai-compatible": (".providers.openai_compatible_provider", "OpenAICompatibleProvider"),
         "openrouter": (".providers.openrouter_provider", "OpenRouterProvider"),
+        "router": (".providers.router_provider", "RouterProvider"),
         "sambanova": (".providers.sambanova_provider", "SambanovaProvider"),
         "siliconflow": (".providers.siliconflow_provider", "SiliconFlowProvider"),
         "spark": (".providers.spark_provider", "SparkProvider"),
@@ -67,6 +67,7 @@ class AI21Provider(OpenAIProvider):
                 content=content,
                 tool_call=tool_call if finish_reason == "tool_calls" else None,
                 finish_reason=finish_reason,
+                usage=self._get_chunk_usage(chunk),
             )
 
     def _process_tool_call_chunk(self, tool_calls, existing_tool_call=None):
@@ -1,17 +1,47 @@
 import json
+from dataclasses import dataclass
+from functools import cached_property
 from os import getenv
-from typing import Any, Dict, Generator, List, Optional, Tuple, cast
-
-from anthropic import Anthropic, AnthropicBedrock, AnthropicVertex, Stream
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional, Tuple, cast
+
+from anthropic import (
+    Anthropic,
+    AnthropicBedrock,
+    AnthropicVertex,
+    AsyncAnthropic,
+    AsyncAnthropicBedrock,
+    AsyncAnthropicVertex,
+    AsyncStream,
+    Stream,
+)
 from anthropic.types import InputJSONDelta, Message, TextDelta
 from anthropic.types.raw_message_stream_event import RawMessageStreamEvent
 from json_repair import repair_json
 
 from ...config import cfg
 from ...console import get_console
+from ...const import DEFAULT_PROMPT_CACHE
 from ...exceptions import ConfigMissingError, MCPToolsError
-from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy
+from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy, Usage
+from ...utils import str2bool
+from ..capabilities import get_provider_capabilities
+from ..metrics import span
 from ..provider import Provider
+from ..transport import get_async_http_client, get_http_client
+
+
+@dataclass
+class _StreamState:
+    """Data carried across the events of one streaming response"""
+
+    tool_call_id: str = ""
+    tool_call_name: str = ""
+    tool_call_input: str = ""
+    usage: Optional[Usage] = None
+
+
+# Marks the end of a cacheable prompt prefix, the API allows 4 per request
+CACHE_CONTROL = {"type": "ephemeral"}
 
 
 class AnthropicProvider(Provider):
@@ -19,6 +49,7 @@ class AnthropicProvider(Provider):
 
     DEFAULT_BASE_URL = "https://api.anthropic.com"
     CLIENT_CLS = Anthropic
+    ASYNC_CLIENT_CLS: Optional[type] = AsyncAnthropic
     # Base mapping between config keys and API parameter names
     COMPLETION_PARAMS_KEYS = {
         "model": "MODEL",
@@ -45,12 +76,23 @@ class AnthropicProvider(Provider):
         self.client = self.CLIENT_CLS(**self.client_params)
         self.console = get_console()
 
+    @cached_property
+    def async_client(self) -> Any:
+        """Async SDK client, created on first use"""
+        assert self.ASYNC_CLIENT_CLS is not None
+        params = dict(self.client_params)
+        if "http_client" in params:
+            # Created in `acompletion`, so it gets the pooled async http client of the running loop
+            params["http_client"] = get_async_http_client(self.config)
+        return self.ASYNC_CLIENT_CLS(**params)
+
     def get_client_params(self) -> Dict[str, Any]:
         """Get the client parameters"""
         # Initialize client params
         client_params = {
             "api_key": self.config["API_KEY"],
             "default_headers": {"X-Title": self.APP_NAME, "HTTP_Referer": self.APP_REFERER},
+            "http_client": get_http_client(self.config),
         }
 
         # Add base URL if configured
@@ -120,7 +162,57 @@ class AnthropicProvider(Provider):
             ValueError: If messages is empty or invalid
             anthropic.APIError: If API request fails
         """
-        anthropic_messages = self._convert_messages(messages)
+        params = self._build_request_params(messages, stream, tool_policy)
+        try:
+            if stream:
+                response = self.client.messages.create(**params)
+                yield from self._handle_stream_response(response)
+            else:
+                response = self.client.messages.create(**params)
+                yield from self._handle_normal_response(response)
+        except Exception as e:
+            self.console.print(f"Error: {e}", style="red")
+            raise
+
+    async def acompletion(
+        self,
+        messages: List[ChatMessage],
+        stream: bool = False,
+        tool_policy: Optional[ToolPolicy] = None,
+    ) -> AsyncGenerator[LLMResponse, None]:
+        """Send completion request with the async client, see `completion`"""
+        cls = type(self)
+        if (
+            self.ASYNC_CLIENT_CLS is None
+            or cls.completion is not AnthropicProvider.completion
+            or cls._handle_stream_response is not AnthropicProvider._handle_stream_response
+        ):
+            # Customized in a subclass for the sync path only
+            async for llm_response in super().acompletion(messages, stream=stream, tool_policy=tool_policy):
+                yield llm_response
+            return
+
+        params = self._build_request_params(messages, stream, tool_policy)
+        try:
+            response = await self.async_client.messages.create(**params)
+            if stream:
+                state = _StreamState()
+                async for chunk in cast(AsyncStream[RawMessageStreamEvent], response):
+                    for llm_response in self._handle_stream_event(chunk, state):
+                        yield llm_response
+            else:
+                for llm_response in self._handle_normal_response(response):
+                    yield llm_response
+        except Exception as e:
+            self.console.print(f"Error: {e}", style="red")
+            raise
+
+    def _build_request_params(
+        self, messages: List[ChatMessage], stream: bool, tool_policy: Optional[ToolPolicy]
+    ) -> Dict[str, Any]:
+        """Build the messages request parameters"""
+        with span("convert_messages"):
+            anthropic_messages = self._convert_messages(messages)
 
         params = self.get_completion_params()
         system_prompt, system_prompt_index = self._extract_system_prompt(messages)
@@ -132,30 +224,17 @@ class AnthropicProvider(Provider):
         effective_tool_policy = self.resolve_tool_policy(tool_policy)
 
         # Add tools if enabled
-        tools = []
-        if effective_tool_policy.enable_functions:
-            try:
-                from ...tools import get_anthropic_schemas
-
-                tools.extend(get_anthropic_schemas())
-            except ImportError:
-                self.console.print("Function tools not available for Anthropic", style="yellow")
-
-        if effective_tool_policy.enable_mcp:
-            try:
-                from ...tools import get_anthropic_mcp_tools
-
-                mcp_tools = get_anthropic_mcp_tools()
-                tools.extend(mcp_tools)
-            except (ValueError, FileNotFoundError, MCPToolsError, ImportError) as e:
-                self.console.print(f"Failed to load MCP tools: {e}", style="red")
-
+        with span("tools"):
+            tools = self._get_tools(effective_tool_policy)
         if tools:
             params["tools"] = tools
-            # Disable parallel tool use by default for better compatibility
-            disable_parallel = self.config.get("DISABLE_PARALLEL_TOOL_USE", True)
+            # Several tool calls of one response are executed concurrently by the client
+            disable_parallel = self.config.get("DISABLE_PARALLEL_TOOL_USE", False)
             params["tool_choice"] = {"type": "auto", "disable_parallel_tool_use": disable_parallel}
 
+        if self._prompt_caching():
+            self._add_cache_breakpoints(params, messages, system_prompt_index)
+
         if self.verbose:
             self.console.print("System prompt:", params["system"])
             self.console.print("Messages:")
@@ -167,17 +246,88 @@ class AnthropicProvider(Provider):
             if params.get("extra_body"):
                 self.console.print("Extra body:")
                 self.console.print(params["extra_body"])
+        return params
+
+    def _prompt_caching(self) -> bool:
+        """Whether to mark cacheable prompt prefixes, compatible APIs may not support it"""
+        if not str2bool(self.config.get("PROMPT_CACHE", DEFAULT_PROMPT_CACHE)):
+            return False
+        return get_provider_capabilities(self.config.get("PROVIDER") or "anthropic").prompt_caching
+
+    def _add_cache_breakpoints(
+        self, params: Dict[str, Any], messages: List[ChatMessage], system_prompt_index: Optional[int]
+    ) -> None:
+        """Mark the stable prompt prefixes as cacheable.
+
+        The cache is read for the longest marked prefix a previous request wrote, in the
+        order tools, system, messages. Marked are the system prompt (or the tools without
+        one), the end of the context messages following it, the end of the history before
+        the current turn and the last message. Transient messages sent only with the current
+        turn, e.g. @ file references, are never part of a marked prefix but the last one.
+        """
+        if params.get("system"):
+            # Covers the tools too, they come first
+            params["system"] = [{"type": "text", "text": params["system"], "cache_control": CACHE_CONTROL}]
+        elif params.get("tools"):
+            params["tools"][-1] = {**params["tools"][-1], "cache_control": CACHE_CONTROL}
+
+        converted = params["messages"]
+        if not converted:
+            return
+        breakpoints = {len(converted) - 1}
+        # Context messages directly follow the system prompt, before any tool result is merged
+        if system_prompt_index is not None:
+            context_end = system_prompt_index
+            while (
+                context_end + 1 < len(messages) - 1
+                and messages[context_end + 1].role == "system"
+                and not messages[context_end + 1].transient
+            ):
+                context_end += 1
+            if context_end > system_prompt_index:
+                breakpoints.add(context_end - 1)
+        # The current turn is the last message and the transient messages sent with it
+        turn_start = len(messages) - 1
+        while turn_start > 0 and messages[turn_start - 1].transient:
+            turn_start -= 1
+        breakpoints.add(len(converted) - 1 - (len(messages) - turn_start))
+        for index in sorted(breakpoints):
+            if index >= 0:
+                converted[index] = self._with_cache_control(converted[index])
+
+    @staticmethod
+    def _with_cache_control(message: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of the message with its last content block marked as cacheable"""
+        content = message["content"]
+        if isinstance(content, str):
+            if not content:
+                # Empty text blocks are rejected
+                return message
+            content = [{"type": "text", "text": content}]
+        if not content:
+            return message
+        return {**message, "content": [*content[:-1], {**content[-1], "cache_control": CACHE_CONTROL}]}
+
+    def _get_tools(self, tool_policy: ToolPolicy) -> List[Dict[str, Any]]:
+        """Function and MCP tool schemas allowed by the tool policy"""
+        tools = []
+        if tool_policy.enable_functions:
+            try:
+                from ...tools import get_anthropic_schemas
 
-        try:
-            if stream:
-                response = self.client.messages.create(**params)
-                yield from self._handle_stream_response(response)
-            else:
-                response = self.client.messages.create(**params)
-                yield from self._handle_normal_response(response)
-        except Exception as e:
-            self.console.print(f"Error: {e}", style="red")
-            raise
+                tools.extend(get_anthropic_schemas())
+            except ImportError:
+                self.console.print("Function tools not available for Anthropic", style="yellow")
+
+        if tool_policy.enable_mcp:
+            try:
+                from ...tools import get_anthropic_mcp_tools
+
+                mcp_tools = get_anthropic_mcp_tools()
+                tools.extend(mcp_tools)
+            except (ValueError, FileNotFoundError, MCPToolsError, ImportError) as e:
+                self.console.print(f"Failed to load MCP tools: {e}", style="red")
+        return tools
 
     def _extract_system_prompt(self, messages: List[ChatMessage]) -> Tuple[Optional[str], Optional[int]]:
         """Extract system prompt from messages"""
@@ -188,14 +338,15 @@ class AnthropicProvider(Provider):
 
     def _handle_normal_response(self, response: Message) -> Generator[LLMResponse, None, None]:
         """Handle normal (non-streaming) response"""
+        usage = self._get_usage(getattr(response, "usage", None))
         if not response.content:
-            yield LLMResponse(content=json.dumps(response.model_dump()), finish_reason="stop")
+            yield LLMResponse(content=json.dumps(response.model_dump()), finish_reason="stop", usage=usage)
             return
 
         # Extract content from all blocks in a single pass
         text_content = ""
         thinking_content = ""
-        tool_call: Optional[ToolCall] = None
+        tool_calls: List[ToolCall] = []
 
         for block in response.content:
             if block.type == "text" and hasattr(block, "text"):
@@ -205,15 +356,21 @@ class AnthropicProvider(Provider):
                 thinking_content += getattr(block, "thinking", "")
             elif block.type == "tool_use":
                 # Handle tool use blocks
-                tool_call = ToolCall(
-                    id=getattr(block, "id", ""),
-                    name=block.name,
-                    # String input is already valid JSON, no need to convert
-                    arguments=block.input if isinstance(block.input, str) else json.dumps(block.input),
+                tool_calls.append(
+                    ToolCall(
+                        id=getattr(block, "id", ""),
+                        name=block.name,
+                        # String input is already valid JSON, no need to convert
+                        arguments=block.input if isinstance(block.input, str) else json.dumps(block.input),
+                    )
                 )
 
         # Get stop reason
         finish_reason = response.stop_reason or "stop"
+        # All but the last tool call are yielded on their own
+        for tool_call in tool_calls[:-1]:
+            yield LLMResponse(content="", tool_call=tool_call)
+        tool_call = tool_calls[-1] if tool_calls else None
 
         # Yield response with all content types
         yield LLMResponse(
@@ -221,71 +378,101 @@ class AnthropicProvider(Provider):
             content=text_content,
             finish_reason=finish_reason,
             tool_call=tool_call,
+            usage=usage,
+        )
+
+    def _get_usage(self, usage: Any) -> Optional[Usage]:
+        """Convert the usage of a message, input tokens exclude those read from or written to the cache"""
+        if usage is None:
+            return None
+
+        def count(name: str) -> int:
+            value = getattr(usage, name, None)
+            return value if isinstance(value, int) else 0
+
+        cache_read = count("cache_read_input_tokens")
+        return Usage(
+            prompt_tokens=count("input_tokens") + cache_read + count("cache_creation_input_tokens"),
+            completion_tokens=count("output_tokens"),
+            cached_tokens=cache_read,
         )
 
     def _handle_stream_response(self, response: Stream[RawMessageStreamEvent]) -> Generator[LLMResponse, None, None]:
         """Handle streaming response from Anthropic API"""
-        tool_call: Optional[ToolCall] = None
-        tool_call_id = ""
-        tool_call_name = ""
-        tool_call_input = ""
-
+        state = _StreamState()
         # Process each chunk in the response stream
         for chunk in response:
-            # Handle different event types
-            if chunk.type == "message_start":
-                # Message start, no need to handle
-                continue
-
-            elif chunk.type == "content_block_start":
-                # Content block start
-                if hasattr(chunk, "content_block") and getattr(chunk.content_block, "type", "") == "tool_use":
-                    # Tool call block - initialize tool call data
-                    tool_data = chunk.content_block
-                    tool_call_id = getattr(tool_data, "id", "")
-                    tool_call_name = getattr(tool_data, "name", "")
-                    tool_call_input = ""  # Will be built incrementally
-
-            elif chunk.type == "content_block_delta":
-                # Content delta update
-                if hasattr(chunk, "delta"):
-                    delta = chunk.delta
-
-                    # Handle text delta
-                    if hasattr(delta, "text"):
-                        delta = cast(TextDelta, delta)
-                        content = delta.text or ""
-                        if content:
-                            yield LLMResponse(content=content, tool_call=None)
-
-                    # Handle tool call input delta
-                    elif hasattr(delta, "partial_json"):
-                        delta = cast(InputJSONDelta, delta)
-                        tool_call_input += delta.partial_json or ""
-
-            elif chunk.type == "content_block_stop":
-                # Content block stop - finalize tool call if it exists
-                if tool_call_id and tool_call_name:
-                    tool_call = ToolCall(
-                        id=tool_call_id,
-                        name=tool_call_name,
-                        arguments=repair_json(tool_call_input),
-                    )
-                    # Reset tool call data
-                    tool_call_id = ""
-                    tool_call_name = ""
-                    tool_call_input = ""
-
-            elif chunk.type == "message_delta":
-                # Message delta update - contains stop reason
-                if hasattr(chunk, "delta") and hasattr(chunk.delta, "stop_reason"):
-                    finish_reason = chunk.delta.stop_reason
-                    if finish_reason:
-                        yield LLMResponse(content="", finish_reason=finish_reason, tool_call=tool_call)
-
-            elif chunk.type == "message_stop":
-                # Message stop - final response
-                yield LLMResponse(content="", finish_reason="stop", tool_call=tool_call)
+            yield from self._handle_stream_event(chunk, state)
+
+    def _handle_stream_event(
+        self, chunk: RawMessageStreamEvent, state: _StreamState
+    ) -> Generator[LLMResponse, None, None]:
+        """Handle one event of a streaming response"""
+        # Handle different event types
+        if chunk.type == "message_start":
+            # Message start, only carries the input usage
+            state.usage = self._get_usage(getattr(getattr(chunk, "message", None), "usage", None))
+            return
+
+        elif chunk.type == "content_block_start":
+            # Content block start
+            if hasattr(chunk, "content_block") and getattr(chunk.content_block, "type", "") == "tool_use":
+                # Tool call block - initialize tool call data
+                tool_data = chunk.content_block
+                state.tool_call_id = getattr(tool_data, "id", "")
+                state.tool_call_name = getattr(tool_data, "name", "")
+                state.tool_call_input = ""  # Will be built incrementally
+
+        elif chunk.type == "content_block_delta":
+            # Content delta update
+            if hasattr(chunk, "delta"):
+                delta = chunk.delta
+
+                # Handle text delta
+                if hasattr(delta, "text"):
+                    delta = cast(TextDelta, delta)
+                    content = delta.text or ""
+                    if content:
+                        yield LLMResponse(content=content, tool_call=None)
+
+                # Handle tool call input delta
+                elif hasattr(delta, "partial_json"):
+                    delta = cast(InputJSONDelta, delta)
+                    state.tool_call_input += delta.partial_json or ""
+
+        elif chunk.type == "content_block_stop":
+            # Content block stop - a tool call is complete, yield it right away so it can start early
+            if state.tool_call_id and state.tool_call_name:
+                tool_call = ToolCall(
+                    id=state.tool_call_id,
+                    name=state.tool_call_name,
+                    arguments=repair_json(state.tool_call_input),
+                )
+                yield LLMResponse(content="", tool_call=tool_call)
+                # Reset tool call data
+                state.tool_call_id = ""
+                state.tool_call_name = ""
+                state.tool_call_input = ""
+
+        elif chunk.type == "message_delta":
+            # Message delta update - contains stop reason and the cumulative usage
+            final_usage = self._get_usage(getattr(chunk, "usage", None))
+            if final_usage is not None:
+                start_usage = state.usage or Usage()
+                # Input counts are only repeated here by newer API versions
+                state.usage = Usage(
+                    prompt_tokens=final_usage.prompt_tokens or start_usage.prompt_tokens,
+                    completion_tokens=final_usage.completion_tokens,
+                    cached_tokens=final_usage.cached_tokens or start_usage.cached_tokens,
+                )
+            if hasattr(chunk, "delta") and hasattr(chunk.delta, "stop_reason"):
+                finish_reason = chunk.delta.stop_reason
+                if finish_reason:
+                    yield LLMResponse(content="", finish_reason=finish_reason, usage=state.usage)
+
+        elif chunk.type == "message_stop":
+            # Message stop - final response
+            yield LLMResponse(content="", finish_reason="stop")
 
     def detect_tool_role(self) -> str:
         """Return the role that should be used for tool responses"""
@@ -301,7 +488,10 @@ class AnthropicProvider(Provider):
 
             # Handle regular messages
             if msg.role != "tool":
-                message: Dict[str, Any] = {"role": msg.role, "content": msg.content or ""}
+                # Only the system prompt is sent as `system`, other system messages such as the
+                # context are sent as user messages, there is no system role in messages
+                role = "user" if msg.role == "system" else msg.role
+                message: Dict[str, Any] = {"role": role, "content": msg.content or ""}
 
                 # Handle tool calls in assistant messages
                 if msg.role == "assistant" and msg.tool_calls:
@@ -364,6 +554,7 @@ class AnthropicBedrockProvider(AnthropicProvider):
     """Anthropic Bedrock provider implementation based on anthropic library"""
 
     CLIENT_CLS = AnthropicBedrock
+    ASYNC_CLIENT_CLS = AsyncAnthropicBedrock
     CLIENT_PARAMS_KEY_ENV_MAP = {
         "AWS_SECRET_ACCESS_KEY": "AWS_SECRET_ACCESS_KEY",
         "AWS_ACCESS_KEY_ID": "AWS_ACCESS_KEY_ID",
@@ -407,6 +598,7 @@ class AnthropicVertexProvider(AnthropicProvider):
     """Anthropic Vertex provider implementation based on anthropic library"""
 
     CLIENT_CLS = AnthropicVertex
+    ASYNC_CLIENT_CLS = AsyncAnthropicVertex
     CLIENT_PARAMS_KEY_ENV_MAP = {
         "PROJECT_ID": "PROJECT_ID",
         "CLOUD_ML_REGION": "CLOUD_ML_REGION",
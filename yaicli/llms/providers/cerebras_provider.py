@@ -1,6 +1,6 @@
 from typing import Any, Dict, List, Optional
 
-from cerebras.cloud.sdk import Cerebras
+from cerebras.cloud.sdk import AsyncCerebras, Cerebras
 
 from ...schemas import ToolPolicy
 from .openai_provider import OpenAIProvider
@@ -10,6 +10,7 @@ class CerebrasProvider(OpenAIProvider):
     """Cerebras LLM provider"""
 
     CLIENT_CLS = Cerebras
+    ASYNC_CLIENT_CLS = AsyncCerebras
     DEFAULT_BASE_URL = "https://api.cerebras.ai"
 
     COMPLETION_PARAMS_KEYS = {
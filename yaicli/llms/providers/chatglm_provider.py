@@ -70,7 +70,13 @@ class ChatglmProvider(OpenAIProvider):
                 tool = choice.message.tool_calls[0]  # type: ignore
                 tool_call = ToolCall(tool.id, tool.function.name or "", tool.function.arguments)
 
-        yield LLMResponse(reasoning=reasoning, content=content, finish_reason=finish_reason, tool_call=tool_call)
+        yield LLMResponse(
+            reasoning=reasoning,
+            content=content,
+            finish_reason=finish_reason,
+            tool_call=tool_call,
+            usage=self._get_usage(getattr(response, "usage", None)),
+        )
 
     def _handle_stream_response(self, response: Stream[ChatCompletionChunk]) -> Generator[LLMResponse, None, None]:
         """Handle streaming response
@@ -122,7 +128,13 @@ class ChatglmProvider(OpenAIProvider):
                     tool_call_name = tool.function.name or ""
                     arguments += tool.function.arguments or ""
                 tool_call = ToolCall(tool_id, tool_call_name, arguments)
-            yield LLMResponse(reasoning=reasoning, content=content, tool_call=tool_call, finish_reason=finish_reason)
+            yield LLMResponse(
+                reasoning=reasoning,
+                content=content,
+                tool_call=tool_call,
+                finish_reason=finish_reason,
+                usage=self._get_chunk_usage(chunk),
+            )
 
     @overload
     def parse_choice_from_content(self, content: str, choice_class: type[ChoiceChunk] = ChoiceChunk) -> "ChoiceChunk":
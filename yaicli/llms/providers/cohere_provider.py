@@ -15,9 +15,10 @@ from cohere.types.tool_call_v2function import ToolCallV2Function
 
 from ...config import cfg
 from ...console import get_console
-from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy
+from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy, Usage
 from ...tools import get_openai_schemas
 from ..provider import Provider
+from ..transport import get_http_client
 
 
 class CohereProvider(Provider):
@@ -51,6 +52,7 @@ class CohereProvider(Provider):
         """Create and return Cohere client instance"""
         if self.config.get("ENVIRONMENT"):
             self.client_params["environment"] = self.config["ENVIRONMENT"]
+        self.client_params["httpx_client"] = get_http_client(self.config)
         return self.CLIENT_CLS(**self.client_params)
 
     def detect_tool_role(self) -> str:
@@ -191,6 +193,28 @@ class CohereProvider(Provider):
                 # End of a tool call, empty chunk
                 yield LLMResponse(tool_call=tool_call)
 
+            elif chunk.type == "message-end":
+                # End of the message, carries the usage
+                usage = self._get_usage(getattr(getattr(chunk, "delta", None), "usage", None))
+                if usage is not None:
+                    yield LLMResponse(usage=usage)
+
+    @staticmethod
+    def _get_usage(usage) -> Optional[Usage]:
+        """Convert the usage of a response, None if it has no counts"""
+        tokens = getattr(usage, "tokens", None)
+        if tokens is None:
+            return None
+
+        def count(name: str) -> int:
+            # Counts are floats in the SDK types
+            value = getattr(tokens, name, None)
+            return int(value) if isinstance(value, (int, float)) else 0
+
+        if not count("input_tokens") and not count("output_tokens"):
+            return None
+        return Usage(prompt_tokens=count("input_tokens"), completion_tokens=count("output_tokens"))
+
     def _handle_normal_response(self, response) -> Generator[LLMResponse, None, None]:
         """
         Process non-streaming response from Cohere API
@@ -219,6 +243,10 @@ class CohereProvider(Provider):
                     )
                 )
 
+        usage = self._get_usage(getattr(response, "usage", None))
+        if usage is not None:
+            yield LLMResponse(usage=usage)
+
     def completion(
         self,
         messages: List[ChatMessage],
@@ -1,8 +1,9 @@
 from typing import Any, Dict, Optional
 
-from volcenginesdkarkruntime import Ark
+from volcenginesdkarkruntime import Ark, AsyncArk
 
 from ...schemas import ToolPolicy
+from ..transport import get_http_client
 from .openai_provider import OpenAIProvider
 
 
@@ -11,10 +12,14 @@ class DoubaoProvider(OpenAIProvider):
 
     DEFAULT_BASE_URL = "https://ark.cn-beijing.volces.com/api/v3"
     CLIENT_CLS = Ark
+    ASYNC_CLIENT_CLS = AsyncArk
 
     def get_client_params(self) -> Dict[str, Any]:
         # Initialize client params
-        client_params = {"base_url": self.DEFAULT_BASE_URL}
+        client_params: Dict[str, Any] = {
+            "base_url": self.DEFAULT_BASE_URL,
+            "http_client": get_http_client(self.config),
+        }
         if self.config.get("API_KEY", None):
             client_params["api_key"] = self.config["API_KEY"]
         if self.config.get("BASE_URL", None):
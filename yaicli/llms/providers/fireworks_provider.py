@@ -23,6 +23,7 @@ class FireworksProvider(OpenAIProvider):
     """
 
     CLIENT_CLS = Fireworks
+    ASYNC_CLIENT_CLS = None
     DEFAULT_BASE_URL = "https://api.fireworks.ai/inference/v1"
 
     COMPLETION_PARAMS_KEYS = {
@@ -41,6 +42,8 @@ class FireworksProvider(OpenAIProvider):
         """
         client_params = super().get_client_params()
         client_params["extra_headers"] = client_params.pop("default_headers")
+        # The Fireworks SDK manages its own connections
+        client_params.pop("http_client")
         # In Fireworks, account can be set to "fireworks" or "fireworks-dev"
         client_params["account"] = self.config.get("ACCOUNT", "fireworks")
         client_params["timeout"] = self.config["TIMEOUT"]
@@ -1,6 +1,7 @@
 import base64
 import json
-from typing import Any, Callable, Dict, Generator, List
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, List, Optional, Tuple
 from uuid import uuid4
 
 import google.genai as genai
@@ -10,9 +11,22 @@ from yaicli.tools.mcp import get_mcp_manager
 
 from ...config import cfg
 from ...console import get_console
-from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy
+from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy, Usage
 from ...tools.function import get_functions_gemini_format
+from ..metrics import span
 from ..provider import Provider
+from ..transport import get_http_transport
+
+
+@dataclass
+class _StreamState:
+    """Function calls accumulated across the chunks of one streaming response"""
+
+    pending_calls: List[Tuple[str, dict]] = field(default_factory=list)
+    current_fc_name: Optional[str] = None
+    current_fc_args: dict = field(default_factory=dict)
+    # Usage metadata is cumulative, the last chunk has the totals
+    usage: Optional[Usage] = None
 
 
 class GeminiProvider(Provider):
@@ -28,6 +42,10 @@ class GeminiProvider(Provider):
 
         # Initialize client
         self.client_params = self.get_client_params()
+        transport = get_http_transport(self.config)
+        if transport is not None:
+            # Share the pooled connections of the other providers
+            self.client_params.setdefault("http_options", {"client_args": {"transport": transport}})
         self.client = genai.Client(**self.client_params)
         self.console = get_console()
 
@@ -186,13 +204,8 @@ class GeminiProvider(Provider):
             ValueError: If messages is empty or invalid
             APIError: If API request fails
         """
-        gemini_messages = self._convert_messages(messages)
-        if self.verbose:
-            self.console.print("Messages:")
-            self.console.print(gemini_messages)
-        chat_config = self.get_chat_config(tool_policy=tool_policy)
-        chat_config.system_instruction = messages[0].content
-        chat = self.client.chats.create(model=self.config["MODEL"], history=gemini_messages, config=chat_config)  # type: ignore
+        chat_params = self._build_chat_params(messages, tool_policy)
+        chat = self.client.chats.create(**chat_params)
         message = messages[-1].content
 
         if stream:
@@ -202,6 +215,40 @@ class GeminiProvider(Provider):
             response = chat.send_message(message=message)  # type: ignore
             yield from self._handle_normal_response(response)
 
+    async def acompletion(
+        self,
+        messages: List[ChatMessage],
+        stream: bool = False,
+        tool_policy: ToolPolicy | None = None,
+    ) -> AsyncGenerator[LLMResponse, None]:
+        """Send completion request with the async client, see `completion`"""
+        chat_params = self._build_chat_params(messages, tool_policy)
+        chat = self.client.aio.chats.create(**chat_params)
+        message = messages[-1].content
+
+        if stream:
+            state = _StreamState()
+            async for chunk in await chat.send_message_stream(message=message):  # type: ignore
+                for llm_response in self._handle_stream_chunk(chunk, state):
+                    yield llm_response
+            for llm_response in self._finish_stream(state):
+                yield llm_response
+        else:
+            response = await chat.send_message(message=message)  # type: ignore
+            for llm_response in self._handle_normal_response(response):
+                yield llm_response
+
+    def _build_chat_params(self, messages: List[ChatMessage], tool_policy: ToolPolicy | None) -> Dict[str, Any]:
+        """Build the parameters to create a chat session"""
+        with span("convert_messages"):
+            gemini_messages = self._convert_messages(messages)
+        if self.verbose:
+            self.console.print("Messages:")
+            self.console.print(gemini_messages)
+        chat_config = self.get_chat_config(tool_policy=tool_policy)
+        chat_config.system_instruction = messages[0].content
+        return {"model": self.config["MODEL"], "history": gemini_messages, "config": chat_config}
+
     @staticmethod
     def _normalize_fc_args(args: dict) -> dict:
         """Normalize function call arguments from proxy format.
@@ -219,12 +266,35 @@ class GeminiProvider(Provider):
                 pass
         return args
 
+    @staticmethod
+    def _get_usage(response) -> Optional[Usage]:
+        """Convert the usage metadata of a response or chunk, None if it has no counts"""
+        metadata = getattr(response, "usage_metadata", None)
+        if metadata is None:
+            return None
+
+        def count(name: str) -> int:
+            value = getattr(metadata, name, None)
+            return value if isinstance(value, int) else 0
+
+        if not count("prompt_token_count") and not count("candidates_token_count"):
+            return None
+        # Candidate tokens don't include the thinking tokens
+        return Usage(
+            prompt_tokens=count("prompt_token_count"),
+            completion_tokens=count("candidates_token_count") + count("thoughts_token_count"),
+            cached_tokens=count("cached_content_token_count"),
+            reasoning_tokens=count("thoughts_token_count"),
+        )
+
     def _handle_normal_response(self, response) -> Generator[LLMResponse, None, None]:
         """Handle normal (non-streaming) response"""
+        usage = self._get_usage(response)
         if not response or not response.candidates:
             yield LLMResponse(
                 content=json.dumps(response.to_json_dict()),
                 finish_reason="stop",
+                usage=usage,
             )
             return
         for part in response.candidates[0].content.parts:
@@ -246,6 +316,8 @@ class GeminiProvider(Provider):
                 yield LLMResponse(reasoning=part.text, finish_reason="stop")
             else:
                 yield LLMResponse(reasoning=None, content=part.text, finish_reason="stop")
+        if usage is not None:
+            yield LLMResponse(usage=usage)
 
     def _handle_stream_response(self, response) -> Generator[LLMResponse, None, None]:
         """Handle streaming response from Gemini API.
@@ -255,53 +327,58 @@ class GeminiProvider(Provider):
         streaming and yield the complete ToolCall at the end, following the same
         pattern as OpenAI/Anthropic providers.
         """
-        # Accumulate function calls across streaming chunks
-        pending_calls: list[tuple[str, dict]] = []
-        current_fc_name: str | None = None
-        current_fc_args: dict = {}
-
+        state = _StreamState()
         for chunk in response:
-            if not chunk.candidates:
-                continue
-            candidate = chunk.candidates[0]
-            finish_reason = candidate.finish_reason
-            for part in chunk.candidates[0].content.parts:
-                if part.function_call:
-                    fc = part.function_call
-                    name = fc.name or current_fc_name
-                    if not name:
-                        continue
-                    if name != current_fc_name:
-                        # New function call; save the previous one if any
-                        if current_fc_name:
-                            pending_calls.append((current_fc_name, current_fc_args))
-                        current_fc_name = name
-                        current_fc_args = {}
-                    # Accumulate args: concatenate string values for the same key
-                    for key, value in (fc.args or {}).items():
-                        if key in current_fc_args and isinstance(value, str) and isinstance(current_fc_args[key], str):
-                            current_fc_args[key] += value
-                        else:
-                            current_fc_args[key] = value
+            yield from self._handle_stream_chunk(chunk, state)
+        yield from self._finish_stream(state)
+
+    def _handle_stream_chunk(self, chunk, state: _StreamState) -> Generator[LLMResponse, None, None]:
+        """Handle one chunk of a streaming response, function calls are collected in `state`"""
+        state.usage = self._get_usage(chunk) or state.usage
+        if not chunk.candidates:
+            return
+        candidate = chunk.candidates[0]
+        finish_reason = candidate.finish_reason
+        for part in chunk.candidates[0].content.parts:
+            if part.function_call:
+                fc = part.function_call
+                name = fc.name or state.current_fc_name
+                if not name:
                     continue
-                if part.thought:
-                    reasoning = part.text
-                    content = None
-                else:
-                    content = part.text
-                    reasoning = None
-                yield LLMResponse(
-                    reasoning=reasoning,
-                    content=content or "",
-                    finish_reason=finish_reason or None,
-                )
+                if name != state.current_fc_name:
+                    # New function call; save the previous one if any
+                    if state.current_fc_name:
+                        state.pending_calls.append((state.current_fc_name, state.current_fc_args))
+                    state.current_fc_name = name
+                    state.current_fc_args = {}
+                # Accumulate args: concatenate string values for the same key
+                current_fc_args = state.current_fc_args
+                for key, value in (fc.args or {}).items():
+                    if key in current_fc_args and isinstance(value, str) and isinstance(current_fc_args[key], str):
+                        current_fc_args[key] += value
+                    else:
+                        current_fc_args[key] = value
+                continue
+            if part.thought:
+                reasoning = part.text
+                content = None
+            else:
+                content = part.text
+                reasoning = None
+            yield LLMResponse(
+                reasoning=reasoning,
+                content=content or "",
+                finish_reason=finish_reason or None,
+            )
 
+    def _finish_stream(self, state: _StreamState) -> Generator[LLMResponse, None, None]:
+        """Yield the function calls accumulated during streaming"""
         # Save last pending function call
-        if current_fc_name:
-            pending_calls.append((current_fc_name, current_fc_args))
+        if state.current_fc_name:
+            state.pending_calls.append((state.current_fc_name, state.current_fc_args))
 
         # Yield accumulated function calls with normalized args
-        for name, args in pending_calls:
+        for name, args in state.pending_calls:
             final_args = self._normalize_fc_args(args)
             yield LLMResponse(
                 content="",
@@ -312,6 +389,8 @@ class GeminiProvider(Provider):
                 ),
                 finish_reason="tool_calls",
             )
+        if state.usage is not None:
+            yield LLMResponse(usage=state.usage)
 
     def detect_tool_role(self) -> str:
         """Return the role that should be used for tool responses"""
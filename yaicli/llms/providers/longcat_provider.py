@@ -4,6 +4,7 @@ import uuid
 from typing import Any, Dict, Generator, Optional
 
 from ...schemas import LLMResponse, ToolCall
+from ..transport import get_http_client
 from .anthropic_provider import AnthropicProvider
 from .openai_provider import OpenAIProvider
 
@@ -120,6 +121,7 @@ class LongCatProvider(OpenAIProvider):
                         content=std_response.content,
                         finish_reason="tool_calls",
                         tool_call=tool_call,
+                        usage=std_response.usage,
                     )
                 else:
                     yield std_response
@@ -152,6 +154,7 @@ class LongCatProvider(OpenAIProvider):
                     content=chunk_response.content,
                     finish_reason="tool_calls",
                     tool_call=tool_call,
+                    usage=chunk_response.usage,
                 )
             # If finish_reason is "tool_calls" from standard handling
             elif chunk_response.finish_reason == "tool_calls":
@@ -163,6 +166,7 @@ class LongCatProvider(OpenAIProvider):
                     content=chunk_response.content,
                     finish_reason=chunk_response.finish_reason,
                     tool_call=None,
+                    usage=chunk_response.usage,
                 )
 
 
@@ -192,6 +196,7 @@ class LongCatAnthropicProvider(AnthropicProvider):
                 "X-Title": self.APP_NAME,
                 "HTTP_Referer": self.APP_REFERER,
             },
+            "http_client": get_http_client(self.config),
         }
 
         # Add extra headers if set
@@ -228,6 +233,7 @@ class LongCatAnthropicProvider(AnthropicProvider):
                         yield LLMResponse(
                             reasoning=cleaned_reasoning,
                             content=std_response.content,
+                            usage=std_response.usage,
                             finish_reason="tool_use",
                             tool_call=tool_call,
                         )
@@ -242,6 +248,7 @@ class LongCatAnthropicProvider(AnthropicProvider):
                         yield LLMResponse(
                             reasoning=std_response.reasoning,
                             content=cleaned_content,
+                            usage=std_response.usage,
                             finish_reason="tool_use",
                             tool_call=tool_call,
                         )
@@ -277,6 +284,7 @@ class LongCatAnthropicProvider(AnthropicProvider):
                     content=cleaned_content,
                     finish_reason="tool_use",
                     tool_call=tool_call,
+                    usage=chunk_response.usage,
                 )
             # If finish_reason is "tool_calls" from standard handling
             elif chunk_response.finish_reason == "tool_use":
@@ -287,4 +295,5 @@ class LongCatAnthropicProvider(AnthropicProvider):
                     content=chunk_response.content,
                     finish_reason=chunk_response.finish_reason,
                     tool_call=None,
+                    usage=chunk_response.usage,
                 )
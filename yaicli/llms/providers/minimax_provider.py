@@ -4,7 +4,7 @@ from openai._streaming import Stream
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy
-from .openai_provider import OpenAIProvider
+from .openai_provider import OpenAIProvider, ToolCallAccumulator
 
 
 class MinimaxProvider(OpenAIProvider):
@@ -93,10 +93,14 @@ class MinimaxProvider(OpenAIProvider):
 
     def _handle_stream_response(self, response: Stream[ChatCompletionChunk]) -> Generator[LLMResponse, None, None]:
         """Handle streaming response with MiniMax reasoning_details support."""
-        tool_call: Optional[ToolCall] = None
+        tool_calls = ToolCallAccumulator()
         started = False
 
         for chunk in response:
+            usage = self._get_chunk_usage(chunk)
+            if not chunk.choices and usage:
+                yield LLMResponse(usage=usage)
+                continue
             if not chunk.choices and not started:
                 _first_chunk_llm_resp = self._first_chunk_error(chunk)
                 if _first_chunk_llm_resp is not None:
@@ -116,12 +120,20 @@ class MinimaxProvider(OpenAIProvider):
             model_extra = getattr(delta, "model_extra", None) or {}
             reasoning = self._get_reasoning_content(model_extra)
 
+            completed: List[ToolCall] = []
             if hasattr(delta, "tool_calls") and delta.tool_calls:
-                tool_call = self._process_tool_call_chunk(delta.tool_calls, tool_call)
+                completed = tool_calls.add(delta.tool_calls)
+            if finish_reason:
+                completed.extend(tool_calls.flush())
 
+            for tool_call in completed[:-1]:
+                yield LLMResponse(content="", tool_call=tool_call)
             yield LLMResponse(
                 reasoning=reasoning,
                 content=content,
-                tool_call=tool_call if finish_reason == "tool_calls" else None,
+                tool_call=completed[-1] if completed else None,
                 finish_reason=finish_reason,
+                usage=usage,
             )
+        for tool_call in tool_calls.flush():
+            yield LLMResponse(content="", tool_call=tool_call)
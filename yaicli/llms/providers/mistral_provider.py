@@ -15,10 +15,11 @@ from mistralai.utils.eventstreaming import EventStream
 from ...config import cfg
 from ...console import get_console
 from ...exceptions import MCPToolsError
-from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy
+from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy, Usage
 from ...tools import get_openai_mcp_tools, get_openai_schemas
 from ...utils import gen_tool_call_id
 from ..provider import Provider
+from ..transport import get_http_client
 
 
 class MistralProvider(Provider):
@@ -38,7 +39,7 @@ class MistralProvider(Provider):
         self.verbose = verbose
         self.enable_functions = config["ENABLE_FUNCTIONS"]
         self.enable_mcp = config["ENABLE_MCP"]
-        self.client = Mistral(**self.get_client_params())
+        self.client = Mistral(**self.get_client_params(), client=get_http_client(self.config))
         self.console = get_console()
 
     def get_client_params(self) -> Dict[str, Any]:
@@ -133,7 +134,9 @@ class MistralProvider(Provider):
         """Handle normal (non-streaming) response"""
         if not response.choices or not response.choices[0].message:
             content = response.model_dump_json()
-            yield LLMResponse(content=content, finish_reason="stop")
+            yield LLMResponse(
+                content=content, finish_reason="stop", usage=self._get_usage(getattr(response, "usage", None))
+            )
             return
 
         choice = response.choices[0]
@@ -145,7 +148,12 @@ class MistralProvider(Provider):
         if finish_reason == "tool_calls":
             tool_call = self._process_tool_call_chunk(choice.message.tool_calls or [])
 
-        yield LLMResponse(content=content, finish_reason=finish_reason, tool_call=tool_call)
+        yield LLMResponse(
+            content=content,
+            finish_reason=finish_reason,
+            tool_call=tool_call,
+            usage=self._get_usage(getattr(response, "usage", None)),
+        )
 
     def _handle_stream_response(self, response: EventStream[CompletionEvent]) -> Generator[LLMResponse, None, None]:
         """Handle stream response"""
@@ -169,8 +177,24 @@ class MistralProvider(Provider):
                 content=content,
                 finish_reason=finish_reason,
                 tool_call=tool_call if finish_reason == "tool_calls" else None,
+                # Sent with the last chunk
+                usage=self._get_usage(getattr(chunk.data, "usage", None)),
             )
 
+    @staticmethod
+    def _get_usage(usage: Any) -> Optional[Usage]:
+        """Convert the usage of a response or chunk, None if it has no counts"""
+        if usage is None:
+            return None
+
+        def count(name: str) -> int:
+            value = getattr(usage, name, None)
+            return value if isinstance(value, int) else 0
+
+        if not count("prompt_tokens") and not count("completion_tokens"):
+            return None
+        return Usage(prompt_tokens=count("prompt_tokens"), completion_tokens=count("completion_tokens"))
+
     def _process_tool_call_chunk(
         self, tool_calls: List[MistralToolCall], existing_tool_call: Optional[ToolCall] = None
     ) -> Optional[ToolCall]:
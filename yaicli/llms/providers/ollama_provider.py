@@ -1,16 +1,19 @@
 import json
 import time
-from typing import Any, Dict, Generator, List
+from functools import cached_property
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional
 
 import ollama
 from ollama import ChatResponse
 
 from ...config import cfg
 from ...console import get_console
-from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy
+from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy, Usage
 from ...tools import get_openai_schemas
 from ...utils import str2bool
+from ..metrics import span
 from ..provider import Provider
+from ..transport import get_async_http_transport, get_http_transport
 
 
 class OllamaProvider(Provider):
@@ -45,7 +48,21 @@ class OllamaProvider(Provider):
         # Initialize console
         self.console = get_console()
 
-        self.client = ollama.Client(host=self.host, timeout=self.config["TIMEOUT"])
+        client_kwargs: Dict[str, Any] = {"host": self.host, "timeout": self.config["TIMEOUT"]}
+        transport = get_http_transport(self.config)
+        if transport is not None:
+            # Extra kwargs are passed through to the underlying httpx client
+            client_kwargs["transport"] = transport
+        self.client = ollama.Client(**client_kwargs)
+
+    @cached_property
+    def async_client(self) -> ollama.AsyncClient:
+        """Async client, created on first use"""
+        client_kwargs: Dict[str, Any] = {"host": self.host, "timeout": self.config["TIMEOUT"]}
+        transport = get_async_http_transport(self.config)
+        if transport is not None:
+            client_kwargs["transport"] = transport
+        return ollama.AsyncClient(**client_kwargs)
 
     def _convert_messages(self, messages: List[ChatMessage]) -> List[Dict[str, Any]]:
         """Convert a list of ChatMessage objects to a list of Ollama message dicts."""
@@ -87,8 +104,54 @@ class OllamaProvider(Provider):
     ) -> Generator[LLMResponse, None, None]:
         """Send messages to Ollama and get response"""
         effective_tool_policy = self.resolve_tool_policy(tool_policy)
+        params = self._build_request_params(messages, stream, effective_tool_policy)
+        try:
+            if stream:
+                response_generator = self.client.chat(**params)
+                yield from self._handle_stream_response(response_generator, effective_tool_policy.enable_functions)
+            else:
+                response = self.client.chat(**params)
+                yield from self._handle_normal_response(response, effective_tool_policy.enable_functions)
+
+        except Exception as e:
+            self.console.print(f"Ollama API error: {e}", style="red")
+            yield LLMResponse(content=f"Error calling Ollama API: {str(e)}")
+
+    async def acompletion(
+        self,
+        messages: List[ChatMessage],
+        stream: bool = False,
+        tool_policy: ToolPolicy | None = None,
+    ) -> AsyncGenerator[LLMResponse, None]:
+        """Send messages with the async client, see `completion`"""
+        effective_tool_policy = self.resolve_tool_policy(tool_policy)
+        params = self._build_request_params(messages, stream, effective_tool_policy)
+        tool_calls_enabled = effective_tool_policy.enable_functions
+        try:
+            if stream:
+                tool_call = None
+                async for chunk in await self.async_client.chat(**params):
+                    llm_response, tool_call = self._handle_stream_chunk(chunk, tool_calls_enabled, tool_call)
+                    if llm_response:
+                        yield llm_response
+                if tool_call:
+                    yield LLMResponse(tool_call=tool_call)
+            else:
+                response = await self.async_client.chat(**params)
+                for llm_response in self._handle_normal_response(response, tool_calls_enabled):
+                    yield llm_response
+
+        except Exception as e:
+            self.console.print(f"Ollama API error: {e}", style="red")
+            yield LLMResponse(content=f"Error calling Ollama API: {str(e)}")
+
+    def _build_request_params(
+        self, messages: List[ChatMessage], stream: bool, tool_policy: ToolPolicy
+    ) -> Dict[str, Any]:
+        """Build the chat request parameters"""
         # Convert message format
-        ollama_messages = self._convert_messages(messages)
+        with span("convert_messages"):
+            ollama_messages = self._convert_messages(messages)
         if self.verbose:
             self.console.print("Messages:")
             self.console.print(ollama_messages)
@@ -119,23 +182,13 @@ class OllamaProvider(Provider):
         }
 
         # Add tools if enabled
-        if effective_tool_policy.enable_functions:
+        if tool_policy.enable_functions:
             params["tools"] = get_openai_schemas()
 
         if self.verbose:
             self.console.print("Ollama API params:")
             self.console.print(params)
-        try:
-            if stream:
-                response_generator = self.client.chat(**params)
-                yield from self._handle_stream_response(response_generator, effective_tool_policy.enable_functions)
-            else:
-                response = self.client.chat(**params)
-                yield from self._handle_normal_response(response, effective_tool_policy.enable_functions)
-
-        except Exception as e:
-            self.console.print(f"Ollama API error: {e}", style="red")
-            yield LLMResponse(content=f"Error calling Ollama API: {str(e)}")
+        return params
 
     def _handle_normal_response(
         self,
@@ -166,7 +219,7 @@ class OllamaProvider(Provider):
                 arguments=arguments,
             )
 
-        yield LLMResponse(content=content, reasoning=reasoning, tool_call=tool_call)
+        yield LLMResponse(content=content, reasoning=reasoning, tool_call=tool_call, usage=self._get_usage(response))
 
     def _handle_stream_response(
         self,
@@ -174,41 +227,67 @@ class OllamaProvider(Provider):
         tool_calls_enabled: bool,
     ) -> Generator[LLMResponse, None, None]:
         """Handle streaming response"""
-        accumulated_content = ""
         tool_call = None
 
         for chunk in response_generator:
-            # Extract content from the current chunk
-            message = chunk.message
-            content = message.content or ""
-            reasoning = message.thinking or ""
-
-            if content or reasoning:
-                accumulated_content += content
-                yield LLMResponse(content=content, reasoning=reasoning)
-
-            # Check for tool calls in the chunk
-            tool_calls = message.tool_calls or []
-            if tool_calls and tool_calls_enabled:
-                # Only handle the first tool call for now
-                tc = tool_calls[0]
-                function_data = tc.get("function", {})
-
-                # Create tool call with appropriate data type handling
-                arguments = function_data.get("arguments", "")
-                if isinstance(arguments, dict):
-                    arguments = json.dumps(arguments)
-
-                tool_call = ToolCall(
-                    id=tc.get("id", None) or f"tc_{hash(function_data.get('name', ''))}_{int(time.time())}",
-                    name=function_data.get("name", ""),
-                    arguments=arguments,
-                )
+            llm_response, tool_call = self._handle_stream_chunk(chunk, tool_calls_enabled, tool_call)
+            if llm_response:
+                yield llm_response
 
         # After streaming is complete, if we found a tool call, yield it
         if tool_call:
             yield LLMResponse(tool_call=tool_call)
 
+    def _handle_stream_chunk(
+        self,
+        chunk: ChatResponse,
+        tool_calls_enabled: bool,
+        tool_call: Optional[ToolCall],
+    ) -> tuple[Optional[LLMResponse], Optional[ToolCall]]:
+        """Handle one chunk of a streaming response.
+
+        Returns the response to yield, if any, and the latest tool call seen so far.
+        """
+        # Extract content from the current chunk
+        message = chunk.message
+        content = message.content or ""
+        reasoning = message.thinking or ""
+        usage = self._get_usage(chunk)
+        llm_response = (
+            LLMResponse(content=content, reasoning=reasoning, usage=usage) if content or reasoning or usage else None
+        )
+
+        # Check for tool calls in the chunk
+        tool_calls = message.tool_calls or []
+        if tool_calls and tool_calls_enabled:
+            # Only handle the first tool call for now
+            tc = tool_calls[0]
+            function_data = tc.get("function", {})
+
+            # Create tool call with appropriate data type handling
+            arguments = function_data.get("arguments", "")
+            if isinstance(arguments, dict):
+                arguments = json.dumps(arguments)
+
+            tool_call = ToolCall(
+                id=tc.get("id", None) or f"tc_{hash(function_data.get('name', ''))}_{int(time.time())}",
+                name=function_data.get("name", ""),
+                arguments=arguments,
+            )
+        return llm_response, tool_call
+
+    @staticmethod
+    def _get_usage(response: ChatResponse) -> Optional[Usage]:
+        """Token counts of a response, in a stream only the last chunk has them"""
+        prompt_tokens = getattr(response, "prompt_eval_count", None)
+        completion_tokens = getattr(response, "eval_count", None)
+        if not isinstance(prompt_tokens, int) and not isinstance(completion_tokens, int):
+            return None
+        return Usage(
+            prompt_tokens=prompt_tokens if isinstance(prompt_tokens, int) else 0,
+            completion_tokens=completion_tokens if isinstance(completion_tokens, int) else 0,
+        )
+
     def detect_tool_role(self) -> str:
         """Return the role to be used for tool responses"""
         return "tool"
@@ -1,23 +1,25 @@
-import json
-from typing import Generator, Optional
+from typing import Generator, List
 
 from openai._streaming import Stream
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from ...schemas import LLMResponse, ToolCall
-from .openai_provider import OpenAIProvider
+from .openai_provider import OpenAIProvider, ToolCallAccumulator
 
 
 class OpenAICompatibleProvider(OpenAIProvider):
     def _handle_stream_response(self, response: Stream[ChatCompletionChunk]) -> Generator[LLMResponse, None, None]:
         """Handle streaming response from OpenAI API"""
-        # Initialize tool call object to accumulate tool call data across chunks
-        tool_call: Optional[ToolCall] = None
+        # Accumulate the tool calls scattered across chunks
+        tool_calls = ToolCallAccumulator()
         started = False
-        complete_json_detected = False  # Flag to track if we've detected complete JSON
 
         # Process each chunk in the response stream
         for chunk in response:
+            usage = self._get_chunk_usage(chunk)
+            if not chunk.choices and usage:
+                yield LLMResponse(usage=usage)
+                continue
             if not chunk.choices and not started:
                 # Some api could return error message in the first chunk, no choices to handle, return raw response to show the message
                 _first_chunk_llm_resp = self._first_chunk_error(chunk)
@@ -38,31 +40,23 @@ class OpenAICompatibleProvider(OpenAIProvider):
             # Extract reasoning content if available
             reasoning = self._get_reasoning_content(getattr(delta, "model_extra", None) or delta)
 
-            # Process tool call information that may be scattered across chunks
-            tool_call_updated = False
+            # Tool calls are returned as soon as their arguments are complete JSON, since some
+            # compatible APIs never send a "tool_calls" finish reason
+            completed: List[ToolCall] = []
             if hasattr(delta, "tool_calls") and delta.tool_calls:
-                old_args = tool_call.arguments if tool_call else ""
-                tool_call = self._process_tool_call_chunk(delta.tool_calls, tool_call)
-                tool_call_updated = old_args != tool_call.arguments if tool_call else False
-
-                # Try to detect if we have complete JSON for tool call args
-                if tool_call and tool_call_updated:
-                    # Check if arguments appear to be complete valid JSON
-                    try:
-                        json.loads(tool_call.arguments)
-                        complete_json_detected = True
-                    except (json.JSONDecodeError, ValueError):
-                        complete_json_detected = False
-            # Determine if we should return the tool call
-            # Return tool call if:
-            # 1. finish_reason is explicitly "tool_calls", OR
-            # 2. We have a complete JSON in the arguments and we're not getting new argument data
-            should_return_tool = finish_reason == "tool_calls" or (complete_json_detected and tool_call)
+                completed = tool_calls.add(delta.tool_calls)
+            if finish_reason:
+                completed.extend(tool_calls.flush())
 
-            # Generate response object with tool_call
+            for tool_call in completed[:-1]:
+                yield LLMResponse(content="", tool_call=tool_call, finish_reason="tool_calls")
             yield LLMResponse(
                 reasoning=reasoning,
                 content=content,
-                tool_call=tool_call if should_return_tool else None,
-                finish_reason=finish_reason or ("tool_calls" if should_return_tool else None),
+                tool_call=completed[-1] if completed else None,
+                finish_reason=finish_reason or ("tool_calls" if completed else None),
+                usage=usage,
             )
+
+        for tool_call in tool_calls.flush():
+            yield LLMResponse(content="", tool_call=tool_call, finish_reason="tool_calls")
@@ -1,19 +1,98 @@
 import json
 import os
 from copy import deepcopy
-from typing import Any, Dict, Generator, List, Optional, cast
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional, Union, cast
 
 import openai
-from openai._streaming import Stream
+from openai._streaming import AsyncStream, Stream
 from openai.types.chat.chat_completion import ChatCompletion
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from ...config import cfg
 from ...console import get_console
 from ...exceptions import MCPToolsError, ProviderError
-from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy
+from ...schemas import ChatMessage, LLMResponse, ToolCall, ToolPolicy, Usage
 from ...tools import get_openai_mcp_tools, get_openai_schemas
+from ...utils import gen_tool_call_id, is_complete_json
+from ..capabilities import get_provider_capabilities
+from ..metrics import span
 from ..provider import Provider
+from ..transport import get_async_http_client, get_http_client
+
+
+class ToolCallAccumulator:
+    """Assembles the tool calls of a streaming response from their deltas.
+
+    Deltas are keyed by their `index`, so several parallel tool calls are kept apart,
+    even when their deltas interleave. A call is complete when its arguments are a JSON
+    object or when the response finishes; `add` and `flush` return each call once, as
+    soon as it is complete.
+    """
+
+    def __init__(self):
+        self._calls: Dict[int, ToolCall] = {}
+        self._current: Optional[int] = None
+        self._done: set[int] = set()
+
+    def _key(self, delta: Any) -> int:
+        index = getattr(delta, "index", None)
+        current = self._calls.get(self._current) if self._current is not None else None
+        if not isinstance(index, int):
+            # No index: a new id starts a new call, otherwise the current call continues
+            if current is not None and (not delta.id or delta.id == current.id):
+                return self._current  # type: ignore[return-value]
+            return max(self._calls, default=-1) + 1
+        call = self._calls.get(index)
+        if call is not None and delta.id and call.id and delta.id != call.id:
+            # Some APIs send every complete call with index 0
+            return max(self._calls) + 1
+        return index
+
+    def add(self, deltas: List[Any]) -> List[ToolCall]:
+        """Add the tool call deltas of one chunk, return the calls they completed"""
+        updated: Dict[int, None] = {}
+        for delta in deltas:
+            key = self._current = self._key(delta)
+            updated[key] = None
+            function = delta.function
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = ToolCall(delta.id or "", (function and function.name) or "", "")
+            elif function and function.name and not call.name:
+                call.name = function.name
+            if function and function.arguments:
+                call.arguments += function.arguments
+        completed: List[ToolCall] = []
+        for key in updated:
+            if is_complete_json(self._calls[key].arguments):
+                completed.extend(self._complete(key))
+        return completed
+
+    def flush(self) -> List[ToolCall]:
+        """Return the calls not completed yet, at the end of the response"""
+        completed: List[ToolCall] = []
+        for key in self._calls:
+            completed.extend(self._complete(key))
+        return completed
+
+    def _complete(self, key: int) -> List[ToolCall]:
+        if key in self._done:
+            return []
+        self._done.add(key)
+        call = self._calls[key]
+        if not call.id:
+            call.id = gen_tool_call_id()
+        return [call]
+
+
+@dataclass
+class _StreamState:
+    """Data carried across the chunks of one streaming response"""
+
+    started: bool = False
+    tool_calls: ToolCallAccumulator = field(default_factory=ToolCallAccumulator)
 
 
 class OpenAIProvider(Provider):
@@ -21,6 +100,8 @@ class OpenAIProvider(Provider):
 
     DEFAULT_BASE_URL = "https://api.openai.com/v1"
     CLIENT_CLS = openai.OpenAI
+    # Async client taking the same parameters as CLIENT_CLS, None to run `completion` in threads
+    ASYNC_CLIENT_CLS: Optional[type] = openai.AsyncOpenAI
     # Base mapping between config keys and API parameter names
     COMPLETION_PARAMS_KEYS = {
         "model": "MODEL",
@@ -55,6 +136,16 @@ class OpenAIProvider(Provider):
             self._completion_params = self.get_completion_params()
         return deepcopy(self._completion_params)
 
+    @cached_property
+    def async_client(self) -> Any:
+        """Async SDK client, created on first use"""
+        assert self.ASYNC_CLIENT_CLS is not None
+        params = dict(self.client_params)
+        if "http_client" in params:
+            # Created in `acompletion`, so it gets the pooled async http client of the running loop
+            params["http_client"] = get_async_http_client(self.config)
+        return self.ASYNC_CLIENT_CLS(**params)
+
     def get_client_params(self) -> Dict[str, Any]:
         """Get the client parameters"""
         # Initialize client params
@@ -62,6 +153,7 @@ class OpenAIProvider(Provider):
             "api_key": self.config["API_KEY"],
             "base_url": self.config.get("BASE_URL") or self.DEFAULT_BASE_URL,
             "default_headers": {"X-Title": self.APP_NAME, "HTTP_Referer": self.APP_REFERER},
+            "http_client": get_http_client(self.config),
         }
 
         # Add extra headers if set
@@ -145,11 +237,69 @@ class OpenAIProvider(Provider):
             ValueError: If messages is empty or invalid
             openai.APIError: If API request fails
         """
-        openai_messages = self._convert_messages(messages)
+        params = self._build_request_params(messages, stream, tool_policy)
+        response = self.client.chat.completions.create(**params, stream=stream)
+        try:
+            if stream:
+                yield from self._handle_stream_response(cast(Stream[ChatCompletionChunk], response))
+            else:
+                yield from self._handle_normal_response(cast(ChatCompletion, response))
+        except (openai.APIStatusError, openai.APIResponseValidationError) as e:
+            self._print_error_response(e)
+
+    async def acompletion(
+        self,
+        messages: List[ChatMessage],
+        stream: bool = False,
+        tool_policy: Optional[ToolPolicy] = None,
+    ) -> AsyncGenerator[LLMResponse, None]:
+        """Send completion request with the async client, see `completion`"""
+        if not self._has_native_async():
+            async for llm_response in super().acompletion(messages, stream=stream, tool_policy=tool_policy):
+                yield llm_response
+            return
+
+        params = self._build_request_params(messages, stream, tool_policy)
+        response = await self.async_client.chat.completions.create(**params, stream=stream)
+        try:
+            if stream:
+                async for llm_response in self._ahandle_stream_response(
+                    cast(AsyncStream[ChatCompletionChunk], response)
+                ):
+                    yield llm_response
+            else:
+                for llm_response in self._handle_normal_response(cast(ChatCompletion, response)):
+                    yield llm_response
+        except (openai.APIStatusError, openai.APIResponseValidationError) as e:
+            self._print_error_response(e)
+
+    def _has_native_async(self) -> bool:
+        """Whether `acompletion` can use the async client.
+
+        Subclasses that customize the request or the stream handling only do so for the
+        sync path, so they run `completion` in threads instead.
+        """
+        cls = type(self)
+        return (
+            self.ASYNC_CLIENT_CLS is not None
+            and cls.completion is OpenAIProvider.completion
+            and cls._handle_stream_response is OpenAIProvider._handle_stream_response
+        )
+
+    def _build_request_params(
+        self, messages: List[ChatMessage], stream: bool, tool_policy: Optional[ToolPolicy]
+    ) -> Dict[str, Any]:
+        """Build the chat completion request parameters"""
+        with span("convert_messages"):
+            openai_messages = self._convert_messages(messages)
 
         params = self.get_completion_params(tool_policy=tool_policy)
         params["messages"] = openai_messages
-        tools = self.get_tools(tool_policy=tool_policy)
+        if stream and self._reports_stream_usage():
+            # Usage comes in an extra chunk without choices at the end of the stream
+            params["stream_options"] = {"include_usage": True}
+        with span("tools"):
+            tools = self.get_tools(tool_policy=tool_policy)
         if tools:
             params["tools"] = tools
         if self.verbose:
@@ -158,24 +308,51 @@ class OpenAIProvider(Provider):
             if params.get("tools"):
                 self.console.print("Tools:")
                 self.console.print(params["tools"])
-        response = self.client.chat.completions.create(**params, stream=stream)
+        return params
+
+    def _reports_stream_usage(self) -> bool:
+        """Whether the API accepts `stream_options`, compatible APIs may reject it"""
+        return get_provider_capabilities(self.config.get("PROVIDER") or "openai").stream_usage
+
+    def _get_usage(self, usage: Any) -> Optional[Usage]:
+        """Convert the usage of a response or chunk, None if there is none"""
+        if not usage:
+            return None
+
+        def get(obj: Any, key: str) -> Any:
+            return obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
+
+        # DeepSeek reports cache hits as prompt_cache_hit_tokens
+        cached = get(get(usage, "prompt_tokens_details"), "cached_tokens") or get(usage, "prompt_cache_hit_tokens")
+        return Usage(
+            prompt_tokens=get(usage, "prompt_tokens") or 0,
+            completion_tokens=get(usage, "completion_tokens") or 0,
+            cached_tokens=cached or 0,
+            reasoning_tokens=get(get(usage, "completion_tokens_details"), "reasoning_tokens") or 0,
+        )
+
+    def _get_chunk_usage(self, chunk: ChatCompletionChunk) -> Optional[Usage]:
+        """Usage of a streamed chunk, some APIs put it in the choice instead of the chunk"""
+        usage = getattr(chunk, "usage", None)
+        if not usage and chunk.choices:
+            usage = getattr(chunk.choices[0], "usage", None)
+        return self._get_usage(usage)
+
+    def _print_error_response(self, e: Union[openai.APIStatusError, openai.APIResponseValidationError]) -> None:
         try:
-            if stream:
-                yield from self._handle_stream_response(cast(Stream[ChatCompletionChunk], response))
-            else:
-                yield from self._handle_normal_response(cast(ChatCompletion, response))
-        except (openai.APIStatusError, openai.APIResponseValidationError) as e:
-            try:
-                body = e.response.json()
-            except Exception:
-                body = e.response.text
-            self.console.print(f"Error Response: {body}")
+            body = e.response.json()
+        except Exception:
+            body = e.response.text
+        self.console.print(f"Error Response: {body}")
 
     def _handle_normal_response(self, response: ChatCompletion) -> Generator[LLMResponse, None, None]:
         """Handle normal (non-streaming) response"""
+        usage = self._get_usage(getattr(response, "usage", None))
         if not response.choices:
             yield LLMResponse(
-                content=json.dumps(getattr(response, "base_resp", None) or response.to_dict()), finish_reason="stop"
+                content=json.dumps(getattr(response, "base_resp", None) or response.to_dict()),
+                finish_reason="stop",
+                usage=usage,
             )
             return
         choice = response.choices[0]
@@ -190,10 +367,18 @@ class OpenAIProvider(Provider):
             reasoning = self._get_reasoning_content(model_extra)
 
         if finish_reason == "tool_calls" and hasattr(choice.message, "tool_calls") and choice.message.tool_calls:
-            tool = choice.message.tool_calls[0]
-            tool_call = ToolCall(tool.id, tool.function.name or "", tool.function.arguments)
-
-        yield LLMResponse(reasoning=reasoning, content=content, finish_reason=finish_reason, tool_call=tool_call)
+            tool_calls = [
+                ToolCall(tool.id or gen_tool_call_id(), tool.function.name or "", tool.function.arguments)
+                for tool in choice.message.tool_calls
+            ]
+            # All but the last tool call are yielded on their own
+            for tool_call in tool_calls[:-1]:
+                yield LLMResponse(content="", tool_call=tool_call)
+            tool_call = tool_calls[-1]
+
+        yield LLMResponse(
+            reasoning=reasoning, content=content, finish_reason=finish_reason, tool_call=tool_call, usage=usage
+        )
 
     def _first_chunk_error(self, chunk) -> Optional[LLMResponse]:
         """
@@ -208,57 +393,73 @@ class OpenAIProvider(Provider):
 
     def _handle_stream_response(self, response: Stream[ChatCompletionChunk]) -> Generator[LLMResponse, None, None]:
         """Handle streaming response from OpenAI API"""
-        # Initialize tool call object to accumulate tool call data across chunks
-        tool_call: Optional[ToolCall] = None
-        started = False
+        state = _StreamState()
         # Process each chunk in the response stream
         for chunk in response:
-            if not chunk.choices and not started:
-                # Some api could return error message in the first chunk, no choices to handle, return raw response to show the message
-                _first_chunk_llm_resp = self._first_chunk_error(chunk)
-                if _first_chunk_llm_resp is not None:
-                    yield _first_chunk_llm_resp
-                started = True
-                continue
-
-            if not chunk.choices:
-                continue
-            started = True
-            delta = chunk.choices[0].delta
-            finish_reason = chunk.choices[0].finish_reason
-
-            # Extract content from current chunk
-            content = delta.content or ""
-
-            # Extract reasoning content if available
-            reasoning = self._get_reasoning_content(getattr(delta, "model_extra", None) or delta)
-
-            # Process tool call information that may be scattered across chunks
-            if hasattr(delta, "tool_calls") and delta.tool_calls:
-                tool_call = self._process_tool_call_chunk(delta.tool_calls, tool_call)
-
-            # Generate response object with tool_call only when finish_reason indicates completion
-            yield LLMResponse(
-                reasoning=reasoning,
-                content=content,
-                tool_call=tool_call if finish_reason == "tool_calls" else None,
-                finish_reason=finish_reason,
-            )
-
-    def _process_tool_call_chunk(self, tool_calls, existing_tool_call=None):
-        """Process tool call data from a response chunk"""
-        # Initialize tool call object if this is the first chunk with tool call data
-        if existing_tool_call is None and tool_calls:
-            existing_tool_call = ToolCall(tool_calls[0].id or "", tool_calls[0].function.name or "", "")
+            yield from self._handle_stream_chunk(chunk, state)
+        yield from self._finish_stream(state)
+
+    async def _ahandle_stream_response(
+        self, response: AsyncStream[ChatCompletionChunk]
+    ) -> AsyncGenerator[LLMResponse, None]:
+        """Handle streaming response from the async client"""
+        state = _StreamState()
+        async for chunk in response:
+            for llm_response in self._handle_stream_chunk(chunk, state):
+                yield llm_response
+        for llm_response in self._finish_stream(state):
+            yield llm_response
+
+    def _handle_stream_chunk(
+        self, chunk: ChatCompletionChunk, state: _StreamState
+    ) -> Generator[LLMResponse, None, None]:
+        """Handle one chunk of a streaming response"""
+        usage = self._get_chunk_usage(chunk)
+        if not chunk.choices and usage:
+            yield LLMResponse(usage=usage)
+            return
+        if not chunk.choices and not state.started:
+            # Some api could return error message in the first chunk, no choices to handle, return raw response to show the message
+            _first_chunk_llm_resp = self._first_chunk_error(chunk)
+            if _first_chunk_llm_resp is not None:
+                yield _first_chunk_llm_resp
+            state.started = True
+            return
 
-        # Accumulate arguments from multiple chunks
-        if existing_tool_call:
-            for tool in tool_calls:
-                if not tool.function:
-                    continue
-                existing_tool_call.arguments += tool.function.arguments or ""
+        if not chunk.choices:
+            return
+        state.started = True
+        delta = chunk.choices[0].delta
+        finish_reason = chunk.choices[0].finish_reason
+
+        # Extract content from current chunk
+        content = delta.content or ""
+
+        # Extract reasoning content if available
+        reasoning = self._get_reasoning_content(getattr(delta, "model_extra", None) or delta)
+
+        # Process tool call information that may be scattered across chunks
+        completed: List[ToolCall] = []
+        if hasattr(delta, "tool_calls") and delta.tool_calls:
+            completed = state.tool_calls.add(delta.tool_calls)
+        if finish_reason:
+            completed.extend(state.tool_calls.flush())
+
+        # Each tool call is returned once it is complete, the last one with this chunk
+        for tool_call in completed[:-1]:
+            yield LLMResponse(content="", tool_call=tool_call)
+        yield LLMResponse(
+            reasoning=reasoning,
+            content=content,
+            tool_call=completed[-1] if completed else None,
+            finish_reason=finish_reason,
+            usage=usage,
+        )
 
-        return existing_tool_call
+    def _finish_stream(self, state: _StreamState) -> Generator[LLMResponse, None, None]:
+        """Return the tool calls of a stream that ended without a finish reason"""
+        for tool_call in state.tool_calls.flush():
+            yield LLMResponse(content="", tool_call=tool_call)
 
     def _get_reasoning_content(self, delta: Any) -> Optional[str]:
         """Extract reasoning content from delta if available based on specific keys."""
@@ -282,6 +483,7 @@ class OpenAIProvider(Provider):
 
 class OpenAIAzure(OpenAIProvider):
     CLIENT_CLS = openai.AzureOpenAI
+    ASYNC_CLIENT_CLS = openai.AsyncAzureOpenAI
 
     def __init__(self, config: dict = cfg, verbose: bool = False, **kwargs):
         self.config = config
@@ -367,6 +569,7 @@ class OpenAIAzure(OpenAIProvider):
             "azure_endpoint": azure_endpoint,
             "azure_deployment": azure_deployment,
             "base_url": base_url,
+            "http_client": get_http_client(self.config),
         }
 
         # Add azure_ad_token_provider if provided
@@ -0,0 +1,309 @@
+import contextvars
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import cached_property
+from queue import Empty, Queue
+from typing import Any, Deque, Dict, Generator, Iterator, List, Optional, Tuple
+
+from ...config import cfg
+from ...console import get_console
+from ...exceptions import ProviderError
+from ...schemas import ChatMessage, LLMResponse, ToolPolicy
+from ...utils import str2bool
+from ..provider import Provider, ProviderFactory
+from ..transport import watch_responses
+
+_DONE = object()
+
+
+@dataclass
+class BackendHealth:
+    """Failure and latency record of one backend"""
+
+    failures: int = 0
+    retry_at: float = 0.0
+    # Time to first response of recent successful requests
+    ttft: Deque[float] = field(default_factory=lambda: deque(maxlen=50))
+
+    def available(self, now: float) -> bool:
+        return now >= self.retry_at
+
+    def record_success(self, ttft: float) -> None:
+        self.failures = 0
+        self.retry_at = 0.0
+        self.ttft.append(ttft)
+
+    def record_failure(self, cooldown: float) -> None:
+        # Back off longer while the backend keeps failing
+        self.failures += 1
+        self.retry_at = time.monotonic() + cooldown * min(2 ** (self.failures - 1), 8)
+
+    def ttft_p95(self, min_samples: int) -> Optional[float]:
+        """95th percentile time to first response, None until there are enough samples"""
+        if len(self.ttft) < min_samples:
+            return None
+        samples = sorted(self.ttft)
+        return samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+
+
+@dataclass
+class Backend:
+    """One provider behind the router, with its own config"""
+
+    name: str
+    provider_name: str
+    config: Dict[str, Any]
+    verbose: bool = False
+    health: BackendHealth = field(default_factory=BackendHealth)
+
+    @cached_property
+    def provider(self) -> Provider:
+        """Provider instance, created on first use"""
+        return ProviderFactory.create_provider(self.provider_name, config=self.config, verbose=self.verbose)
+
+
+def _no_response(backend: "Backend") -> ProviderError:
+    # Some providers report request errors themselves and return no responses
+    return ProviderError(f"{backend.name} returned no response")
+
+
+class _Attempt:
+    """A completion running in a worker thread, so it can be raced against another backend"""
+
+    def __init__(
+        self,
+        backend: Backend,
+        events: "Queue[Tuple[_Attempt, Optional[BaseException]]]",
+        messages: List[ChatMessage],
+        stream: bool,
+        tool_policy: Optional[ToolPolicy],
+    ):
+        self.backend = backend
+        self.started = time.monotonic()
+        self.cancelled = threading.Event()
+        self._events = events
+        self._responses: Queue = Queue()
+        self._http_responses: List[Any] = []
+        # A copy of the context, so spans and marks of the backend go to the request metrics
+        context = contextvars.copy_context()
+        threading.Thread(
+            target=context.run,
+            args=(self._run, messages, stream, tool_policy),
+            name=f"yaicli-router-{backend.name}",
+            daemon=True,
+        ).start()
+
+    def cancel(self) -> None:
+        """Stop the attempt, aborting its HTTP response if one is in flight"""
+        self.cancelled.set()
+        for response in list(self._http_responses):
+            response.close()
+
+    def _watch(self, response: Any) -> None:
+        self._http_responses.append(response)
+        if self.cancelled.is_set():
+            response.close()
+
+    def _run(self, messages: List[ChatMessage], stream: bool, tool_policy: Optional[ToolPolicy]) -> None:
+        first = True
+        try:
+            with watch_responses(self._watch):
+                responses = self.backend.provider.completion(messages, stream=stream, tool_policy=tool_policy)
+                try:
+                    for response in responses:
+                        if self.cancelled.is_set():
+                            return
+                        if first:
+                            first = False
+                            self._events.put((self, None))
+                        self._responses.put(response)
+                finally:
+                    # Closes the response stream of a cancelled attempt
+                    responses.close()
+        except Exception as e:
+            if self.cancelled.is_set():
+                # Most likely the aborted response, nobody waits for this attempt anymore
+                return
+            if first:
+                self._events.put((self, e))
+            else:
+                self._responses.put(e)
+            return
+        if first:
+            self._events.put((self, _no_response(self.backend)))
+            return
+        self._responses.put(_DONE)
+
+    def __iter__(self) -> Iterator[LLMResponse]:
+        while True:
+            item = self._responses.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+
+class RouterProvider(Provider):
+    """Routes requests over several configured providers.
+
+    Backends are tried in the configured order. One that fails is skipped for a cooldown
+    and the next one takes the request. With hedging, a second backend is started when
+    the first hasn't responded within the p95 of its past response times, and whichever
+    responds first is used.
+    """
+
+    DEFAULT_HEDGE_DELAY = 2.0
+    DEFAULT_COOLDOWN = 30.0
+    # Use the configured hedge delay until a backend has this many response times
+    MIN_TTFT_SAMPLES = 5
+
+    def __init__(self, config: dict = cfg, verbose: bool = False, **kwargs):
+        self.config = config
+        self.verbose = verbose
+        self.console = get_console()
+        self.hedge_delay = float(self.config.get("ROUTER_HEDGE_DELAY") or self.DEFAULT_HEDGE_DELAY)
+        self.hedge = str2bool(self.config.get("ROUTER_HEDGE", False))
+        self.cooldown = float(self.config.get("ROUTER_COOLDOWN") or self.DEFAULT_COOLDOWN)
+        self.backends = self._load_backends()
+        self.last_backend = self.backends[0]
+
+    def _load_backends(self) -> List[Backend]:
+        """Read the backends from `ROUTER_BACKENDS`, a JSON object of name to config overrides"""
+        raw = self.config.get("ROUTER_BACKENDS") or {}
+        if isinstance(raw, str):
+            try:
+                raw = json.loads(raw)
+            except ValueError as e:
+                raise ProviderError(f"ROUTER_BACKENDS is not valid JSON: {e}") from None
+        if not isinstance(raw, dict) or not raw:
+            raise ProviderError("ROUTER_BACKENDS must be a JSON object with at least one backend")
+
+        backends = []
+        for name, overrides in raw.items():
+            overrides = dict(overrides or {})
+            provider_name = str(overrides.pop("PROVIDER", name)).lower()
+            if provider_name == "router" or provider_name not in ProviderFactory.providers_map:
+                raise ProviderError(f"Unknown provider for router backend '{name}': {provider_name}")
+            backend_config = {**self.config, **overrides, "PROVIDER": provider_name}
+            backends.append(Backend(name, provider_name, backend_config, verbose=self.verbose))
+        return backends
+
+    def _ordered_backends(self) -> List[Backend]:
+        """Available backends in the configured order, then those cooling down"""
+        now = time.monotonic()
+        available = [backend for backend in self.backends if backend.health.available(now)]
+        cooling = sorted(
+            (backend for backend in self.backends if not backend.health.available(now)),
+            key=lambda backend: backend.health.retry_at,
+        )
+        return available + cooling
+
+    def completion(
+        self,
+        messages: List[ChatMessage],
+        stream: bool = False,
+        tool_policy: Optional[ToolPolicy] = None,
+    ) -> Generator[LLMResponse, None, None]:
+        """Complete with the first backend that responds, see `Provider.completion`"""
+        backends = self._ordered_backends()
+        if self.hedge and len(backends) > 1:
+            yield from self._hedged_completion(backends, messages, stream, tool_policy)
+        else:
+            yield from self._failover_completion(backends, messages, stream, tool_policy)
+
+    def _failover_completion(
+        self,
+        backends: List[Backend],
+        messages: List[ChatMessage],
+        stream: bool,
+        tool_policy: Optional[ToolPolicy],
+    ) -> Generator[LLMResponse, None, None]:
+        error: Optional[Exception] = None
+        for backend in backends:
+            started = time.monotonic()
+            try:
+                responses = backend.provider.completion(messages, stream=stream, tool_policy=tool_policy)
+                first = next(responses, None)
+                if first is None:
+                    raise _no_response(backend)
+            except Exception as e:
+                self._record_failure(backend, e)
+                error = e
+                continue
+            backend.health.record_success(time.monotonic() - started)
+            self.last_backend = backend
+            yield first
+            # Content was already shown, errors past this point can't fail over
+            yield from responses
+            return
+        raise ProviderError(f"All router backends failed, last error: {error}")
+
+    def _hedged_completion(
+        self,
+        backends: List[Backend],
+        messages: List[ChatMessage],
+        stream: bool,
+        tool_policy: Optional[ToolPolicy],
+    ) -> Generator[LLMResponse, None, None]:
+        events: Queue = Queue()
+        pending = list(backends)
+        running: List[_Attempt] = []
+        winner: Optional[_Attempt] = None
+        error: Optional[BaseException] = None
+
+        def start_next() -> None:
+            backend = pending.pop(0)
+            if running and self.verbose:
+                self.console.print(f"Router: hedging with {backend.name}", style="dim")
+            running.append(_Attempt(backend, events, messages, stream, tool_policy))
+
+        start_next()
+        try:
+            while winner is None:
+                hedge_at = self._hedge_delay(running[0].backend) if pending and len(running) == 1 else None
+                timeout = None if hedge_at is None else max(0.0, running[0].started + hedge_at - time.monotonic())
+                try:
+                    attempt, exc = events.get(timeout=timeout)
+                except Empty:
+                    start_next()
+                    continue
+                if exc is None:
+                    winner = attempt
+                    continue
+                running.remove(attempt)
+                self._record_failure(attempt.backend, exc)
+                error = exc
+                if not running and pending:
+                    start_next()
+                elif not running:
+                    raise ProviderError(f"All router backends failed, last error: {error}")
+        finally:
+            # Only the first backend to respond is used
+            for attempt in running:
+                if attempt is not winner:
+                    attempt.cancel()
+
+        winner.backend.health.record_success(time.monotonic() - winner.started)
+        self.last_backend = winner.backend
+        try:
+            yield from winner
+        finally:
+            # The consumer may stop early, e.g. on Ctrl-C, don't read the rest of the response
+            winner.cancel()
+
+    def _hedge_delay(self, backend: Backend) -> float:
+        """Seconds to wait for the first response before starting another backend"""
+        p95 = backend.health.ttft_p95(self.MIN_TTFT_SAMPLES)
+        return self.hedge_delay if p95 is None else p95
+
+    def _record_failure(self, backend: Backend, error: BaseException) -> None:
+        backend.health.record_failure(self.cooldown)
+        self.console.print(f"Router: {backend.name} failed: {error}", style="dim yellow")
+
+    def detect_tool_role(self) -> str:
+        """Tool role of the backend that answered last"""
+        return self.last_backend.provider.detect_tool_role()
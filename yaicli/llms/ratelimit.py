@@ -0,0 +1,144 @@
+"""Client side rate limiting per provider and model.
+
+Requests reserve capacity from two token buckets, requests per minute and tokens per
+minute, before they are sent. A reservation may take a bucket below zero, the caller then
+waits until it is paid back, so concurrent callers are served in order and the quota is
+used up without going over it. Limiters are shared by all clients of the process, e.g.
+all connections of the daemon.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from ..const import DEFAULT_RATE_LIMIT_RPM, DEFAULT_RATE_LIMIT_TPM
+from ..schemas import ChatMessage
+
+# Rough characters per token, for estimating the prompt size before the request
+CHARS_PER_TOKEN = 4
+
+
+class TokenBucket:
+    """Bucket of `capacity` tokens refilled at `rate` tokens per second, not thread safe"""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserved(self, amount: float) -> float:
+        """Tokens `reserve` takes for `amount`, a single request larger than the bucket would never fit"""
+        return min(amount, self.capacity)
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take `amount` tokens, return the seconds to wait until they are available"""
+        self._refill(now)
+        self.tokens -= self.reserved(amount)
+        return max(0.0, -self.tokens / self.rate)
+
+    def give_back(self, amount: float, now: float) -> None:
+        """Return tokens of a reservation that was too large, or take more if it was too small"""
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimiter:
+    """Requests per minute and tokens per minute limits of one provider and model, 0 disables a limit"""
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self._lock = threading.Lock()
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60) if tokens_per_minute else None
+        self._paused_until = 0.0
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserve one request of about `tokens` tokens, return the seconds to wait before sending it"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._paused_until - now
+            if self._requests is not None:
+                wait = max(wait, self._requests.reserve(1, now))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.reserve(tokens, now))
+            return max(0.0, wait)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request of about `tokens` tokens may be sent, return the seconds waited"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record_usage(self, estimated: int, actual: int) -> None:
+        """Correct a reservation of `estimated` tokens with the token count reported by the response.
+
+        A response without a token count keeps its reservation.
+        """
+        if self._tokens is None or actual <= 0:
+            return
+        difference = self._tokens.reserved(estimated) - actual
+        if difference:
+            with self._lock:
+                self._tokens.give_back(difference, time.monotonic())
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for `seconds`, after the server asked to retry later"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+@lru_cache(maxsize=None)
+def _rate_limiter(provider: str, model: str, requests_per_minute: int, tokens_per_minute: int) -> RateLimiter:
+    return RateLimiter(requests_per_minute, tokens_per_minute)
+
+
+def get_rate_limiter(provider: str, config: Dict[str, Any]) -> Optional[RateLimiter]:
+    """Get the shared limiter of the provider and model in `config`, None without limits"""
+    requests_per_minute = int(config.get("RATE_LIMIT_RPM") or DEFAULT_RATE_LIMIT_RPM)
+    tokens_per_minute = int(config.get("RATE_LIMIT_TPM") or DEFAULT_RATE_LIMIT_TPM)
+    if not requests_per_minute and not tokens_per_minute:
+        return None
+    return _rate_limiter(provider, str(config.get("MODEL") or ""), requests_per_minute, tokens_per_minute)
+
+
+def estimate_tokens(messages: List[ChatMessage]) -> int:
+    """Rough prompt size of `messages`, the real count is only known from the response"""
+    chars = 0
+    for message in messages:
+        chars += len(message.content or "") + len(message.reasoning or "")
+        for tool_call in message.tool_calls:
+            chars += len(tool_call.name) + len(tool_call.arguments)
+    return chars // CHARS_PER_TOKEN + 1
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the server asked to wait in a rate limit error, None if it didn't"""
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) not in (429, 503):
+        return None
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    # HTTP date form
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,323 @@
+"""Shared HTTP transport for the provider SDKs.
+
+Every provider whose SDK accepts a custom httpx client gets the same pooled client, so
+repeated requests (tool call loops, retries, fallbacks) reuse a warm TLS connection
+instead of paying DNS, TCP and TLS setup again. Async SDK clients get the pooled async
+client of the running event loop.
+"""
+
+import socket
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+from ..config import cfg
+from ..const import (
+    DEFAULT_DNS_CACHE_TTL,
+    DEFAULT_HTTP2,
+    DEFAULT_HTTP_KEEPALIVE_EXPIRY,
+    DEFAULT_HTTP_MAX_CONNECTIONS,
+    DEFAULT_TIMEOUT,
+)
+from ..utils import str2bool
+from .metrics import mark
+
+
+@dataclass(frozen=True)
+class HTTPSettings:
+    """Connection pool settings, hashable so equal settings share one client"""
+
+    http2: bool = True
+    max_connections: int = DEFAULT_HTTP_MAX_CONNECTIONS
+    keepalive_expiry: float = DEFAULT_HTTP_KEEPALIVE_EXPIRY
+    dns_cache_ttl: int = DEFAULT_DNS_CACHE_TTL
+    timeout: float = DEFAULT_TIMEOUT
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "HTTPSettings":
+        """Read the settings from a config, missing keys fall back to the defaults"""
+        return cls(
+            # HTTP/2 needs the optional `h2` package (`pip install httpx[http2]`)
+            http2=str2bool(config.get("HTTP2", DEFAULT_HTTP2)) and find_spec("h2") is not None,
+            max_connections=int(config.get("HTTP_MAX_CONNECTIONS") or DEFAULT_HTTP_MAX_CONNECTIONS),
+            keepalive_expiry=float(config.get("HTTP_KEEPALIVE_EXPIRY") or DEFAULT_HTTP_KEEPALIVE_EXPIRY),
+            dns_cache_ttl=int(config.get("DNS_CACHE_TTL") or 0),
+            timeout=float(config.get("TIMEOUT") or DEFAULT_TIMEOUT),
+        )
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class _DNSCache:
+    """Addresses of recent DNS lookups, kept for `ttl` seconds"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, host: str, port: int) -> Optional[List[str]]:
+        with self._lock:
+            cached = self._cache.get((host, port))
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        return None
+
+    def _store(self, host: str, port: int, infos: Iterable[Any]) -> List[str]:
+        addresses = list(dict.fromkeys(str(info[4][0]) for info in infos))
+        with self._lock:
+            self._cache[(host, port)] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def _evict(self, host: str, port: int) -> None:
+        # Every cached address failed, resolve again on the next attempt
+        with self._lock:
+            self._cache.pop((host, port), None)
+
+
+class CachingResolverBackend(_DNSCache, httpcore.SyncBackend):
+    """Network backend that caches DNS lookups for `ttl` seconds.
+
+    Connects to the resolved address directly; TLS still verifies the original host name,
+    which httpcore passes to `start_tls` separately.
+    """
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """Return the addresses of `host`, from the cache while they are fresh"""
+        addresses = self._cached(host, port)
+        if addresses is not None:
+            return addresses
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as exc:
+            raise httpcore.ConnectError(exc) from exc
+        return self._store(host, port, infos)
+
+    def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.NetworkStream:
+        error: Optional[Exception] = None
+        for address in self.resolve(host, port):
+            try:
+                return super().connect_tcp(address, port, timeout, local_address, socket_options)
+            except httpcore.ConnectError as exc:
+                error = exc
+        self._evict(host, port)
+        raise error or httpcore.ConnectError(f"No address found for {host}")
+
+
+class AsyncCachingResolverBackend(_DNSCache, httpcore.AnyIOBackend):
+    """Async counterpart of `CachingResolverBackend`"""
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """Return the addresses of `host`, from the cache while they are fresh"""
+        import anyio
+
+        addresses = self._cached(host, port)
+        if addresses is not None:
+            return addresses
+        try:
+            infos = await anyio.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as exc:
+            raise httpcore.ConnectError(exc) from exc
+        return self._store(host, port, infos)
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        error: Optional[Exception] = None
+        for address in await self.resolve(host, port):
+            try:
+                return await super().connect_tcp(address, port, timeout, local_address, socket_options)
+            except httpcore.ConnectError as exc:
+                error = exc
+        self._evict(host, port)
+        raise error or httpcore.ConnectError(f"No address found for {host}")
+
+
+class PooledTransport(httpx.HTTPTransport):
+    """`httpx.HTTPTransport` with an optional DNS caching network backend"""
+
+    def __init__(self, settings: HTTPSettings):
+        super().__init__(http2=settings.http2, limits=settings.limits)
+        if settings.dns_cache_ttl > 0:
+            # httpx has no option for the network backend, rebuild its pool with one
+            limits = settings.limits
+            self._pool = httpcore.ConnectionPool(
+                ssl_context=httpx.create_ssl_context(),
+                max_connections=limits.max_connections,
+                max_keepalive_connections=limits.max_keepalive_connections,
+                keepalive_expiry=limits.keepalive_expiry,
+                http1=True,
+                http2=settings.http2,
+                network_backend=CachingResolverBackend(settings.dns_cache_ttl),
+            )
+
+
+class AsyncPooledTransport(httpx.AsyncHTTPTransport):
+    """`httpx.AsyncHTTPTransport` with an optional DNS caching network backend"""
+
+    def __init__(self, settings: HTTPSettings):
+        super().__init__(http2=settings.http2, limits=settings.limits)
+        if settings.dns_cache_ttl > 0:
+            limits = settings.limits
+            self._pool = httpcore.AsyncConnectionPool(
+                ssl_context=httpx.create_ssl_context(),
+                max_connections=limits.max_connections,
+                max_keepalive_connections=limits.max_keepalive_connections,
+                keepalive_expiry=limits.keepalive_expiry,
+                http1=True,
+                http2=settings.http2,
+                network_backend=AsyncCachingResolverBackend(settings.dns_cache_ttl),
+            )
+
+
+def _env_proxies() -> bool:
+    """Whether proxies are configured in the environment.
+
+    A client with an explicit transport ignores them, so in that case the client builds
+    its own proxy aware transports instead.
+    """
+    return any(scheme in ("http", "https", "all") for scheme in urllib.request.getproxies())
+
+
+@lru_cache(maxsize=None)
+def _http_transport(settings: HTTPSettings) -> Optional[httpx.HTTPTransport]:
+    if _env_proxies():
+        return None
+    return PooledTransport(settings)
+
+
+# Called with the responses of the requests made in this context, see `watch_responses`
+_response_listener: ContextVar[Optional[Callable[[httpx.Response], None]]] = ContextVar(
+    "yaicli_response_listener", default=None
+)
+
+
+@contextmanager
+def watch_responses(listener: Callable[[httpx.Response], None]) -> Generator[None, None, None]:
+    """Call `listener` with each response of the shared client in the block, once its headers arrived.
+
+    Lets the caller close a response from another thread to abort the request.
+    """
+    token = _response_listener.set(listener)
+    try:
+        yield
+    finally:
+        _response_listener.reset(token)
+
+
+def _on_response_headers(response: httpx.Response) -> None:
+    # Time to first byte of the request being timed, if any
+    mark("response_headers")
+    listener = _response_listener.get()
+    if listener is not None:
+        listener(response)
+
+
+async def _aon_response_headers(response: httpx.Response) -> None:
+    _on_response_headers(response)
+
+
+@lru_cache(maxsize=None)
+def _http_client(settings: HTTPSettings) -> httpx.Client:
+    transport = _http_transport(settings)
+    event_hooks = {"response": [_on_response_headers]}
+    if transport is None:
+        return httpx.Client(
+            http2=settings.http2,
+            limits=settings.limits,
+            timeout=settings.timeout,
+            follow_redirects=True,
+            event_hooks=event_hooks,
+        )
+    return httpx.Client(transport=transport, timeout=settings.timeout, follow_redirects=True, event_hooks=event_hooks)
+
+
+def get_http_transport(config: Dict[str, Any] = cfg) -> Optional[httpx.HTTPTransport]:
+    """Get the shared transport, for SDKs that build their own httpx client.
+
+    Returns None when environment proxies are set, so the SDK keeps its proxy support.
+    """
+    return _http_transport(HTTPSettings.from_config(config))
+
+
+def get_http_client(config: Dict[str, Any] = cfg) -> httpx.Client:
+    """Get the shared pooled httpx client for the settings in `config`"""
+    return _http_client(HTTPSettings.from_config(config))
+
+
+# Async connections belong to the event loop that opened them, so each loop gets its own pool
+_async_pools: Dict[Any, Dict[Tuple[str, HTTPSettings], Any]] = {}
+_async_pools_lock = threading.Lock()
+
+
+def _loop_pool() -> Dict[Tuple[str, HTTPSettings], Any]:
+    """Async transports and clients of the running event loop"""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    with _async_pools_lock:
+        for closed in [other for other in _async_pools if other.is_closed()]:
+            del _async_pools[closed]
+        return _async_pools.setdefault(loop, {})
+
+
+def get_async_http_transport(config: Dict[str, Any] = cfg) -> Optional[httpx.AsyncHTTPTransport]:
+    """Get the shared async transport of the running event loop, see `get_http_transport`"""
+    if _env_proxies():
+        return None
+    settings = HTTPSettings.from_config(config)
+    pool = _loop_pool()
+    key = ("transport", settings)
+    if key not in pool:
+        pool[key] = AsyncPooledTransport(settings)
+    return pool[key]
+
+
+def get_async_http_client(config: Dict[str, Any] = cfg) -> httpx.AsyncClient:
+    """Get the shared pooled async httpx client of the running event loop for the settings in `config`"""
+    settings = HTTPSettings.from_config(config)
+    pool = _loop_pool()
+    key = ("client", settings)
+    if key not in pool:
+        transport = get_async_http_transport(config)
+        event_hooks = {"response": [_aon_response_headers]}
+        if transport is None:
+            pool[key] = httpx.AsyncClient(
+                http2=settings.http2,
+                limits=settings.limits,
+                timeout=settings.timeout,
+                follow_redirects=True,
+                event_hooks=event_hooks,
+            )
+        else:
+            pool[key] = httpx.AsyncClient(
+                transport=transport, timeout=settings.timeout, follow_redirects=True, event_hooks=event_hooks
+            )
+    return pool[key]
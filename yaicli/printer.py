@@ -1,15 +1,55 @@
+import re
+import sys
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Iterator, List, Tuple, Union
+from typing import BinaryIO, Callable, Generator, Iterator, List, Optional, TextIO, Tuple, Union
 
 from rich.console import Group, RenderableType
 from rich.live import Live
 
+from .accumulator import ResponseAccumulator
 from .config import Config, get_config
 from .console import YaiConsole, get_console
-from .render import Markdown, plain_formatter
+from .const import DEFAULT_MAX_FPS
+from .render import BlockSplitter, Markdown, plain_formatter
 from .schemas import LLMResponse, RefreshLive
 
 
+class FrameScheduler:
+    """Decides when the live display is redrawn, at most `max_fps` times per second.
+
+    Chunks arriving between two frames are shown together in the next one. When drawing
+    a frame takes longer than half the frame interval, the interval grows so drawing
+    can't hold up reading the stream. `max_fps` of 0 redraws on every chunk.
+    """
+
+    # Redraw at least once per second however slow drawing is
+    MAX_INTERVAL = 1.0
+
+    def __init__(self, max_fps: float, clock: Callable[[], float] = time.perf_counter):
+        self.min_interval = 1 / max_fps if max_fps > 0 else 0.0
+        self.interval = self.min_interval
+        self.clock = clock
+        self._last_frame = float("-inf")
+
+    def due(self) -> bool:
+        """Whether the next frame should be drawn now"""
+        return self.clock() - self._last_frame >= self.interval
+
+    @contextmanager
+    def frame(self) -> Generator[None, None, None]:
+        """Time drawing a frame and adapt the interval to it"""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self._last_frame = start
+            if self.min_interval:
+                elapsed = self.clock() - start
+                self.interval = min(max(self.min_interval, 2 * elapsed), max(self.min_interval, self.MAX_INTERVAL))
+
+
 @dataclass
 class Printer:
     console: YaiConsole = field(default_factory=get_console)
@@ -21,85 +61,83 @@ class Printer:
     def __post_init__(self):
         self.code_theme: str = self.config["CODE_THEME"]
         self.show_reasoning: bool = self.config["SHOW_REASONING"]
+        self.max_fps: float = float(self.config.get("MAX_FPS", DEFAULT_MAX_FPS))
         # Set formatter for reasoning and content
         self.reasoning_formatter = Markdown
         self.content_formatter = Markdown if self.content_markdown else plain_formatter
-        # Track if we're currently processing reasoning content
-        self.in_reasoning: bool = False
+        # The response being shown, filled by the producer of the stream when it shares one
+        self.response = ResponseAccumulator()
+        self._shared_response = False
+        # Parts of the response already shown
+        self._shown_content = 0
+        self._shown_reasoning = 0
+        # Completed blocks of a stream are printed once, only the rest is re-rendered
+        self._content_blocks = BlockSplitter()
+        self._reasoning_blocks = BlockSplitter()
+        self._reasoning_printed = False
+        self._last_printed = ""
+
+    @property
+    def in_reasoning(self) -> bool:
+        """Whether the content is inside <think> tags"""
+        return self.response.in_reasoning
+
+    def _start(self, response: Optional[ResponseAccumulator] = None) -> None:
+        """Start showing a stream, `response` is the accumulator its producer fills, if it shares one."""
+        self.response = response if response is not None else ResponseAccumulator()
+        self._reset_state()
 
     def _reset_state(self) -> None:
-        """Reset printer state for a new stream."""
-        self.in_reasoning = False
-
-    def _check_and_update_think_tags(self, content: str, reasoning: str) -> Tuple[str, str]:
-        """Check for <think> tags in the accumulated content and reasoning.
-
-        This function checks the entire accumulated text for <think> tags
-        and updates state accordingly.
-
-        Args:
-            content: Current accumulated content text
-            reasoning: Current accumulated reasoning text
-
-        Returns:
-            Updated content and reasoning after tag processing
-        """
-        # First, check if we have a <think> opener in content
-        if "<think>" in content and not self.in_reasoning:
-            parts = content.split("<think>", 1)
-            new_content = parts[0]
-            new_reasoning = parts[1]
-            self.in_reasoning = True
-
-            # Check if the new reasoning has a </think> closer
-            if "</think>" in new_reasoning:
-                closer_parts = new_reasoning.split("</think>", 1)
-                reasoning += closer_parts[0]
-                new_content += closer_parts[1]
-                self.in_reasoning = False
-                return new_content, reasoning
-            else:
-                # No closer yet
-                reasoning += new_reasoning
-                return new_content, reasoning
-
-        # Check if we have a </think> closer in reasoning
-        if "</think>" in reasoning and self.in_reasoning:
-            parts = reasoning.split("</think>", 1)
-            new_reasoning = parts[0]
-            content += parts[1]
-            self.in_reasoning = False
-            return content, new_reasoning
+        """Reset printer state for a new response."""
+        self.response.reset()
+        self._shown_content = 0
+        self._shown_reasoning = 0
+        self._content_blocks.reset()
+        self._reasoning_blocks.reset()
+        self._reasoning_printed = False
+        self._last_printed = ""
+
+    def _process_chunk(self, chunk: LLMResponse) -> Tuple[str, str]:
+        """Add a chunk to the response, return the content and reasoning not shown yet."""
+        # A producer sharing the response has added the chunk already
+        if chunk is not self.response.last:
+            self.response.add(chunk)
+        return self._take_new_parts()
+
+    def _flush_chunks(self) -> Tuple[str, str]:
+        """Finish the response, return the content and reasoning not shown yet."""
+        self.response.finish()
+        return self._take_new_parts()
+
+    def _take_new_parts(self) -> Tuple[str, str]:
+        content, reasoning = self._new_parts()
+        if reasoning and self.show_reasoning:
+            self._reasoning_blocks.append(reasoning)
+        self._content_blocks.append(content)
+        return content, reasoning
 
+    def _new_parts(self) -> Tuple[str, str]:
+        """Content and reasoning added to the response since the last call"""
+        content_parts = self.response.content_parts
+        reasoning_parts = self.response.reasoning_parts
+        content = "".join(content_parts[self._shown_content :])
+        reasoning = "".join(reasoning_parts[self._shown_reasoning :])
+        self._shown_content = len(content_parts)
+        self._shown_reasoning = len(reasoning_parts)
         return content, reasoning
 
-    def _process_chunk(self, chunk_content: str, chunk_reasoning: str, content: str, reasoning: str) -> Tuple[str, str]:
-        """Process a single chunk and update content and reasoning.
+    def _response(self) -> Tuple[str, str]:
+        """Content and reasoning of the response so far"""
+        return self.response.content, self.response.reasoning
 
-        Args:
-            chunk_content: Content from the current chunk
-            chunk_reasoning: Reasoning from the current chunk
-            content: Current accumulated content
-            reasoning: Current accumulated reasoning
-
-        Returns:
-            Updated content and reasoning
-        """
-        # Process reasoning field first (if present)
-        if chunk_reasoning:
-            reasoning += chunk_reasoning
-
-        # Then process content field (if present)
-        if chunk_content:
-            if self.in_reasoning:
-                # In reasoning mode, append to reasoning
-                reasoning += chunk_content
-            else:
-                # Normal content mode
-                content += chunk_content
-
-        # Check for any <think> tags in the updated content/reasoning
-        return self._check_and_update_think_tags(content, reasoning)
+    def _format_reasoning(self, reasoning: str, header: bool = True) -> RenderableType:
+        """Format reasoning as a quote, optionally under a "Thinking:" header."""
+        raw_reasoning = reasoning.replace("\n", f"\n{self._REASONING_PREFIX}")
+        if not raw_reasoning.startswith(self._REASONING_PREFIX):
+            raw_reasoning = self._REASONING_PREFIX + raw_reasoning
+        if header:
+            raw_reasoning = "\nThinking:\n" + raw_reasoning
+        return self.reasoning_formatter(raw_reasoning, code_theme=self.code_theme)
 
     def _format_display_text(self, content: str, reasoning: str) -> RenderableType:
         """Format the text for display, combining content and reasoning if needed.
@@ -116,14 +154,7 @@ class Printer:
 
         # Format reasoning with proper formatting if it exists
         if reasoning and self.show_reasoning:
-            raw_reasoning = reasoning.replace("\n", f"\n{self._REASONING_PREFIX}")
-            if not raw_reasoning.startswith(self._REASONING_PREFIX):
-                raw_reasoning = self._REASONING_PREFIX + raw_reasoning
-
-            # Format the reasoning section
-            reasoning_header = "\nThinking:\n"
-            formatted_reasoning = self.reasoning_formatter(reasoning_header + raw_reasoning, code_theme=self.code_theme)
-            display_elements.append(formatted_reasoning)
+            display_elements.append(self._format_reasoning(reasoning))
 
         # Format content if it exists
         if content:
@@ -141,36 +172,39 @@ class Printer:
         # Use Rich Group to combine multiple renderables
         return Group(*display_elements)
 
-    def display_normal(self, content_iterator: Iterator[Union["LLMResponse", RefreshLive]]) -> tuple[str, str]:
-        """Process and display non-stream LLMContent, including reasoning and content parts."""
-        self._reset_state()
-        full_content = full_reasoning = ""
+    def display_normal(
+        self,
+        content_iterator: Iterator[Union["LLMResponse", RefreshLive]],
+        response: Optional[ResponseAccumulator] = None,
+    ) -> tuple[str, str]:
+        """Process and display non-stream LLMContent, including reasoning and content parts.
 
-        for chunk in content_iterator:
-            if not isinstance(chunk, LLMResponse):
-                continue
+        `response` is the accumulator the producer of the stream fills, if it shares one.
+        """
+        self._start(response)
 
-            # Process chunk and update content/reasoning
-            full_content, full_reasoning = self._process_chunk(
-                chunk.content or "", chunk.reasoning or "", full_content, full_reasoning
-            )
+        for chunk in content_iterator:
+            if isinstance(chunk, LLMResponse):
+                self._print_response(*self._process_chunk(chunk))
+        self._print_response(*self._flush_chunks())
 
-            # Display reasoning
-            if self.show_reasoning and full_reasoning:
-                reasoning = full_reasoning.replace("\n", f"\n{self._REASONING_PREFIX}")
-                self.console.print("Thinking:")
-                self.console.print(self.reasoning_formatter(reasoning))
+        return self._response()
 
-            # Display content
-            if full_content:
-                self.console.print()
-                self.console.print(self.content_formatter(full_content))
+    def _print_response(self, content: str, reasoning: str) -> None:
+        """Print the content and reasoning of a non-stream response."""
+        if self.show_reasoning and reasoning:
+            reasoning = reasoning.replace("\n", f"\n{self._REASONING_PREFIX}")
+            self.console.print("Thinking:")
+            self.console.print(self.reasoning_formatter(reasoning))
 
-        return full_content, full_reasoning
+        if content:
+            self.console.print()
+            self.console.print(self.content_formatter(content))
 
     def _create_and_start_live(self) -> Live:
         """Create and start a new Live instance."""
-        live = Live(console=self.console)
+        # Frames are drawn by display_stream, see FrameScheduler
+        live = Live(console=self.console, auto_refresh=False)
         live.start()
         return live
 
@@ -179,37 +213,204 @@ class Printer:
         if live.is_started:
             live.stop()
 
-    def display_stream(self, stream_iterator: Iterator[Union["LLMResponse", RefreshLive]]) -> tuple[str, str]:
-        """Process and display LLMContent stream, including reasoning and content parts."""
-        self._reset_state()
-        full_content = full_reasoning = ""
+    def _block_elements(self, kind: str, text: str, header: bool = False) -> List[RenderableType]:
+        """Format a "reasoning" or "content" block of a stream, after the last printed one."""
+        if kind == "reasoning":
+            renderable = self._format_reasoning(text, header=header)
+            # Rich already puts a blank line before a quote
+            separated = bool(self._last_printed) and header
+        else:
+            renderable = self.content_formatter(text, code_theme=self.code_theme)
+            if self.content_markdown:
+                separated = bool(self._last_printed) and not _SELF_SPACED_BLOCK.match(text)
+            else:
+                # Plain text keeps its own line breaks
+                separated = self._last_printed == "reasoning"
+        self._last_printed = kind
+        return ["", renderable] if separated else [renderable]
+
+    def _update_live(self, live: Live) -> None:
+        """Print the newly completed blocks and show only the open ones in the live display."""
+        done_blocks: List[RenderableType] = []
+        open_blocks: List[Tuple[str, str, bool]] = []
+        if self.show_reasoning:
+            # Reasoning comes before content, it is complete once content starts
+            done = self._reasoning_blocks.flush() if self._shown_content else self._reasoning_blocks.take()
+            if done:
+                done_blocks += self._block_elements("reasoning", done, header=not self._reasoning_printed)
+                self._reasoning_printed = True
+            if self._reasoning_blocks.rest:
+                open_blocks.append(("reasoning", self._reasoning_blocks.rest, not self._reasoning_printed))
+
+        done = self._content_blocks.take()
+        if done:
+            # Printing adds a line break
+            done_blocks += self._block_elements("content", done if self.content_markdown else done[:-1])
+        if self._content_blocks.rest:
+            open_blocks.append(("content", self._content_blocks.rest, False))
+
+        for renderable in done_blocks:
+            live.console.print(renderable)
+        # The open blocks are formatted again on the next frame, so keep what was printed
+        last_printed = self._last_printed
+        elements: List[RenderableType] = []
+        for kind, text, header in open_blocks:
+            elements += self._block_elements(kind, text, header)
+        self._last_printed = last_printed
+        live.update(Group(*elements) if elements else "", refresh=True)
+
+    def display_stream(
+        self,
+        stream_iterator: Iterator[Union["LLMResponse", RefreshLive]],
+        response: Optional[ResponseAccumulator] = None,
+    ) -> tuple[str, str]:
+        """Process and display LLMContent stream, including reasoning and content parts.
+
+        Completed Markdown blocks are printed above the live display as they finish,
+        so each chunk only re-renders the block still being written. Chunks are
+        coalesced into frames drawn at most `max_fps` times per second. `response` is
+        the accumulator the producer of the stream fills, if it shares one.
+        """
+        self._start(response)
+        frames = FrameScheduler(self.max_fps)
+        # Whether the live display is behind the received chunks
+        pending = False
         live = self._create_and_start_live()
 
         try:
             for chunk in stream_iterator:
                 if isinstance(chunk, RefreshLive):
+                    # Show the whole completion before moving on
+                    self._flush_chunks()
+                    self._update_live(live)
                     # Gracefully transition to new live session
                     self._safe_stop_live(live)
                     live = self._create_and_start_live()
 
                     # Reset state for next completion
-                    full_content = full_reasoning = ""
                     self._reset_state()
+                    pending = False
                     continue
 
-                # Process chunk and update content/reasoning
-                full_content, full_reasoning = self._process_chunk(
-                    chunk.content or "", chunk.reasoning or "", full_content, full_reasoning
-                )
+                self._process_chunk(chunk)
+                pending = True
 
-                # Update display
-                formatted_display = self._format_display_text(full_content, full_reasoning)
-                live.update(formatted_display)
+                if frames.due():
+                    with frames.frame():
+                        self._update_live(live)
+                    pending = False
 
         except Exception as e:
-            self._safe_stop_live(live)
             raise e from None
         finally:
+            # The last frame is always drawn, also when the stream is interrupted
+            if any(self._flush_chunks()) or pending:
+                if live.is_started:
+                    self._update_live(live)
             self._safe_stop_live(live)
 
-        return full_content, full_reasoning
+        return self._response()
+
+
+# Rich puts a blank line before lists and quotes itself
+_SELF_SPACED_BLOCK = re.compile(r"\s*(?:[-*+]|\d+[.)]|>)(?:\s|$)")
+
+
+class LineWriter:
+    """Writes text to the binary buffer of a text stream, flushing at each newline.
+
+    Skipping the text layer saves its per write overhead, the binary buffer flushes
+    itself when full. Streams without a binary buffer are written as text.
+    """
+
+    def __init__(self, stream: TextIO):
+        # Text written to the stream before goes first
+        stream.flush()
+        self.stream = stream
+        self._buffer: Optional[BinaryIO] = getattr(stream, "buffer", None)
+        self._encoding = getattr(stream, "encoding", None) or "utf-8"
+        self._errors = getattr(stream, "errors", None) or "strict"
+
+    def write(self, text: str) -> None:
+        if self._buffer is None:
+            self.stream.write(text)
+        else:
+            self._buffer.write(text.encode(self._encoding, self._errors))
+        if "\n" in text:
+            self.flush()
+
+    def flush(self) -> None:
+        (self.stream if self._buffer is None else self._buffer).flush()
+
+
+@dataclass
+class PipePrinter(Printer):
+    """Printer for pipelines, writes plain text to stdout without rich rendering.
+
+    Content goes straight to the binary buffer of stdout and is flushed at each line,
+    so programs reading the pipe get it as it arrives. Reasoning goes to stderr.
+    """
+
+    stream: TextIO = field(default_factory=lambda: sys.stdout)
+    reasoning_stream: TextIO = field(default_factory=lambda: sys.stderr)
+
+    def __post_init__(self):
+        super().__post_init__()
+        self._wrote_content = False
+        self._wrote_reasoning = False
+
+    def _reset_state(self) -> None:
+        super()._reset_state()
+        self._wrote_content = False
+        self._wrote_reasoning = False
+
+    def _take_new_parts(self) -> Tuple[str, str]:
+        # Plain text output is not split into Markdown blocks
+        return self._new_parts()
+
+    def _write(self, content: str, reasoning: str) -> None:
+        """Write the content and reasoning parts of a chunk."""
+        if reasoning and self.show_reasoning:
+            self._reasoning_out.write(reasoning)
+            self._wrote_reasoning = True
+        if content:
+            self._out.write(content)
+            self._wrote_content = True
+
+    def _finish(self) -> None:
+        """Write what is left of a response and flush"""
+        self._write(*self._flush_chunks())
+        if self._wrote_reasoning:
+            self._reasoning_out.write("\n")
+        if self._wrote_content:
+            self._out.write("\n")
+        self._out.flush()
+
+    def display_normal(
+        self,
+        content_iterator: Iterator[Union["LLMResponse", RefreshLive]],
+        response: Optional[ResponseAccumulator] = None,
+    ) -> tuple[str, str]:
+        return self.display_stream(content_iterator, response)
+
+    def display_stream(
+        self,
+        stream_iterator: Iterator[Union["LLMResponse", RefreshLive]],
+        response: Optional[ResponseAccumulator] = None,
+    ) -> tuple[str, str]:
+        """Write the response as plain text, content to stdout and reasoning to stderr."""
+        self._start(response)
+        # The streams may have been replaced since the last response
+        self._out = LineWriter(self.stream)
+        self._reasoning_out = LineWriter(self.reasoning_stream)
+
+        for chunk in stream_iterator:
+            if isinstance(chunk, RefreshLive):
+                # A new completion after tool calls, finish the current one
+                self._finish()
+                self._reset_state()
+                continue
+            self._write(*self._process_chunk(chunk))
+
+        self._finish()
+        return self._response()
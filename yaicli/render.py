@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, List
 
 from rich.markdown import Markdown
 
@@ -17,3 +17,70 @@ class JustifyMarkdown(Markdown):
 def plain_formatter(text: str, **kwargs: Any) -> str:
     """Format the text for display, without Markdown formatting."""
     return text
+
+
+class BlockSplitter:
+    """Splits streamed text into completed top-level Markdown blocks and the open rest.
+
+    A block is complete when a top-level code fence closes, or when an unindented line
+    follows a blank line outside a code fence. Only the lines added since the last `take`
+    are scanned, and only the open rest is kept.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        # Text after the last completed block, and text appended since the last take
+        self.rest = ""
+        self._appended: List[str] = []
+        # Start of the first line of `rest` not scanned yet
+        self._scanned = 0
+        self._frozen = 0
+        # Marker of the open code fence and whether it is at the top level
+        self._fence = ""
+        self._fence_top = False
+        self._blank = False
+
+    def append(self, text: str) -> None:
+        if text:
+            self._appended.append(text)
+
+    def take(self) -> str:
+        """Return the text of the blocks completed since the last call"""
+        if self._appended:
+            self.rest += "".join(self._appended)
+            self._appended.clear()
+        text = self.rest
+        self._frozen = 0
+        while self._scanned < len(text):
+            if self._blank and not self._fence and text[self._scanned] not in " \t\n":
+                self._frozen = self._scanned
+                self._blank = False
+            line_end = text.find("\n", self._scanned)
+            if line_end == -1:
+                break
+            self._scan_line(text[self._scanned : line_end], line_end + 1)
+            self._scanned = line_end + 1
+        done, self.rest = text[: self._frozen], text[self._frozen :]
+        self._scanned -= self._frozen
+        return done
+
+    def flush(self) -> str:
+        """Return all the text left as a completed block"""
+        rest = self.rest + "".join(self._appended)
+        self.reset()
+        return rest
+
+    def _scan_line(self, line: str, end: int) -> None:
+        stripped = line.strip()
+        if self._fence:
+            if stripped.startswith(self._fence) and not stripped.strip(self._fence[0]):
+                if self._fence_top:
+                    self._frozen = end
+                self._fence = ""
+            return
+        if stripped.startswith(("```", "~~~")):
+            self._fence = stripped[: len(stripped) - len(stripped.lstrip(stripped[0]))]
+            self._fence_top = not line[:1].isspace()
+        self._blank = not stripped
@@ -1,5 +1,8 @@
 import json
+import os
+from collections.abc import Iterator, MutableMapping
 from dataclasses import asdict, dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, TypeVar
 
@@ -9,10 +12,13 @@ from rich.table import Table
 from .config import cfg
 from .console import YaiConsole, get_console
 from .const import DEFAULT_ROLES, ROLES_DIR, DefaultRoleNames
-from .utils import detect_os, detect_shell, option_callback
+from .utils import environment_fingerprint, option_callback
 
 T = TypeVar("T")
 
+# Bump when the role index layout changes
+ROLES_INDEX_VERSION = 1
+
 
 @dataclass
 class Role:
@@ -28,25 +34,59 @@ class Role:
             raise ValueError("Role must have a non-empty description")
 
         if not self.variables:
-            self.variables = {"_os": detect_os(cfg), "_shell": detect_shell(cfg)}
+            self.variables = environment_fingerprint(cfg).to_role_variables()
         self.prompt = self.prompt.format(**self.variables)
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
 
-@dataclass
-class RoleManager:
-    roles: Dict[str, Role] = field(default_factory=dict)
-    roles_dir: Path = ROLES_DIR
-    console: YaiConsole = get_console()
-
-    def __post_init__(self) -> None:
-        self._ensure_roles_dir()
-        self._load_default_roles()
-        self._load_user_roles()
-
-    def _ensure_roles_dir(self) -> None:
+class _StaleIndex(Exception):
+    """The role file no longer matches the index"""
+
+
+class RoleRegistry(MutableMapping[str, Role]):
+    """Roles by name, backed by an on-disk index of the roles directory.
+
+    The index maps role names to their files and is persisted next to the roles
+    directory. It is only rebuilt when the directory changes, and then only files whose
+    mtime or size changed are parsed again. A role file is read and formatted on first
+    access, so looking up one role does not depend on the number of roles.
+    """
+
+    def __init__(self, roles_dir: Path, console: YaiConsole):
+        self.roles_dir = roles_dir
+        self.console = console
+        self.index_path = roles_dir.parent / f".{roles_dir.name}.index.json"
+        # role name -> file name
+        self._files: Dict[str, str] = {}
+        self._loaded: Dict[str, Role] = {}
+        self._rescanned = False
+
+    def load_index(self, force: bool = False) -> None:
+        """Load the persisted index, rebuild it if the roles directory changed or `force` is set"""
+        index = self._read_index()
+        try:
+            dir_mtime_ns = self.roles_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            dir_mtime_ns = None
+        self._rescanned = force or dir_mtime_ns is None or index.get("dir_mtime_ns") != dir_mtime_ns
+        if self._rescanned:
+            index = self._rebuild_index(index.get("files", {}))
+        self._files = {entry["name"]: filename for filename, entry in sorted(index["files"].items()) if entry["name"]}
+        self._loaded.clear()
+
+    def _read_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict) or index.get("version") != ROLES_INDEX_VERSION:
+            return {}
+        return index
+
+    def _ensure_default_role_files(self) -> None:
         """Ensure the roles directory exists, and create default roles if they don't exist"""
         self.roles_dir.mkdir(parents=True, exist_ok=True)
         for role in DEFAULT_ROLES.values():
@@ -54,30 +94,120 @@ class RoleManager:
                 with open(self.roles_dir / f"{role['name']}.json", "w") as f:
                     json.dump(role, f, indent=2)
 
-    def _load_default_roles(self) -> None:
-        """Load default roles"""
-        for name, role_dict in DEFAULT_ROLES.items():
-            self.roles[name] = Role(**role_dict)
-
-    def _load_user_roles(self) -> None:
-        """Load user-defined roles, user can overwrite default roles"""
-        if not self.roles_dir.exists():
-            return
-
-        for filename in self.roles_dir.glob("*.json"):
+    def _rebuild_index(self, old_files: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Scan the roles directory, only parsing files that changed since the last scan"""
+        self._ensure_default_role_files()
+        files = {}
+        for entry in os.scandir(self.roles_dir):
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            stat = entry.stat()
+            old = old_files.get(entry.name)
+            if old and old["mtime_ns"] == stat.st_mtime_ns and old["size"] == stat.st_size:
+                files[entry.name] = old
+                continue
             try:
-                with open(filename, "r") as f:
-                    role_dict = json.load(f)
-                    role = Role(**role_dict)
-                    self.roles[role.name] = role
+                with open(entry.path, "r") as f:
+                    name = json.load(f)["name"]
+                if not isinstance(name, str):
+                    raise TypeError(f"role name must be a string, got {type(name).__name__}")
             except (json.JSONDecodeError, KeyError, TypeError) as e:
-                self.console.print(f"Error loading role from {filename}: {e}", style="red")
+                self.console.print(f"Error loading role from {entry.path}: {e}", style="red")
+                name = None
+            files[entry.name] = {"name": name, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+        index = {"version": ROLES_INDEX_VERSION, "dir_mtime_ns": self.roles_dir.stat().st_mtime_ns, "files": files}
+        try:
+            with open(self.index_path, "w") as f:
+                json.dump(index, f)
+        except OSError:
+            # A read-only config dir only costs a rescan on the next run
+            pass
+        return index
+
+    def _load_role(self, name: str) -> Role:
+        filename = self._files.get(name)
+        if filename is None:
+            # Built-in roles are always available, even if their file was removed meanwhile
+            if name in DEFAULT_ROLES:
+                return Role(**DEFAULT_ROLES[name])
+            raise _StaleIndex(name)
+        path = self.roles_dir / filename
+        try:
+            with open(path, "r") as f:
+                role_dict = json.load(f)
+        except FileNotFoundError:
+            role_dict = None
+        except (json.JSONDecodeError, OSError) as e:
+            self.console.print(f"Error loading role from {path}: {e}", style="red")
+            raise KeyError(name) from None
+
+        if not isinstance(role_dict, dict) or role_dict.get("name") != name:
+            # File was edited in place or removed, the index is stale
+            raise _StaleIndex(name)
+        try:
+            return Role(**role_dict)
+        except (KeyError, TypeError, ValueError) as e:
+            self.console.print(f"Error loading role from {path}: {e}", style="red")
+            raise KeyError(name) from None
+
+    def __getitem__(self, name: str) -> Role:
+        if name not in self._loaded:
+            try:
+                role = self._load_role(name)
+            except _StaleIndex:
+                # Files rewritten in place don't change the directory mtime, rescan once
+                if self._rescanned:
+                    raise KeyError(name) from None
+                self.load_index(force=True)
+                try:
+                    role = self._load_role(name)
+                except _StaleIndex:
+                    raise KeyError(name) from None
+            self._loaded[name] = role
+        return self._loaded[name]
+
+    def __setitem__(self, name: str, role: Role) -> None:
+        self._files[name] = f"{name}.json"
+        self._loaded[name] = role
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self._files.pop(name, None)
+        self._loaded.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        if name in self._files or name in self._loaded or name in DEFAULT_ROLES:
+            return True
+        if not self._rescanned:
+            self.load_index(force=True)
+            return name in self._files
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(self._files.keys() | self._loaded.keys() | DEFAULT_ROLES.keys()))
+
+    def __len__(self) -> int:
+        return len(self._files.keys() | self._loaded.keys() | DEFAULT_ROLES.keys())
+
+
+@dataclass
+class RoleManager:
+    roles_dir: Path = ROLES_DIR
+    console: YaiConsole = get_console()
+    roles: RoleRegistry = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.roles = RoleRegistry(self.roles_dir, self.console)
+        self.roles.load_index()
 
     def get_role(self, name: str) -> Role:
         """Get a role by name"""
-        if name not in self.roles:
-            raise ValueError(f"Role '{name}' does not exist.")
-        return self.roles[name]
+        try:
+            return self.roles[name]
+        except KeyError:
+            raise ValueError(f"Role '{name}' does not exist.") from None
 
     def create_role(self, name: str, description: str) -> Role:
         """Create and save a new role"""
@@ -109,7 +239,10 @@ class RoleManager:
     def list_roles(self) -> list:
         """List all available roles info"""
         roles_list = []
-        for role_id, role in sorted(self.roles.items()):
+        for role_id in self.roles:
+            role = self.roles.get(role_id)
+            if role is None:
+                continue
             roles_list.append(
                 {
                     "id": role_id,
@@ -141,6 +274,8 @@ class RoleManager:
         """Print the list of roles.
         This method is a cli option callback.
         """
+        # Make sure the roles dir and default roles exist before listing
+        get_role_manager()
         table = Table(show_header=True, show_footer=False)
         table.add_column("Name", style="dim")
         table.add_column("Filepath", style="dim")
@@ -228,4 +363,7 @@ class RoleManager:
         return value
 
 
-role_mgr = RoleManager()
+@lru_cache(1)
+def get_role_manager() -> RoleManager:
+    """Get the role manager singleton, created on first use"""
+    return RoleManager()
@@ -22,6 +22,7 @@ class ChatMessage:
     tool_calls: List["ToolCall"] = field(default_factory=list)
     reasoning: Optional[str] = None  # Save reasoning content for interleaved thinking
     images: List[ImageData] = field(default_factory=list)
+    transient: bool = False  # Only sent with the current turn, e.g. @ file references, never kept in the history
 
 
 @dataclass
@@ -41,6 +42,28 @@ class ToolPolicy:
     enable_mcp: bool
 
 
+@dataclass
+class Usage:
+    """Token usage of a response"""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # Prompt tokens read from the provider's prompt cache
+    reasoning_tokens: int = 0  # Completion tokens spent on reasoning
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def __add__(self, other: "Usage") -> "Usage":
+        return Usage(
+            self.prompt_tokens + other.prompt_tokens,
+            self.completion_tokens + other.completion_tokens,
+            self.cached_tokens + other.cached_tokens,
+            self.reasoning_tokens + other.reasoning_tokens,
+        )
+
+
 @dataclass
 class LLMResponse:
     """Data structure for llm response with reasoning and content"""
@@ -49,6 +72,8 @@ class LLMResponse:
     content: str = ""
     finish_reason: Optional[str] = None
     tool_call: Optional[ToolCall] = None
+    # Set once per request, on one of its last responses
+    usage: Optional[Usage] = None
 
 
 class RefreshLive:
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Tuple, cast
+from typing import Any, Dict, List, Optional, Tuple, cast
 
 from json_repair import repair_json
 from rich.panel import Panel
@@ -35,6 +35,26 @@ def get_mcp(name: str):
 
 console = get_console()
 
+
+class DeferredConsole:
+    """Collects the console output of a tool call running in a worker thread.
+
+    `replay` prints it on the real console in one block, so the output of
+    concurrent tool calls doesn't interleave.
+    """
+
+    def __init__(self):
+        self._calls: List[Tuple[tuple, dict]] = []
+
+    def print(self, *objects: Any, **kwargs: Any) -> None:
+        self._calls.append((objects, kwargs))
+
+    def replay(self, target: Any) -> None:
+        for objects, kwargs in self._calls:
+            target.print(*objects, **kwargs)
+        self._calls.clear()
+
+
 _openai_schemas_cache: List[Dict[str, Any]] | None = None
 _anthropic_schemas_cache: List[Dict[str, Any]] | None = None
 
@@ -52,7 +72,7 @@ def get_openai_schemas() -> List[Dict[str, Any]]:
     for function in list_functions():
         schema = {
             "type": "function",
-            "function": function.func_cls.openai_schema,
+            "function": function.openai_schema,
         }
         transformed_schemas.append(schema)
     _openai_schemas_cache = transformed_schemas
@@ -70,7 +90,7 @@ def get_anthropic_schemas() -> List[Dict[str, Any]]:
         return _anthropic_schemas_cache
     transformed_schemas = []
     for function in list_functions():
-        transformed_schemas.append(function.func_cls.anthropic_schema)
+        transformed_schemas.append(function.anthropic_schema)
     _anthropic_schemas_cache = transformed_schemas
     return transformed_schemas
 
@@ -107,11 +127,12 @@ def get_anthropic_mcp_tools() -> list[dict[str, Any]]:
         raise MCPToolsError(f"Error getting MCP tools for Anthropic: {e}") from e
 
 
-def execute_tool_call(tool_call: ToolCall) -> Tuple[str, bool]:
+def execute_tool_call(tool_call: ToolCall, output: Optional[Any] = None) -> Tuple[str, bool]:
     """Execute a tool call and return the result
 
     Args:
         tool_call: The tool call to execute
+        output: Where to print progress and output, defaults to the console
 
     Returns:
         Tuple[str, bool]: (result text, success flag)
@@ -126,14 +147,15 @@ def execute_tool_call(tool_call: ToolCall) -> Tuple[str, bool]:
         get_tool_func = get_mcp
         show_output = cfg["SHOW_MCP_OUTPUT"]
         _type = "mcp"
+    output = output or console
 
-    console.print(f"@{_type.title()} call: {tool_call.name}({tool_call.arguments})", style="blue")
+    output.print(f"@{_type.title()} call: {tool_call.name}({tool_call.arguments})", style="blue")
     # 1. Get the tool
     try:
         tool = get_tool_func(tool_call.name)
     except ValueError as e:
         error_msg = f"{_type.title()} '{tool_call.name!r}' not exists: {e}"
-        console.print(error_msg, style="red")
+        output.print(error_msg, style="red")
         return error_msg, False
 
     # 2. Parse tool arguments
@@ -141,12 +163,12 @@ def execute_tool_call(tool_call: ToolCall) -> Tuple[str, bool]:
         arguments = repair_json(tool_call.arguments, return_objects=True)
         if not isinstance(arguments, dict):
             error_msg = f"Invalid arguments type: {arguments!r}, should be JSON object"
-            console.print(error_msg, style="red")
+            output.print(error_msg, style="red")
             return error_msg, False
         arguments = cast(dict, arguments)
     except Exception as e:
         error_msg = f"Invalid arguments from llm: {e}\nRaw arguments: {tool_call.arguments!r}"
-        console.print(error_msg, style="red")
+        output.print(error_msg, style="red")
         return error_msg, False
 
     # 3. Execute the tool
@@ -161,9 +183,9 @@ def execute_tool_call(tool_call: ToolCall) -> Tuple[str, bool]:
                 border_style="blue",
                 style="dim",
             )
-            console.print(panel)
+            output.print(panel)
         return result, True
     except Exception as e:
         error_msg = f"Call {_type} error: {e}\n{_type} name: {tool_call.name!r}\nArguments: {arguments!r}"
-        console.print(error_msg, style="red")
+        output.print(error_msg, style="red")
         return error_msg, False
@@ -1,12 +1,15 @@
+import hashlib
 import importlib.util
 import json
 import sys
 from functools import wraps
-from typing import TYPE_CHECKING, Callable, List, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, List, Optional
 
 if TYPE_CHECKING:
     from yaicli.function_schema import OpenAISchema
 
+from .. import __version__
 from ..console import get_console
 from ..const import FUNCTIONS_DIR
 
@@ -24,29 +27,57 @@ def wrap_gemini_function(func: Callable) -> Callable:
     return wrapper
 
 
+# Bump when the manifest layout changes, schemas are also regenerated for every yaicli release
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = ".schema_manifest.json"
+
+
 class Function:
-    """Function description class"""
+    """Function description class
+
+    Built from the schema manifest, the function module is only imported when the
+    function class is needed, i.e. when the function is executed.
+    """
 
-    def __init__(self, function: type["OpenAISchema"]):
-        self.name = function.openai_schema["name"]
-        self.description = function.openai_schema.get("description", "")
-        self.parameters = function.openai_schema.get("parameters", {})
-        self.execute = function.execute  # type: ignore
-        self.func_cls = function
+    def __init__(
+        self,
+        path: Path,
+        openai_schema: dict[str, Any],
+        anthropic_schema: dict[str, Any],
+        func_cls: Optional[type["OpenAISchema"]] = None,
+    ):
+        self.path = path
+        self.openai_schema = openai_schema
+        self.anthropic_schema = anthropic_schema
+        self.name = openai_schema["name"]
+        self.description = openai_schema.get("description", "")
+        self.parameters = openai_schema.get("parameters", {})
+        self._func_cls = func_cls
+
+    @property
+    def func_cls(self) -> type["OpenAISchema"]:
+        if self._func_cls is None:
+            self._func_cls = _load_function_class(self.path)
+        return self._func_cls
+
+    @property
+    def execute(self) -> Callable[..., Any]:
+        return self.func_cls.execute  # type: ignore
 
 
 _func_name_map: Optional[dict[str, Function]] = None
 
 
-def _check_deprecated_import(file_path) -> None:
+def _check_deprecated_import(file_path: Path, source: Optional[str] = None) -> None:
     """Check if a function file uses the deprecated instructor import and print a warning."""
     name = file_path.name
     if name in _deprecated_warned:
         return
-    try:
-        source = file_path.read_text(encoding="utf-8")
-    except Exception:
-        return
+    if source is None:
+        try:
+            source = file_path.read_text(encoding="utf-8")
+        except Exception:
+            return
     if "from instructor import" in source:
         _deprecated_warned.add(name)
         console = get_console()
@@ -58,34 +89,85 @@ def _check_deprecated_import(file_path) -> None:
         )
 
 
+def _load_function_class(file: Path) -> type["OpenAISchema"]:
+    """Import a function file and return its validated Function class"""
+    module_name = str(file).replace("/", ".").rstrip(".py")
+    spec = importlib.util.spec_from_file_location(module_name, str(file))
+    module = importlib.util.module_from_spec(spec)  # type: ignore
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)  # type: ignore
+
+    if not hasattr(module.Function, "openai_schema") or not hasattr(module.Function, "anthropic_schema"):
+        raise TypeError(f"Function {module_name} must be a subclass of yaicli.function_schema.OpenAISchema")
+    if not hasattr(module.Function, "execute"):
+        raise TypeError(f"Function {module_name} must have an 'execute' classmethod")
+    return module.Function
+
+
+def _read_manifest(manifest_path: Path) -> dict[str, Any]:
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    if manifest.get("yaicli") != __version__:
+        return {}
+    return manifest.get("files", {})
+
+
+def _write_manifest(manifest_path: Path, files: dict[str, Any]) -> None:
+    try:
+        manifest_path.write_text(
+            json.dumps({"version": MANIFEST_VERSION, "yaicli": __version__, "files": files}), encoding="utf-8"
+        )
+    except OSError:
+        # Only costs importing the functions again next time
+        pass
+
+
 def get_func_name_map() -> dict[str, Function]:
-    """Get function name map"""
+    """Get function name map
+
+    Schemas come from a manifest in FUNCTIONS_DIR keyed on each file's content hash,
+    so only new or changed function files are imported to generate their schemas.
+    """
     global _func_name_map
     if _func_name_map:
         return _func_name_map
     if not FUNCTIONS_DIR.exists():
         FUNCTIONS_DIR.mkdir(parents=True, exist_ok=True)
         return {}
+
+    manifest_path = FUNCTIONS_DIR / MANIFEST_FILENAME
+    cached_files = _read_manifest(manifest_path)
+    files: dict[str, Any] = {}
     functions = []
-    for file in FUNCTIONS_DIR.glob("*.py"):
+    for file in sorted(FUNCTIONS_DIR.glob("*.py")):
         if file.name.startswith("_"):
             continue
 
-        _check_deprecated_import(file)
-
-        module_name = str(file).replace("/", ".").rstrip(".py")
-        spec = importlib.util.spec_from_file_location(module_name, str(file))
-        module = importlib.util.module_from_spec(spec)  # type: ignore
-        sys.modules[module_name] = module
-        spec.loader.exec_module(module)  # type: ignore
-
-        if not hasattr(module.Function, "openai_schema") or not hasattr(module.Function, "anthropic_schema"):
-            raise TypeError(f"Function {module_name} must be a subclass of yaicli.function_schema.OpenAISchema")
-        if not hasattr(module.Function, "execute"):
-            raise TypeError(f"Function {module_name} must have an 'execute' classmethod")
-
+        source = file.read_bytes()
+        _check_deprecated_import(file, source.decode("utf-8", errors="replace"))
+
+        digest = hashlib.sha256(source).hexdigest()
+        entry = cached_files.get(file.name)
+        if entry and entry.get("sha256") == digest:
+            function = Function(file, entry["openai_schema"], entry["anthropic_schema"])
+        else:
+            func_cls = _load_function_class(file)
+            function = Function(file, func_cls.openai_schema, func_cls.anthropic_schema, func_cls=func_cls)
+            entry = {
+                "sha256": digest,
+                "openai_schema": function.openai_schema,
+                "anthropic_schema": function.anthropic_schema,
+            }
+        files[file.name] = entry
         # Add to function list
-        functions.append(Function(function=module.Function))
+        functions.append(function)
+
+    if files != cached_files:
+        _write_manifest(manifest_path, files)
 
     # Cache the function list
     _func_name_map = {func.name: func for func in functions}
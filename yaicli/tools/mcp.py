@@ -6,11 +6,12 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 from ..const import MCP_JSON_PATH
-from ..utils import get_or_create_event_loop
 
 # Lazy import fastmcp to improve startup time (saves ~1.6s)
 # These imports are only needed when MCP is actually used
 if TYPE_CHECKING:
+    import asyncio
+
     from fastmcp.client import Client  # noqa: F401
     from fastmcp.client.client import CallToolResult  # noqa: F401
     from mcp.types import TextContent, Tool  # noqa: F401
@@ -140,7 +141,11 @@ class MCP:
 
 
 class MCPClient:
-    """MCP client (thread-safe singleton)"""
+    """MCP client (thread-safe singleton)
+
+    The fastmcp client is bound to the event loop it connects on, so every call runs on
+    one loop owned by this client, in its own thread, whichever thread makes the call.
+    """
 
     _instance: Optional["MCPClient"] = None
     _lock = threading.Lock()
@@ -173,12 +178,31 @@ class MCPClient:
         # _tools_map: "_mcp__<original_tool_name>" -> MCP
         self._tools_map: Optional[Dict[str, MCP]] = None
         self._tools: Optional[List[Any]] = None  # List[Tool] from mcp.types
+        self._tools_lock = threading.Lock()
+        self._loop: Optional["asyncio.AbstractEventLoop"] = None
+        self._loop_lock = threading.Lock()
         self._initialized = True
 
+    def _get_loop(self) -> "asyncio.AbstractEventLoop":
+        """The event loop of the client, started on first use"""
+        import asyncio
+
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="yaicli-mcp", daemon=True).start()
+                self._loop = loop
+        return self._loop
+
+    def _run(self, coro: Any) -> Any:
+        """Run a coroutine on the loop of the client and wait for its result"""
+        import asyncio
+
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
     def ping(self) -> None:
         """Test connection"""
-        loop = get_or_create_event_loop()
-        loop.run_until_complete(self._ping_async())
+        self._run(self._ping_async())
 
     async def _ping_async(self) -> None:
         """Async ping implementation"""
@@ -191,9 +215,9 @@ class MCPClient:
         Returns:
             List[Tool]: Tool object list from mcp.types.Tool
         """
-        if self._tools is None:
-            loop = get_or_create_event_loop()
-            self._tools = loop.run_until_complete(self._list_tools_async())
+        with self._tools_lock:
+            if self._tools is None:
+                self._tools = self._run(self._list_tools_async())
         return self._tools
 
     async def _list_tools_async(self) -> List[Any]:
@@ -204,8 +228,8 @@ class MCPClient:
     def call_tool(self, tool_name: str, **kwargs) -> Any:
         """Call tool"""
         tool_name = parse_mcp_tool_name(tool_name)
-        loop = get_or_create_event_loop()
-        return loop.run_until_complete(self._call_tool_async(tool_name, **kwargs))
+        # Concurrent calls share the session the client keeps open while any of them runs
+        return self._run(self._call_tool_async(tool_name, **kwargs))
 
     async def _call_tool_async(self, tool_name: str, **kwargs) -> Any:
         """Async call tool"""
@@ -267,8 +291,12 @@ class MCPClient:
 
     def __del__(self):
         """Close client"""
-        loop = get_or_create_event_loop()
-        loop.run_until_complete(self._client.close())
+        loop = getattr(self, "_loop", None)
+        if loop is None:
+            # Never connected
+            return
+        self._run(self._client.close())
+        loop.call_soon_threadsafe(loop.stop)
 
 
 class MCPToolConverter:
@@ -1,14 +1,20 @@
-import asyncio
+import json
+import os
 import platform
 import uuid
+from dataclasses import dataclass
+from functools import lru_cache
 from os import getenv
 from os.path import basename, pathsep
-from typing import Any, Callable, Optional, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, TypeVar
 
 import typer
 from distro import name as distro_name
 
-from .const import DEFAULT_OS_NAME, DEFAULT_SHELL_NAME
+from .const import DEFAULT_OS_NAME, DEFAULT_SHELL_NAME, ENVIRONMENT_CACHE_PATH
+
+if TYPE_CHECKING:
+    import asyncio
 
 T = TypeVar("T", int, float, str, bool)
 
@@ -63,6 +69,90 @@ def detect_shell(config: dict[str, Any]) -> str:
     return basename(getenv("SHELL") or "/bin/sh")
 
 
+# The first one that exists is used to notice OS upgrades
+OS_RELEASE_FILES = ("/etc/os-release", "/usr/lib/os-release", "/System/Library/CoreServices/SystemVersion.plist")
+
+
+@dataclass(frozen=True)
+class EnvironmentFingerprint:
+    """Operating system and shell the commands are generated for"""
+
+    os_name: str
+    shell_name: str
+
+    def to_role_variables(self) -> Dict[str, str]:
+        return {"_os": self.os_name, "_shell": self.shell_name}
+
+
+def _parent_process_name() -> str:
+    """Name of the parent process, empty if it can't be read cheaply (non-Linux)"""
+    try:
+        with open(f"/proc/{os.getppid()}/comm", "r") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _environment_cache_key() -> Dict[str, Any]:
+    """Everything the OS and shell detection depends on"""
+    os_release_mtime_ns = 0
+    for path in OS_RELEASE_FILES:
+        try:
+            os_release_mtime_ns = os.stat(path).st_mtime_ns
+            break
+        except OSError:
+            continue
+    return {
+        "platform": platform.system(),
+        # Kernel or Windows build, covers upgrades without an os-release file
+        "release": platform.release(),
+        "version": platform.version(),
+        "os_release_mtime_ns": os_release_mtime_ns,
+        "shell": getenv("SHELL") or "",
+        "ps_module_path": getenv("PSModulePath") or "",
+        "parent": _parent_process_name(),
+    }
+
+
+@lru_cache(1)
+def _detected_environment() -> Tuple[str, str]:
+    """Detect OS and shell once per process, reusing the on-disk result while nothing changed"""
+    key = _environment_cache_key()
+    try:
+        cached = json.loads(ENVIRONMENT_CACHE_PATH.read_text(encoding="utf-8"))
+        if cached["key"] == key:
+            return cached["os_name"], cached["shell_name"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    os_name, shell_name = detect_os({}), detect_shell({})
+    try:
+        ENVIRONMENT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        ENVIRONMENT_CACHE_PATH.write_text(
+            json.dumps({"key": key, "os_name": os_name, "shell_name": shell_name}), encoding="utf-8"
+        )
+    except OSError:
+        pass
+    return os_name, shell_name
+
+
+def environment_fingerprint(config: dict[str, Any]) -> EnvironmentFingerprint:
+    """OS and shell of the current environment, OS_NAME/SHELL_NAME in config take precedence.
+
+    Detection runs at most once per process and is cached on disk across invocations,
+    invalidated by $SHELL, the parent process name, the OS release and the OS release file mtime.
+    """
+    os_name = config.get("OS_NAME", DEFAULT_OS_NAME)
+    shell_name = config.get("SHELL_NAME", DEFAULT_SHELL_NAME)
+    if os_name == DEFAULT_OS_NAME or shell_name == DEFAULT_SHELL_NAME:
+        detected_os, detected_shell = _detected_environment()
+        if os_name == DEFAULT_OS_NAME:
+            os_name = detected_os
+        if shell_name == DEFAULT_SHELL_NAME:
+            shell_name = detected_shell
+    return EnvironmentFingerprint(os_name=os_name, shell_name=shell_name)
+
+
 def filter_command(command: str) -> Optional[str]:
     """Filter out unwanted characters from command
 
@@ -136,7 +226,7 @@ def str2bool(value: Any) -> bool:
     raise ValueError(f"Invalid boolean value: {value}")
 
 
-def get_or_create_event_loop() -> asyncio.AbstractEventLoop:
+def get_or_create_event_loop() -> "asyncio.AbstractEventLoop":
     """
     Get the current event loop or create a new one if it doesn't exist.
     Compatible with Python 3.10+.
@@ -144,6 +234,9 @@ def get_or_create_event_loop() -> asyncio.AbstractEventLoop:
     Returns:
         asyncio.AbstractEventLoop: The current event loop or a new one if it doesn't exist.
     """
+    # asyncio is only needed by MCP, keep it out of the startup path
+    import asyncio
+
     try:
         # Try to get the current running event loop
         return asyncio.get_running_loop()
@@ -160,6 +253,18 @@ def get_or_create_event_loop() -> asyncio.AbstractEventLoop:
             return loop
 
 
+def is_complete_json(arguments: str) -> bool:
+    """Whether streamed tool call arguments form a complete JSON object"""
+    # Only try to parse once the object may be closed
+    if not arguments.rstrip().endswith("}"):
+        return False
+    try:
+        json.loads(arguments)
+    except ValueError:
+        return False
+    return True
+
+
 def gen_tool_call_id() -> str:
     """Generate a unique tool call id"""
     return f"yaicli_{uuid.uuid4()}"